@@ -11,6 +11,11 @@ from app.models.movie import Movie
 from app.models.rating import Rating
 from app.models.director import Director
 from app.models.genre import Genre
+from app.models.rating_rollup import RatingDailyRollup
+from app.models.director_stats import DirectorStats
+from app.models.movie_similar import MovieSimilar
+from app.models.person import Person
+from app.models.catalog_change import CatalogChange
 
 config = context.config
 
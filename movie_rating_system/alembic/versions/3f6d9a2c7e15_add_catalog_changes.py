@@ -0,0 +1,37 @@
+"""add catalog_changes
+
+Revision ID: 3f6d9a2c7e15
+Revises: 8a4c1e7b3f92
+Create Date: 2026-10-19 20:12:44.615203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6d9a2c7e15'
+down_revision: Union[str, Sequence[str], None] = '8a4c1e7b3f92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'catalog_changes',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(length=16), nullable=False),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_catalog_changes_changed_at'), 'catalog_changes', ['changed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_catalog_changes_changed_at'), table_name='catalog_changes')
+    op.drop_table('catalog_changes')
@@ -0,0 +1,39 @@
+"""add movie_similar
+
+Revision ID: 5d2f8c6e0b41
+Revises: e4b7a2c91f36
+Create Date: 2026-10-19 17:22:09.814236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8c6e0b41'
+down_revision: Union[str, Sequence[str], None] = 'e4b7a2c91f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # filled by `python -m app.scripts.build_similar_movies`
+    op.create_table(
+        'movie_similar',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('similar_ids', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column('scores', postgresql.ARRAY(sa.REAL()), nullable=False),
+        sa.Column('signature', sa.BigInteger(), nullable=False),
+        sa.Column('built_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('movie_similar')
@@ -0,0 +1,30 @@
+"""add movies.release_year and movie_genres.genre_id indexes
+
+Revision ID: 6c1d4b8e2a57
+Revises: 3f6d9a2c7e15
+Create Date: 2026-10-19 23:41:08.220517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1d4b8e2a57'
+down_revision: Union[str, Sequence[str], None] = '3f6d9a2c7e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_movies_release_year', 'movies', ['release_year'], unique=False)
+    op.create_index('ix_movie_genres_genre_id_movie_id', 'movie_genres', ['genre_id', 'movie_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_genres_genre_id_movie_id', table_name='movie_genres')
+    op.drop_index('ix_movies_release_year', table_name='movies')
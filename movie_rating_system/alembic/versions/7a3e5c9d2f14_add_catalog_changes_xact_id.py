@@ -0,0 +1,35 @@
+"""add catalog_changes.xact_id
+
+Revision ID: 7a3e5c9d2f14
+Revises: 6c1d4b8e2a57
+Create Date: 2026-10-19 09:12:37.508114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3e5c9d2f14'
+down_revision: Union[str, Sequence[str], None] = '6c1d4b8e2a57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing rows get this migration's transaction id: a snapshot written
+    # before it has no xmin in its header and is ignored anyway
+    op.add_column(
+        'catalog_changes',
+        sa.Column('xact_id', sa.BigInteger(), server_default=sa.text('(pg_current_xact_id()::text::bigint)'), nullable=False),
+    )
+    op.create_index(op.f('ix_catalog_changes_xact_id'), 'catalog_changes', ['xact_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_catalog_changes_xact_id'), table_name='catalog_changes')
+    op.drop_column('catalog_changes', 'xact_id')
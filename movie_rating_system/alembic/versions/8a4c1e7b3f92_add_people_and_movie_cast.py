@@ -0,0 +1,72 @@
+"""add people and movie_cast
+
+Revision ID: 8a4c1e7b3f92
+Revises: 5d2f8c6e0b41
+Create Date: 2026-10-19 18:40:17.203958
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4c1e7b3f92'
+down_revision: Union[str, Sequence[str], None] = '5d2f8c6e0b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'people',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_people_id', 'people', ['id'], unique=False)
+    op.create_index('ix_people_lower_name', 'people', [sa.text('lower(name)')], unique=True)
+
+    op.create_table(
+        'movie_cast',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('person_id', sa.Integer(), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['person_id'], ['people.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id', 'person_id'),
+    )
+    op.create_index('ix_movie_cast_person_id', 'movie_cast', ['person_id'], unique=False)
+
+    # backfill by parsing movies.cast the way app.core.cast.parse_cast does:
+    # comma separated, trimmed, blanks / "Unknown" / case-insensitive repeats dropped
+    op.execute(
+        "CREATE TEMPORARY TABLE cast_names ON COMMIT DROP AS "
+        "SELECT movie_id, name, row_number() OVER (PARTITION BY movie_id ORDER BY ord) AS position "
+        "FROM ("
+        "  SELECT DISTINCT ON (m.id, lower(btrim(t.name))) m.id AS movie_id, btrim(t.name) AS name, t.ord "
+        "  FROM movies m, unnest(string_to_array(m.\"cast\", ',')) WITH ORDINALITY AS t(name, ord) "
+        "  WHERE btrim(t.name) <> '' AND lower(btrim(t.name)) <> 'unknown' "
+        "  ORDER BY m.id, lower(btrim(t.name)), t.ord"
+        ") AS parsed"
+    )
+    op.execute(
+        "INSERT INTO people (name) "
+        "SELECT DISTINCT ON (lower(name)) name FROM cast_names ORDER BY lower(name), movie_id, position"
+    )
+    op.execute(
+        "INSERT INTO movie_cast (movie_id, person_id, position) "
+        "SELECT c.movie_id, p.id, c.position FROM cast_names c JOIN people p ON lower(p.name) = lower(c.name)"
+    )
+    op.execute("DROP TABLE cast_names")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movie_cast_person_id', table_name='movie_cast')
+    op.drop_table('movie_cast')
+    op.drop_index('ix_people_lower_name', table_name='people')
+    op.drop_index('ix_people_id', table_name='people')
+    op.drop_table('people')
@@ -0,0 +1,98 @@
+"""partition movie_ratings by month
+
+Revision ID: 992139a25949
+Revises: df1b52556756
+Create Date: 2026-10-19 11:04:27.520913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '992139a25949'
+down_revision: Union[str, Sequence[str], None] = 'df1b52556756'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # keep the old heap aside and free its names
+    op.execute("ALTER TABLE movie_ratings RENAME TO movie_ratings_unpartitioned")
+    op.execute("ALTER TABLE movie_ratings_unpartitioned RENAME CONSTRAINT movie_ratings_pkey TO movie_ratings_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_movie_ratings_id RENAME TO ix_movie_ratings_unpartitioned_id")
+    op.execute("ALTER SEQUENCE movie_ratings_id_seq OWNED BY NONE")
+    op.execute("UPDATE movie_ratings_unpartitioned SET created_at = now() WHERE created_at IS NULL")
+
+    op.execute("""
+        CREATE TABLE movie_ratings (
+            id INTEGER NOT NULL DEFAULT nextval('movie_ratings_id_seq'),
+            movie_id INTEGER NOT NULL REFERENCES movies (id) ON DELETE CASCADE,
+            score INTEGER NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            CONSTRAINT score_range_check CHECK (score >= 1 AND score <= 10),
+            CONSTRAINT movie_ratings_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE movie_ratings_id_seq OWNED BY movie_ratings.id")
+    op.create_index('ix_movie_ratings_id', 'movie_ratings', ['id'], unique=False)
+    op.create_index('ix_movie_ratings_movie_id_created_at', 'movie_ratings', ['movie_id', 'created_at'], unique=False)
+
+    # one partition per month of existing data plus three months ahead, and a default catch-all
+    op.execute("""
+        DO $$
+        DECLARE
+            m DATE;
+        BEGIN
+            FOR m IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE((SELECT min(created_at) FROM movie_ratings_unpartitioned), now()) AT TIME ZONE 'UTC'),
+                    date_trunc('month', now() AT TIME ZONE 'UTC') + interval '3 months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF movie_ratings FOR VALUES FROM (%L) TO (%L)',
+                    'movie_ratings_p' || to_char(m, 'YYYYMM'),
+                    m::timestamp AT TIME ZONE 'UTC',
+                    (m + interval '1 month')::timestamp AT TIME ZONE 'UTC'
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE movie_ratings_default PARTITION OF movie_ratings DEFAULT")
+
+    op.execute(
+        "INSERT INTO movie_ratings (id, movie_id, score, created_at) "
+        "SELECT id, movie_id, score, created_at FROM movie_ratings_unpartitioned"
+    )
+    op.execute("DROP TABLE movie_ratings_unpartitioned")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE movie_ratings RENAME TO movie_ratings_partitioned")
+    op.execute("ALTER TABLE movie_ratings_partitioned RENAME CONSTRAINT movie_ratings_pkey TO movie_ratings_partitioned_pkey")
+    op.execute("ALTER INDEX ix_movie_ratings_id RENAME TO ix_movie_ratings_partitioned_id")
+    op.execute("ALTER SEQUENCE movie_ratings_id_seq OWNED BY NONE")
+
+    op.create_table('movie_ratings',
+        sa.Column('id', sa.Integer(), server_default=sa.text("nextval('movie_ratings_id_seq')"), nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint('score >= 1 AND score <= 10', name='score_range_check'),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("ALTER SEQUENCE movie_ratings_id_seq OWNED BY movie_ratings.id")
+    op.create_index(op.f('ix_movie_ratings_id'), 'movie_ratings', ['id'], unique=False)
+
+    op.execute(
+        "INSERT INTO movie_ratings (id, movie_id, score, created_at) "
+        "SELECT id, movie_id, score, created_at FROM movie_ratings_partitioned"
+    )
+    op.execute("DROP TABLE movie_ratings_partitioned CASCADE")
@@ -0,0 +1,43 @@
+"""add movies.rating_histogram
+
+Revision ID: 9feae6b19033
+Revises: 992139a25949
+Create Date: 2026-10-19 13:37:02.694118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9feae6b19033'
+down_revision: Union[str, Sequence[str], None] = '992139a25949'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column(
+        'rating_histogram',
+        postgresql.ARRAY(sa.Integer()),
+        server_default=sa.text("'{0,0,0,0,0,0,0,0,0,0}'"),
+        nullable=False,
+    ))
+
+    histogram = ", ".join(
+        f"count(*) FILTER (WHERE score = {score})::int" for score in range(1, 11)
+    )
+    op.execute(
+        f"UPDATE movies SET rating_histogram = h.histogram "
+        f"FROM (SELECT movie_id, ARRAY[{histogram}] AS histogram FROM movie_ratings GROUP BY movie_id) AS h "
+        "WHERE movies.id = h.movie_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('movies', 'rating_histogram')
@@ -0,0 +1,36 @@
+"""cascade movie_genres on movie delete
+
+Revision ID: c3e81f5a7d20
+Revises: 9feae6b19033
+Create Date: 2026-10-19 15:12:44.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e81f5a7d20'
+down_revision: Union[str, Sequence[str], None] = '9feae6b19033'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('movie_genres_movie_id_fkey', 'movie_genres', type_='foreignkey')
+    op.create_foreign_key(
+        'movie_genres_movie_id_fkey', 'movie_genres', 'movies',
+        ['movie_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('movie_genres_movie_id_fkey', 'movie_genres', type_='foreignkey')
+    op.create_foreign_key(
+        'movie_genres_movie_id_fkey', 'movie_genres', 'movies',
+        ['movie_id'], ['id'],
+    )
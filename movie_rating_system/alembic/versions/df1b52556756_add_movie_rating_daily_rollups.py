@@ -0,0 +1,49 @@
+"""add movie_rating_daily rollups
+
+Revision ID: df1b52556756
+Revises: 9b987b5e1a3d
+Create Date: 2026-10-19 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'df1b52556756'
+down_revision: Union[str, Sequence[str], None] = '9b987b5e1a3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movie_rating_daily',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('ratings_count', sa.Integer(), nullable=False),
+        sa.Column('score_sum', sa.Integer(), nullable=False),
+        sa.Column('histogram', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id', 'day')
+    )
+
+    # backfill from existing ratings
+    histogram = ", ".join(
+        f"count(*) FILTER (WHERE score = {score})::int" for score in range(1, 11)
+    )
+    op.execute(
+        "INSERT INTO movie_rating_daily (movie_id, day, ratings_count, score_sum, histogram) "
+        "SELECT movie_id, (created_at AT TIME ZONE 'UTC')::date, count(*)::int, sum(score)::int, "
+        f"ARRAY[{histogram}] "
+        "FROM movie_ratings WHERE created_at IS NOT NULL "
+        "GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('movie_rating_daily')
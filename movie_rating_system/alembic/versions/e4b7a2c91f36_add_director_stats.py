@@ -0,0 +1,51 @@
+"""add director_stats
+
+Revision ID: e4b7a2c91f36
+Revises: c3e81f5a7d20
+Create Date: 2026-10-19 16:05:31.527604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a2c91f36'
+down_revision: Union[str, Sequence[str], None] = 'c3e81f5a7d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'director_stats',
+        sa.Column('director_id', sa.Integer(), nullable=False),
+        sa.Column('movies_count', sa.Integer(), nullable=False),
+        sa.Column('ratings_count', sa.BigInteger(), nullable=False),
+        sa.Column('score_sum', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['director_id'], ['directors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('director_id'),
+    )
+    # keyset pagination of a director's filmography
+    op.create_index(
+        'ix_movies_director_id_release_year_id', 'movies',
+        ['director_id', 'release_year', 'id'],
+    )
+
+    # backfill from the per-movie score histograms
+    ratings = " + ".join(f"rating_histogram[{score}]" for score in range(1, 11))
+    score_sum = " + ".join(f"{score} * rating_histogram[{score}]" for score in range(1, 11))
+    op.execute(
+        "INSERT INTO director_stats (director_id, movies_count, ratings_count, score_sum) "
+        f"SELECT director_id, count(*), coalesce(sum({ratings}), 0), coalesce(sum({score_sum}), 0) "
+        "FROM movies GROUP BY director_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_movies_director_id_release_year_id', table_name='movies')
+    op.drop_table('director_stats')
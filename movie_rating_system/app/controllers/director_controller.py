@@ -0,0 +1,110 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+
+from sqlalchemy.orm import Session
+
+from typing import Optional, Tuple
+import logging
+
+from app.db.database import get_read_db
+from app.core.sql_profiler import ProfiledRoute
+
+from app.services.director_service import DirectorService
+
+router = APIRouter(prefix="/api/v1/directors", tags=["directors"], route_class=ProfiledRoute)
+
+logger = logging.getLogger(__name__)
+api_logger = logging.getLogger("api")
+
+MAX_FILMOGRAPHY_PAGE = 100
+
+
+def parse_cursor(cursor: str) -> Tuple[int, int]:
+    # "<release_year>:<movie_id>" as returned in filmography.next_cursor
+    release_year, _, movie_id = cursor.partition(":")
+    try:
+        return int(release_year), int(movie_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {cursor}"
+        )
+
+
+# List directors (pagination)
+
+@router.get("/", response_model=dict)
+def list_directors(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    # Log
+    logger.info(f"API Request: GET /api/v1/directors - page={page}, page_size={page_size}")
+    api_logger.info(f"List directors request - page={page}, page_size={page_size}")
+
+    try:
+        data = DirectorService.list_directors(db, page=page, page_size=page_size)
+
+        # Log
+        logger.info(f"Directors listed successfully - total={data['total_items']}")
+        api_logger.info(f"Directors listed - items: {len(data['items'])}")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log
+        logger.warning(f"HTTP Error listing directors: status={e.status_code}, detail={e.detail}")
+        api_logger.warning(f"List directors failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log
+        logger.error(f"Server error listing directors: {str(e)}", exc_info=True)
+        api_logger.error(f"List directors server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error listing directors: {str(e)}"
+        )
+
+
+# Get director by ID (with one filmography page)
+
+@router.get("/{director_id}", response_model=dict)
+def get_director(
+    director_id: int,
+    movies_limit: int = Query(20, ge=1, le=MAX_FILMOGRAPHY_PAGE),
+    after: Optional[str] = Query(None, description="filmography.next_cursor of the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    # Log
+    logger.info(f"API Request: GET /api/v1/directors/{director_id} - movies_limit={movies_limit}, after={after}")
+    api_logger.info(f"Get director request - director_id={director_id}")
+
+    try:
+        cursor = parse_cursor(after) if after else None
+        data = DirectorService.get_director(db, director_id, movies_limit=movies_limit, after=cursor)
+
+        # Log
+        logger.info(f"Director retrieved successfully: director_id={director_id}, movies={data['movies_count']}")
+        api_logger.info(f"Director retrieved - ID: {director_id}")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log
+        if e.status_code == 404:
+            logger.warning(f"Director not found: director_id={director_id}")
+            api_logger.warning(f"Get director failed - director not found")
+        else:
+            logger.warning(f"HTTP Error getting director: status={e.status_code}, detail={e.detail}")
+            api_logger.warning(f"Get director failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log
+        logger.error(f"Server error getting director_id={director_id}: {str(e)}", exc_info=True)
+        api_logger.error(f"Get director server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching director: {str(e)}"
+        )
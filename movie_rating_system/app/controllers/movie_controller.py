@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from fastapi.responses import JSONResponse
 
 from sqlalchemy.orm import Session
@@ -7,24 +7,40 @@ from typing import Optional, List
 import logging
 from datetime import datetime
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.sql_profiler import ProfiledRoute
+from app.core.admission import admit_write
+from app.core.similarity_config import SIMILAR_MOVIES_K
+from app.core.autocomplete import title_autocomplete, AUTOCOMPLETE_MAX_LIMIT
 
 from app.schemas.movie_schema import (
-    MovieCreate, MovieUpdate, ResponseModel
+    MovieCreate, MovieUpdate, MovieBulkRequest, ResponseModel, ResponseBatchModel
 )
 from app.schemas.rating_schema import ResponseRatingModel
 
 from app.repositories.director_repository import DirectorRepository
 from app.repositories.genre_repository import GenreRepository
-from app.repositories.movie_repository import MovieRepository
+from app.repositories.movie_repository import MovieRepository, MOVIE_LIST_FIELDS
 
 from app.services.movie_service import MovieService
 
-router = APIRouter(prefix="/api/v1/movies", tags=["movies"])
+router = APIRouter(prefix="/api/v1/movies", tags=["movies"], route_class=ProfiledRoute)
 
 logger = logging.getLogger(__name__)
 api_logger = logging.getLogger("api")
 
+MAX_BATCH_SIZE = 100
+MAX_BULK_SIZE = 1000
+# items of /ratings as declared by MovieRatingSchema; loaded when no `fields` is given
+RATING_LIST_FIELDS = ("id", "title", "average_rating", "ratings_count")
+
+FIELDS_DESCRIPTION = f"Comma-separated item fields to return (id is always included): {','.join(MOVIE_LIST_FIELDS)}"
+TRENDING_DESCRIPTION = (
+    "Movies with the most ratings in the window, from in-memory counters. Deleted ratings "
+    "are still counted, and each worker counts only the ratings it wrote unless "
+    "CACHE_EVENTS_ENABLED shares them; workers can return different rankings."
+)
+
 
 # Dependency Injection
 
@@ -35,6 +51,56 @@ def get_movie_service(db: Session = Depends(get_db)):
     return MovieService(movie_repo, director_repo, genre_repo)
 
 
+def get_read_movie_service(db: Session = Depends(get_read_db)):
+    return get_movie_service(db)
+
+
+def parse_movie_ids(ids: str, max_ids: int) -> List[int]:
+    # "1, 2,2,3" -> [1, 2, 3]; order kept, duplicates dropped
+    movie_ids = []
+    seen = set()
+    for raw_id in ids.split(","):
+        raw_id = raw_id.strip()
+        if not raw_id:
+            continue
+        # isdigit() alone also accepts digits int() rejects, such as "²"
+        if not (raw_id.isascii() and raw_id.isdigit()):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid movie id: {raw_id}"
+            )
+        movie_id = int(raw_id)
+        if movie_id not in seen:
+            seen.add(movie_id)
+            movie_ids.append(movie_id)
+
+    if not movie_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one movie id is required"
+        )
+    if len(movie_ids) > max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {max_ids} movie ids are allowed"
+        )
+    return movie_ids
+
+
+def parse_fields(fields: Optional[str]) -> Optional[tuple]:
+    # "title, genres" -> ("id", "genres", "title"); None keeps the full items
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(names - set(MOVIE_LIST_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {unknown}"
+        )
+    return tuple(sorted(names | {"id"}))
+
+
 # Search movies (with filters)
 
 @router.get("/search", response_model=ResponseModel)
@@ -42,21 +108,26 @@ def search_movies(
     title: Optional[str] = Query(None),
     release_year: Optional[int] = Query(None, ge=1800, le=2100),
     genres: Optional[List[str]] = Query(None),
+    cast: Optional[List[str]] = Query(None, description="Movies crediting every named person"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1),
-    service: MovieService = Depends(get_movie_service),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    service: MovieService = Depends(get_read_movie_service),
 ):
     # Log 
-    logger.info(f"API Request: GET /api/v1/movies/search - title={title}, year={release_year}, genres={genres}, page={page}, page_size={page_size}")
+    logger.info(f"API Request: GET /api/v1/movies/search - title={title}, year={release_year}, genres={genres}, cast={cast}, page={page}, page_size={page_size}, fields={fields}")
     api_logger.info(f"Search movies request - filters: title={title}, year={release_year}")
     
     try:
+        selected = parse_fields(fields)
         data = service.list_movies(
             title=title,
             release_year=release_year,
             genres=genres,
+            cast=cast,
             page=page,
             page_size=page_size,
+            fields=selected,
         )
         
         total_items = data.get("total_items", 0)
@@ -65,7 +136,9 @@ def search_movies(
         logger.info(f"Search successful - found {total_items} movies")
         api_logger.info(f"Search completed - results: {total_items} movies")
         
-        return {"status": "success", "data": data}
+        body = {"status": "success", "data": data}
+        # sparse items do not fit the response model
+        return body if selected is None else JSONResponse(content=body)
         
     except HTTPException as e:
         # Log 
@@ -83,20 +156,41 @@ def search_movies(
         )
 
 
+# Title autocomplete (served from memory, no database access)
+
+@router.get("/autocomplete", response_model=dict)
+def autocomplete_titles(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=AUTOCOMPLETE_MAX_LIMIT),
+):
+    logger.debug(f"API Request: GET /api/v1/movies/autocomplete - q={q}, limit={limit}")
+
+    if not title_autocomplete.ready:
+        logger.warning("Autocomplete requested before the title index was built")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Autocomplete is not available yet"
+        )
+
+    return {"status": "success", "data": {"q": q, "items": title_autocomplete.complete(q, limit)}}
+
+
 # List movies (pagination only)
 
 @router.get("/", response_model=ResponseModel)
 def list_movies(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1),
-    service: MovieService = Depends(get_movie_service),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    service: MovieService = Depends(get_read_movie_service),
 ):
     # Log 
-    logger.info(f"API Request: GET /api/v1/movies - page={page}, page_size={page_size}")
+    logger.info(f"API Request: GET /api/v1/movies - page={page}, page_size={page_size}, fields={fields}")
     api_logger.info(f"List movies request - page={page}, page_size={page_size}")
     
     try:
-        data = service.list_movies(page=page, page_size=page_size)
+        selected = parse_fields(fields)
+        data = service.list_movies(page=page, page_size=page_size, fields=selected)
         total_items = data["total_items"]
         total_pages = (total_items + page_size - 1) // page_size
 
@@ -104,7 +198,7 @@ def list_movies(
         logger.info(f"List movies successful - total_items={total_items}, total_pages={total_pages}, current_page={page}")
         api_logger.info(f"Movies list retrieved - showing page {page} of {total_pages}")
         
-        return {
+        body = {
             "status": "success",
             "data": data,
             "pagination": {
@@ -114,6 +208,7 @@ def list_movies(
                 "total_pages": total_pages
             }
         }
+        return body if selected is None else JSONResponse(content=body)
         
     except HTTPException as e:
         # Log 
@@ -140,19 +235,22 @@ def list_movies_ratings(
     title: Optional[str] = Query(None),
     release_year: Optional[int] = Query(None),
     genres: Optional[List[str]] = Query(None),
-    service: MovieService = Depends(get_movie_service),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    service: MovieService = Depends(get_read_movie_service),
 ):
     # Log 
-    logger.info(f"API Request: GET /api/v1/movies/ratings - title={title}, year={release_year}, genres={genres}, page={page}, page_size={page_size}")
+    logger.info(f"API Request: GET /api/v1/movies/ratings - title={title}, year={release_year}, genres={genres}, page={page}, page_size={page_size}, fields={fields}")
     api_logger.info(f"Movies with ratings request")
     
     try:
+        selected = parse_fields(fields)
         items, total_items = service.list_movies_ratings(
             page=page,
             page_size=page_size,
             title=title,
             release_year=release_year,
             genres=genres,
+            fields=selected or RATING_LIST_FIELDS,
         )
 
         total_pages = (total_items + page_size - 1) // page_size
@@ -161,7 +259,7 @@ def list_movies_ratings(
         logger.info(f"Movies with ratings retrieved - items={len(items)}, total={total_items}")
         api_logger.info(f"Movies with ratings retrieved successfully")
         
-        return {
+        body = {
             "status": "success",
             "data": {
                 "items": items,
@@ -173,6 +271,7 @@ def list_movies_ratings(
                 "prev_page": page - 1 if page > 1 else None,
             }
         }
+        return body if selected is None else JSONResponse(content=body)
         
     except HTTPException as e:
         # Log 
@@ -193,7 +292,7 @@ def list_movies_ratings(
 # Get movie by ID
 
 @router.get("/detail/{movie_id}", response_model=ResponseModel)
-def get_movie(movie_id: int, service: MovieService = Depends(get_movie_service)):
+def get_movie(movie_id: int, service: MovieService = Depends(get_read_movie_service)):
     # Log 
     logger.info(f"API Request: GET /api/v1/movies/detail/{movie_id}")
     api_logger.info(f"Get movie details request - movie_id={movie_id}")
@@ -236,9 +335,118 @@ def get_movie(movie_id: int, service: MovieService = Depends(get_movie_service))
         )
 
 
+# Trending movies
+
+@router.get("/trending", response_model=dict, description=TRENDING_DESCRIPTION)
+def get_trending_movies(
+    window: str = Query("24h", pattern="^(1h|24h|7d)$"),
+    limit: int = Query(10, ge=1, le=100),
+    service: MovieService = Depends(get_read_movie_service),
+):
+    # Log 
+    logger.info(f"API Request: GET /api/v1/movies/trending - window={window}, limit={limit}")
+    api_logger.info(f"Trending movies request - window={window}")
+
+    try:
+        data = service.get_trending_movies(window=window, limit=limit)
+
+        # Log 
+        logger.info(f"Trending movies retrieved - items={len(data['items'])}")
+        api_logger.info(f"Trending movies retrieved successfully")
+
+        return {"status": "success", "data": data}
+
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error getting trending movies: {str(e)}", exc_info=True)
+        api_logger.error(f"Trending movies server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching trending movies: {str(e)}"
+        )
+
+
+# Get movies by IDs (batch)
+
+@router.get("/batch", response_model=ResponseBatchModel)
+def get_movies_batch(
+    ids: str = Query(..., description="Comma-separated movie IDs"),
+    service: MovieService = Depends(get_read_movie_service),
+):
+    # Log 
+    logger.info(f"API Request: GET /api/v1/movies/batch - ids={ids}")
+    api_logger.info(f"Batch movies request")
+
+    try:
+        movie_ids = parse_movie_ids(ids, MAX_BATCH_SIZE)
+        data = service.get_movies_by_ids(movie_ids)
+
+        # Log 
+        logger.info(f"Batch movies retrieved - found={len(data['items'])}, missing={data['missing_ids']}")
+        api_logger.info(f"Batch movies retrieved successfully")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log 
+        logger.warning(f"HTTP Error in batch movies: status={e.status_code}, detail={e.detail}")
+        api_logger.warning(f"Batch movies failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error in batch movies: {str(e)}", exc_info=True)
+        api_logger.error(f"Batch movies server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching movies: {str(e)}"
+        )
+
+
+# Similar movies ("more like this")
+
+@router.get("/{movie_id}/similar", response_model=dict)
+def get_similar_movies(
+    movie_id: int,
+    limit: int = Query(10, ge=1, le=SIMILAR_MOVIES_K),
+    service: MovieService = Depends(get_read_movie_service),
+):
+    # Log 
+    logger.info(f"API Request: GET /api/v1/movies/{movie_id}/similar - limit={limit}")
+    api_logger.info(f"Similar movies request - movie_id={movie_id}")
+
+    try:
+        data = service.get_similar_movies(movie_id, limit=limit)
+
+        # Log 
+        logger.info(f"Similar movies retrieved - movie_id={movie_id}, items={len(data['items'])}")
+        api_logger.info(f"Similar movies retrieved successfully")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log 
+        if e.status_code == 404:
+            logger.warning(f"Movie not found for similar movies: movie_id={movie_id}")
+            api_logger.warning(f"Similar movies failed - movie not found")
+        else:
+            logger.warning(f"HTTP Error in similar movies: status={e.status_code}, detail={e.detail}")
+            api_logger.warning(f"Similar movies failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error getting similar movies for {movie_id}: {str(e)}", exc_info=True)
+        api_logger.error(f"Similar movies server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching similar movies: {str(e)}"
+        )
+
+
 # Create movie
 
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admit_write)])
 def create_movie(
     movie_data: MovieCreate,
     db: Session = Depends(get_db),
@@ -282,9 +490,54 @@ def create_movie(
         )
 
 
+# Bulk create/update movies
+
+@router.post("/bulk", response_model=dict, dependencies=[Depends(admit_write)])
+def bulk_upsert_movies(
+    payload: MovieBulkRequest,
+    db: Session = Depends(get_db),
+):
+    # Log 
+    logger.info(f"API Request: POST /api/v1/movies/bulk - items={len(payload.items)}")
+    api_logger.info(f"Bulk upsert request - items={len(payload.items)}")
+
+    if not payload.items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No items given")
+    if len(payload.items) > MAX_BULK_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_SIZE} items per request"
+        )
+
+    try:
+        service = get_movie_service(db)
+        data = service.bulk_upsert_movies(db, payload.items)
+
+        # Log 
+        logger.info(f"Bulk upsert done: created={data['created']}, updated={data['updated']}, failed={data['failed']}")
+        api_logger.info(f"Bulk upsert completed - created={data['created']}, updated={data['updated']}")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log 
+        logger.warning(f"HTTP Error in bulk upsert: status={e.status_code}, detail={e.detail}")
+        api_logger.warning(f"Bulk upsert failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error in bulk upsert: {str(e)}", exc_info=True)
+        api_logger.error(f"Bulk upsert server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error in bulk upsert: {str(e)}"
+        )
+
+
 # Update movie
 
-@router.put("/{movie_id}", response_model=dict)
+@router.put("/{movie_id}", response_model=dict, dependencies=[Depends(admit_write)])
 def update_movie(
     movie_id: int,
     movie_data: MovieUpdate,
@@ -296,22 +549,7 @@ def update_movie(
     api_logger.info(f"Update movie request - movie_id={movie_id}")
     
     try:
-        existing_movie = service.get_movie_by_id(movie_id)
-        if not existing_movie:
-            # Log
-            logger.warning(f"Movie not found for update: movie_id={movie_id}")
-            api_logger.warning(f"Update movie failed - movie not found")
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": "failure",
-                    "error": {
-                        "code": 404,
-                        "message": "Movie not found"
-                    }
-                }
-            )
-        
+        # the service answers 404 itself; no separate existence check round trip
         updated_movie = service.update_movie(movie_id, movie_data)
         
         # Log 
@@ -323,8 +561,8 @@ def update_movie(
     except HTTPException as e:
         # Log 
         if e.status_code == 404:
-            logger.warning(f"Genre not found when updating movie: {e.detail}")
-            api_logger.warning(f"Update movie failed - genre not found")
+            logger.warning(f"Movie/Genre not found when updating movie {movie_id}: {e.detail}")
+            api_logger.warning(f"Update movie failed - {e.detail}")
         elif e.status_code == 400:
             logger.warning(f"Validation error updating movie: {e.detail}")
             api_logger.warning(f"Update movie failed - validation error")
@@ -357,7 +595,7 @@ def update_movie(
 
 # Delete movie
 
-@router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(admit_write)])
 def delete_movie(
     movie_id: int,
     service: MovieService = Depends(get_movie_service)
@@ -367,30 +605,13 @@ def delete_movie(
     api_logger.info(f"Delete movie request - movie_id={movie_id}")
     
     try:
-        existing_movie = service.get_movie_by_id(movie_id)
-        if not existing_movie:
-            # Log 
-            logger.warning(f"Movie not found for deletion: movie_id={movie_id}")
-            api_logger.warning(f"Delete movie failed - movie not found")
-            return JSONResponse(
-                status_code=404,
-                content={
-                    "status": "failure",
-                    "error": {
-                        "code": 404,
-                        "message": "Movie not found"
-                    }
-                }
-            )
-        
         deleted = service.delete_movie(movie_id)
         
         if deleted:
             # Log 
-            movie_title = existing_movie.get('title', 'Unknown')
-            logger.info(f"Movie deleted successfully: movie_id={movie_id}, title='{movie_title}'")
+            logger.info(f"Movie deleted successfully: movie_id={movie_id}")
             api_logger.info(f"Movie deleted - ID: {movie_id}")
-            return JSONResponse(status_code=status.HTTP_204_NO_CONTENT, content=None)
+            return Response(status_code=status.HTTP_204_NO_CONTENT)
         else:
             # Log 
             logger.error(f"Failed to delete movie: movie_id={movie_id}")
@@ -406,6 +627,13 @@ def delete_movie(
                 }
             )
         
+    except HTTPException as e:
+        # Log 
+        if e.status_code == 404:
+            logger.warning(f"Movie not found for deletion: movie_id={movie_id}")
+            api_logger.warning(f"Delete movie failed - movie not found")
+        raise e
+        
     except Exception as e:
         # Log 
         logger.error(f"Server error deleting movie {movie_id}: {str(e)}", exc_info=True)
@@ -416,6 +644,43 @@ def delete_movie(
         )
 
 
+# Delete many movies
+
+@router.delete("/", response_model=dict, dependencies=[Depends(admit_write)])
+def delete_movies(
+    ids: str = Query(..., description="Comma-separated movie IDs"),
+    service: MovieService = Depends(get_movie_service)
+):
+    # Log 
+    logger.info(f"API Request: DELETE /api/v1/movies - ids={ids}")
+    api_logger.info(f"Bulk delete movies request")
+
+    try:
+        movie_ids = parse_movie_ids(ids, MAX_BULK_SIZE)
+        data = service.delete_movies(movie_ids)
+
+        # Log 
+        logger.info(f"Movies deleted: deleted={len(data['deleted_ids'])}, missing={data['missing_ids']}")
+        api_logger.info(f"Bulk delete completed - deleted={len(data['deleted_ids'])}")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log 
+        logger.warning(f"HTTP Error in bulk delete: status={e.status_code}, detail={e.detail}")
+        api_logger.warning(f"Bulk delete failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error in bulk delete: {str(e)}", exc_info=True)
+        api_logger.error(f"Bulk delete server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error deleting movies: {str(e)}"
+        )
+
+
 # Health check endpoint
 
 @router.get("/health")
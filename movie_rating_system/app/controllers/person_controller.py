@@ -0,0 +1,96 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+
+from sqlalchemy.orm import Session
+
+from typing import Optional
+import logging
+
+from app.db.database import get_read_db
+from app.core.sql_profiler import ProfiledRoute
+from app.controllers.director_controller import parse_cursor, MAX_FILMOGRAPHY_PAGE
+
+from app.services.person_service import PersonService
+
+router = APIRouter(prefix="/api/v1/people", tags=["people"], route_class=ProfiledRoute)
+
+logger = logging.getLogger(__name__)
+api_logger = logging.getLogger("api")
+
+
+# Find people by name (case-insensitive exact match)
+
+@router.get("/", response_model=dict)
+def find_people(
+    name: str = Query(..., min_length=1),
+    db: Session = Depends(get_read_db)
+):
+    # Log
+    logger.info(f"API Request: GET /api/v1/people - name={name}")
+    api_logger.info(f"Find people request - name={name}")
+
+    try:
+        people = PersonService.find_people(db, name)
+
+        # Log
+        logger.info(f"People found - name={name}, count={len(people)}")
+        api_logger.info(f"People found - count: {len(people)}")
+
+        return {"status": "success", "data": people}
+
+    except HTTPException as e:
+        # Log
+        logger.warning(f"HTTP Error finding people: status={e.status_code}, detail={e.detail}")
+        api_logger.warning(f"Find people failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log
+        logger.error(f"Server error finding people: {str(e)}", exc_info=True)
+        api_logger.error(f"Find people server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error finding people: {str(e)}"
+        )
+
+
+# Get person by ID (with one filmography page)
+
+@router.get("/{person_id}", response_model=dict)
+def get_person(
+    person_id: int,
+    movies_limit: int = Query(20, ge=1, le=MAX_FILMOGRAPHY_PAGE),
+    after: Optional[str] = Query(None, description="filmography.next_cursor of the previous page"),
+    db: Session = Depends(get_read_db)
+):
+    # Log
+    logger.info(f"API Request: GET /api/v1/people/{person_id} - movies_limit={movies_limit}, after={after}")
+    api_logger.info(f"Get person request - person_id={person_id}")
+
+    try:
+        cursor = parse_cursor(after) if after else None
+        data = PersonService.get_person(db, person_id, movies_limit=movies_limit, after=cursor)
+
+        # Log
+        logger.info(f"Person retrieved successfully: person_id={person_id}, movies={data['movies_count']}")
+        api_logger.info(f"Person retrieved - ID: {person_id}")
+
+        return {"status": "success", "data": data}
+
+    except HTTPException as e:
+        # Log
+        if e.status_code == 404:
+            logger.warning(f"Person not found: person_id={person_id}")
+            api_logger.warning(f"Get person failed - person not found")
+        else:
+            logger.warning(f"HTTP Error getting person: status={e.status_code}, detail={e.detail}")
+            api_logger.warning(f"Get person failed - HTTP {e.status_code}")
+        raise e
+
+    except Exception as e:
+        # Log
+        logger.error(f"Server error getting person_id={person_id}: {str(e)}", exc_info=True)
+        api_logger.error(f"Get person server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching person: {str(e)}"
+        )
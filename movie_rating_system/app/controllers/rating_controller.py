@@ -1,26 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import JSONResponse
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from sqlalchemy import func
 from app.models.movie import Movie
 from app.models.rating import Rating
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.sql_profiler import ProfiledRoute
+from app.core.admission import admit_write
 
 from app.schemas.rating_schema import RatingCreate
 from app.services.rating_service import RatingService
 import logging
-from datetime import datetime
+from datetime import datetime, date
 
-router = APIRouter(prefix="/api/v1/movies/{movie_id}/ratings", tags=["ratings"])
+router = APIRouter(prefix="/api/v1/movies/{movie_id}/ratings", tags=["ratings"], route_class=ProfiledRoute)
 
 logger = logging.getLogger(__name__)
 api_logger = logging.getLogger("api")
 
 
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED, dependencies=[Depends(admit_write)])
 def create_rating(
     movie_id: int,
     rating_data: RatingCreate,
@@ -74,7 +76,7 @@ def create_rating(
 @router.get("/", response_model=dict)
 def get_movie_ratings(
     movie_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     # Log 
     logger.info(f"API Request: GET /api/v1/movies/{movie_id}/ratings")
@@ -110,6 +112,85 @@ def get_movie_ratings(
         )
 
 
+@router.get("/distribution", response_model=dict)
+def get_movie_rating_distribution(
+    movie_id: int,
+    db: Session = Depends(get_read_db)
+):
+    # Log 
+    logger.info(f"API Request: GET /api/v1/movies/{movie_id}/ratings/distribution")
+    api_logger.info(f"Get rating distribution request - movie_id={movie_id}")
+    
+    try:
+        distribution = RatingService.get_rating_distribution(db, movie_id)
+        
+        # Log 
+        logger.info(f"Rating distribution retrieved successfully: movie_id={movie_id}, count={distribution['ratings_count']}")
+        api_logger.info(f"Rating distribution retrieved - count: {distribution['ratings_count']}")
+        
+        return {"status": "success", "data": distribution}
+        
+    except HTTPException as e:
+        # Log 
+        if e.status_code == 404:
+            logger.warning(f"Movie not found when getting rating distribution: movie_id={movie_id}")
+            api_logger.warning(f"Get rating distribution failed - movie not found")
+        else:
+            logger.warning(f"HTTP Error getting rating distribution: status={e.status_code}, detail={e.detail}")
+            api_logger.warning(f"Get rating distribution failed - HTTP {e.status_code}")
+        raise e
+        
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error getting rating distribution for movie_id={movie_id}: {str(e)}", exc_info=True)
+        api_logger.error(f"Get rating distribution server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching rating distribution: {str(e)}"
+        )
+
+
+@router.get("/timeseries", response_model=dict)
+def get_movie_rating_timeseries(
+    movie_id: int,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    bucket: str = Query("day", pattern="^(day|week|month)$"),
+    db: Session = Depends(get_read_db)
+):
+    # Log 
+    logger.info(f"API Request: GET /api/v1/movies/{movie_id}/ratings/timeseries - from={date_from}, to={date_to}, bucket={bucket}")
+    api_logger.info(f"Get rating timeseries request - movie_id={movie_id}, bucket={bucket}")
+    
+    try:
+        timeseries = RatingService.get_rating_timeseries(db, movie_id, date_from, date_to, bucket)
+        
+        # Log 
+        logger.info(f"Rating timeseries retrieved successfully: movie_id={movie_id}, points={len(timeseries['points'])}")
+        api_logger.info(f"Rating timeseries retrieved - points: {len(timeseries['points'])}")
+        
+        return {"status": "success", "data": timeseries}
+        
+    except HTTPException as e:
+        # Log 
+        if e.status_code == 404:
+            logger.warning(f"Movie not found when getting rating timeseries: movie_id={movie_id}")
+            api_logger.warning(f"Get rating timeseries failed - movie not found")
+        else:
+            logger.warning(f"HTTP Error getting rating timeseries: status={e.status_code}, detail={e.detail}")
+            api_logger.warning(f"Get rating timeseries failed - HTTP {e.status_code}")
+        raise e
+        
+    except Exception as e:
+        # Log 
+        logger.error(f"Server error getting rating timeseries for movie_id={movie_id}: {str(e)}", exc_info=True)
+        api_logger.error(f"Get rating timeseries server error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching rating timeseries: {str(e)}"
+        )
+
+
 # Health check endpoint
 
 @router.get("/health")
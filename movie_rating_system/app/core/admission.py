@@ -0,0 +1,156 @@
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Any, Tuple
+
+from fastapi import HTTPException, Request, status
+
+from app.db.database import engine, DB_POOL_SIZE, DB_MAX_OVERFLOW
+
+logger = logging.getLogger(__name__)
+
+# per-client write rate limit; 0 turns it off
+WRITE_RATE_PER_SEC = float(os.getenv("WRITE_RATE_PER_SEC", "0"))
+WRITE_RATE_BURST = int(os.getenv("WRITE_RATE_BURST", "20"))
+# header carrying the client address when behind a trusted proxy (e.g. X-Forwarded-For);
+# empty keys clients on the connection address, which behind a proxy is the proxy itself
+WRITE_RATE_CLIENT_HEADER = os.getenv("WRITE_RATE_CLIENT_HEADER", "")
+MAX_INFLIGHT_WRITES = int(os.getenv("MAX_INFLIGHT_WRITES", "8"))
+# share of the primary pool (size + overflow) in use at which new writes are shed
+WRITE_SHED_POOL_RATIO = float(os.getenv("WRITE_SHED_POOL_RATIO", "0.8"))
+WRITE_SHED_RETRY_AFTER = int(os.getenv("WRITE_SHED_RETRY_AFTER", "1"))
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets (rate tokens/s, up to `burst`); a rate of 0 admits everything."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 100000):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+
+    def acquire(self, client: str) -> float:
+        """Takes one token; returns 0 when allowed, else seconds until a token is available."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+            if tokens >= 1.0:
+                self._buckets[client] = (tokens - 1.0, now)
+                if len(self._buckets) > self.max_clients:
+                    self._prune(now)
+                return 0.0
+            self._buckets[client] = (tokens, now)
+            return (1.0 - tokens) / self.rate
+
+    def _prune(self, now: float) -> None:
+        # buckets that have refilled completely carry no state worth keeping
+        full_after = self.burst / self.rate
+        self._buckets = {
+            client: state for client, state in self._buckets.items()
+            if now - state[1] < full_after
+        }
+
+
+class WriteAdmission:
+    """
+    Admission control for write routes: per-client rate limiting (429), then
+    load shedding (503) once in-flight writes or primary pool usage pass their
+    thresholds, so writes can never take the pool connections reads need.
+    """
+
+    def __init__(self, limiter: TokenBucketLimiter, max_in_flight: int, pool_ratio: float):
+        self._lock = threading.Lock()
+        self.limiter = limiter
+        self.max_in_flight = max_in_flight
+        self.pool_ratio = pool_ratio
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed_rate_limited = 0
+        self.shed_in_flight = 0
+        self.shed_pool = 0
+
+    def admit(self, client: str, pool) -> None:
+        wait = self.limiter.acquire(client)
+        if wait > 0:
+            with self._lock:
+                self.shed_rate_limited += 1
+            logger.warning(f"Write rate limit exceeded - client={client}, retry_after={wait:.2f}s")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many write requests",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+        usage = _pool_usage(pool)
+        with self._lock:
+            if self.in_flight >= self.max_in_flight:
+                self.shed_in_flight += 1
+                reason = f"in-flight writes at limit ({self.in_flight})"
+            elif usage >= self.pool_ratio:
+                self.shed_pool += 1
+                reason = f"database pool usage {usage:.0%}"
+            else:
+                self.in_flight += 1
+                self.admitted += 1
+                return
+
+        logger.warning(f"Write shed - client={client}, reason={reason}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, retry later",
+            headers={"Retry-After": str(WRITE_SHED_RETRY_AFTER)},
+        )
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "shed_rate_limited": self.shed_rate_limited,
+                "shed_in_flight": self.shed_in_flight,
+                "shed_pool": self.shed_pool,
+            }
+
+
+def _pool_usage(pool) -> float:
+    if not hasattr(pool, "checkedout"):
+        return 0.0
+    # the engines are created with these limits (app.db.database)
+    capacity = DB_POOL_SIZE + max(DB_MAX_OVERFLOW, 0)
+    return pool.checkedout() / capacity if capacity else 0.0
+
+
+write_admission = WriteAdmission(
+    TokenBucketLimiter(rate=WRITE_RATE_PER_SEC, burst=WRITE_RATE_BURST),
+    max_in_flight=MAX_INFLIGHT_WRITES,
+    pool_ratio=WRITE_SHED_POOL_RATIO,
+)
+
+
+def client_key(request: Request) -> str:
+    if WRITE_RATE_CLIENT_HEADER:
+        forwarded = request.headers.get(WRITE_RATE_CLIENT_HEADER)
+        if forwarded:
+            # the last entry is the one our proxy appended; earlier ones are client-supplied
+            return forwarded.split(",")[-1].strip()
+    return request.client.host if request.client else "unknown"
+
+
+async def admit_write(request: Request):
+    # route dependency: held for the whole request, released once the response is sent
+    write_admission.admit(client_key(request), engine.pool)
+    try:
+        yield
+    finally:
+        write_admission.release()
@@ -0,0 +1,147 @@
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AUTOCOMPLETE_MAX_LIMIT = int(os.getenv("AUTOCOMPLETE_MAX_LIMIT", "20"))
+# prefixes matching more entries than this get their ranking cached for RANK_TTL seconds
+AUTOCOMPLETE_CACHE_MIN_MATCHES = int(os.getenv("AUTOCOMPLETE_CACHE_MIN_MATCHES", "500"))
+AUTOCOMPLETE_RANK_TTL = float(os.getenv("AUTOCOMPLETE_RANK_TTL", "5"))
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(text: str) -> str:
+    # "Amélie: Le Fabuleux" -> "amelie le fabuleux"
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    ascii_text = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM.sub(" ", ascii_text).strip()
+
+
+def _word_suffixes(normalized: str) -> List[str]:
+    # "star wars" -> ["star wars", "wars"]: a prefix of any word start matches
+    words = normalized.split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class TitleAutocomplete:
+    """
+    Title prefix lookups served from memory: a sorted array of
+    (word suffix of the normalized title, movie_id) searched with bisect.
+    Matches are ranked by ratings count, then title. Rankings of broad
+    prefixes ("s", "th") are cached briefly, so their order may trail rating
+    counts by up to AUTOCOMPLETE_RANK_TTL seconds.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._entries: List[Tuple[str, int]] = []
+        self._movies: Dict[int, Dict[str, Any]] = {}
+        self._keys: Dict[int, List[str]] = {}
+        self._ranked: Dict[str, Tuple[float, List[int]]] = {}
+        self.ready = False
+
+    # BUILD
+
+    def rebuild(self, db) -> None:
+        from app.repositories.movie_repository import MovieRepository
+
+        self.load(MovieRepository.get_autocomplete_rows(db))
+
+    def load(self, rows: Iterable[Tuple[int, str, int, int]]) -> None:
+        # (id, title, release_year, ratings_count), from the database or a catalogue snapshot
+        movies, keys, entries = {}, {}, []
+        for movie_id, title, release_year, ratings_count in rows:
+            movies[movie_id] = {"id": movie_id, "title": title, "release_year": release_year, "ratings_count": ratings_count}
+            keys[movie_id] = _word_suffixes(normalize_title(title))
+            entries.extend((key, movie_id) for key in keys[movie_id])
+        entries.sort()
+
+        with self._lock:
+            self._movies, self._keys, self._entries = movies, keys, entries
+            self._ranked = {}
+            self.ready = True
+
+        logger.info(f"Title autocomplete built - movies={len(movies)}, entries={len(entries)}")
+
+    # INCREMENTAL UPDATES
+
+    def upsert(self, movie_id: int, title: str, release_year: int, ratings_count: Optional[int] = None) -> None:
+        if not self.ready:
+            return
+        with self._lock:
+            if ratings_count is None:
+                current = self._movies.get(movie_id)
+                ratings_count = current["ratings_count"] if current else 0
+            self._remove(movie_id)
+            self._movies[movie_id] = {"id": movie_id, "title": title, "release_year": release_year, "ratings_count": ratings_count}
+            self._keys[movie_id] = _word_suffixes(normalize_title(title))
+            for key in self._keys[movie_id]:
+                insort(self._entries, (key, movie_id))
+
+    def remove(self, movie_id: int) -> None:
+        if not self.ready:
+            return
+        with self._lock:
+            self._remove(movie_id)
+
+    def _remove(self, movie_id: int) -> None:
+        # also the first step of every upsert, so cached rankings never miss a title change
+        self._ranked.clear()
+        self._movies.pop(movie_id, None)
+        for key in self._keys.pop(movie_id, []):
+            pos = bisect_left(self._entries, (key, movie_id))
+            if pos < len(self._entries) and self._entries[pos] == (key, movie_id):
+                del self._entries[pos]
+
+    def record_rating(self, movie_id: int, delta: int = 1) -> None:
+        with self._lock:
+            movie = self._movies.get(movie_id)
+            if movie is not None:
+                movie["ratings_count"] += delta
+
+    def set_ratings_count(self, movie_id: int, ratings_count: int) -> None:
+        with self._lock:
+            movie = self._movies.get(movie_id)
+            if movie is not None:
+                movie["ratings_count"] = ratings_count
+
+    # QUERY
+
+    def complete(self, q: str, limit: int = 10) -> List[Dict[str, Any]]:
+        prefix = normalize_title(q)
+        if not prefix:
+            return []
+        with self._lock:
+            lo = bisect_left(self._entries, (prefix,))
+            # keys only hold [0-9a-z ], all below "~"
+            hi = bisect_left(self._entries, (prefix + "~",), lo)
+
+            if hi - lo <= AUTOCOMPLETE_CACHE_MIN_MATCHES:
+                ranked = self._rank(lo, hi, limit)
+            else:
+                cached = self._ranked.get(prefix)
+                if cached is None or time.monotonic() - cached[0] > AUTOCOMPLETE_RANK_TTL:
+                    cached = (time.monotonic(), self._rank(lo, hi, AUTOCOMPLETE_MAX_LIMIT))
+                    self._ranked[prefix] = cached
+                ranked = cached[1][:limit]
+
+            return [dict(self._movies[movie_id]) for movie_id in ranked]
+
+    def _rank(self, lo: int, hi: int, limit: int) -> List[int]:
+        matched = {movie_id for _, movie_id in self._entries[lo:hi]}
+        movies = self._movies
+        return heapq.nsmallest(
+            limit,
+            matched,
+            key=lambda movie_id: (-movies[movie_id]["ratings_count"], movies[movie_id]["title"], movie_id),
+        )
+
+title_autocomplete = TitleAutocomplete()
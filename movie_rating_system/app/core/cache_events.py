@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+from typing import Callable, Dict, List, Any
+
+from sqlalchemy import func, select as sql_select
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "movie_cache_events"
+# lets a worker skip the events it published itself (already applied locally)
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class CacheEventBus:
+    """
+    Cross-worker cache invalidation over Postgres LISTEN/NOTIFY.
+
+    Writers publish small JSON events inside the write transaction (NOTIFY
+    is transactional: peers get an event exactly when its write commits, and
+    none for a rolled-back write); every worker runs a listener thread that
+    hands them to the subscribed local caches. When the listener has to
+    reconnect, notifications may have been lost, so all local caches are
+    flushed instead.
+    """
+
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._flush_handlers: List[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread = None
+        self.enabled = False
+        self.received = 0
+        self.flushes = 0
+
+    def subscribe(self, kind: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def on_flush(self, handler: Callable[[], None]) -> None:
+        self._flush_handlers.append(handler)
+
+    # PUBLISH (the caller commits: these run in the same transaction as the write)
+
+    def publish(self, db, kind: str, action: str, movie_id: int, **extra) -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps(
+            {"w": WORKER_ID, "k": kind, "a": action, "id": movie_id, **extra},
+            separators=(",", ":"),
+            default=str,
+        )
+        db.execute(sql_select(func.pg_notify(CHANNEL, payload)))
+
+    def publish_many(self, db, kind: str, action: str, movie_ids: List[int]) -> None:
+        # one statement for a whole batch of events
+        if not self.enabled or not movie_ids:
+            return
+        payloads = [
+            json.dumps({"w": WORKER_ID, "k": kind, "a": action, "id": movie_id}, separators=(",", ":"))
+            for movie_id in movie_ids
+        ]
+        events = func.unnest(payloads).table_valued("payload").render_derived(name="events")
+        db.execute(sql_select(func.pg_notify(CHANNEL, events.c.payload)))
+
+    # LISTEN
+
+    def start(self, engine) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(engine,), name="cache-event-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _connect(self, engine):
+        cargs, cparams = engine.dialect.create_connect_args(engine.url)
+        conn = engine.dialect.dbapi.connect(*cargs, **cparams)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return conn
+
+    def _run(self, engine) -> None:
+        backoff = 1.0
+        connected_before = False
+
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect(engine)
+                logger.info(f"Cache event listener connected - worker={WORKER_ID}")
+                if connected_before:
+                    self.flush_all()
+                connected_before = True
+                backoff = 1.0
+
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+
+            except Exception as e:
+                logger.warning(f"Cache event listener disconnected: {str(e)}; retrying in {backoff:.0f}s")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache event: {payload}")
+            return
+        if event.get("w") == WORKER_ID:
+            return
+
+        self.received += 1
+        for handler in self._handlers.get(event.get("k"), []):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Cache event handler failed for {payload}: {str(e)}", exc_info=True)
+
+    def flush_all(self) -> None:
+        self.flushes += 1
+        logger.warning("Flushing all local caches")
+        for handler in self._flush_handlers:
+            try:
+                handler()
+            except Exception as e:
+                logger.error(f"Cache flush handler failed: {str(e)}", exc_info=True)
+
+
+cache_events = CacheEventBus()
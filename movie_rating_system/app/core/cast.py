@@ -0,0 +1,19 @@
+from typing import List, Optional
+
+
+def parse_cast(cast: Optional[str]) -> List[str]:
+    """
+    Names in a Movie.cast string in billing order: "Actor 8, Actor 3" ->
+    ["Actor 8", "Actor 3"]. Blanks, "Unknown" and case-insensitive repeats
+    are dropped. Mirrored by the people/movie_cast backfill migration.
+    """
+    names = []
+    seen = set()
+    for name in (cast or "").split(","):
+        name = name.strip()
+        key = name.lower()
+        if not name or key == "unknown" or key in seen:
+            continue
+        seen.add(key)
+        names.append(name)
+    return names
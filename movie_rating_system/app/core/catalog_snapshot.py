@@ -0,0 +1,217 @@
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MRSCATLG"
+FORMAT_VERSION = 1
+# MAGIC, then the byte length of the JSON header that follows it
+_PREAMBLE = struct.Struct("<8sI")
+_ALIGN = 8
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class StringTable:
+    """Deduplicated UTF-8 strings referenced by index: offsets (n + 1) into one blob."""
+
+    def __init__(self):
+        self._index: Dict[str, int] = {}
+        self._chunks: List[bytes] = []
+        self._offsets = [0]
+
+    def add(self, text: str) -> int:
+        index = self._index.get(text)
+        if index is None:
+            data = text.encode("utf-8")
+            index = self._index[text] = len(self._chunks)
+            self._chunks.append(data)
+            self._offsets.append(self._offsets[-1] + len(data))
+        return index
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {
+            "string_offsets": np.array(self._offsets, dtype=np.int64),
+            "string_data": np.frombuffer(b"".join(self._chunks), dtype=np.uint8),
+        }
+
+
+def write_snapshot(path: str, columns: Dict[str, np.ndarray], meta: Dict[str, Any]) -> int:
+    """
+    Writes `columns` after a JSON header holding `meta` and each column's
+    dtype, shape and (8-byte aligned) offset from the start of the data
+    section. The file is written next to `path` and renamed over it, so
+    workers that still map the previous snapshot keep reading it intact.
+    Returns the file size.
+    """
+    layout, offset = {}, 0
+    for name, column in columns.items():
+        column = np.ascontiguousarray(column)
+        columns[name] = column
+        layout[name] = [column.dtype.str, offset, list(column.shape)]
+        offset = _aligned(offset + column.nbytes)
+
+    header = json.dumps({"format": FORMAT_VERSION, **meta, "columns": layout}).encode("utf-8")
+    data_start = _aligned(_PREAMBLE.size + len(header))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, column in columns.items():
+            f.seek(data_start + layout[name][1])
+            f.write(column.tobytes())
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return data_start + offset
+
+
+class CatalogSnapshot:
+    """
+    Read-only view of a snapshot file. Columns are numpy arrays over the
+    mmap, nothing is copied until a column is turned into Python objects.
+
+    This is a file-based warm start only: load_catalog_indexes decodes the
+    columns into each worker's own search index and autocomplete structures
+    and closes the file, so no lookup is served from shared pages and every
+    worker still holds its own copy of the catalogue.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load_header()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _load_header(self) -> None:
+        if len(self._mmap) < _PREAMBLE.size:
+            raise ValueError("truncated snapshot")
+        magic, header_size = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError("not a catalogue snapshot")
+        header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_size])
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported snapshot format {header.get('format')}")
+
+        data_start = _aligned(_PREAMBLE.size + header_size)
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, (dtype, offset, shape) in header.pop("columns").items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            if data_start + offset + count * dtype.itemsize > len(self._mmap):
+                raise ValueError(f"truncated snapshot column {name}")
+            self.columns[name] = np.frombuffer(
+                self._mmap, dtype=dtype, count=count, offset=data_start + offset
+            ).reshape(shape)
+        self.meta = header
+
+    def close(self) -> None:
+        # arrays must go first: an mmap with exported buffers cannot be closed
+        self.columns = {}
+        self._mmap.close()
+
+    def __enter__(self) -> "CatalogSnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # Decoding
+
+    def strings(self, indexes) -> List[Optional[str]]:
+        # index -1 stands for NULL
+        offsets = self.columns["string_offsets"].tolist()
+        data = self.columns["string_data"]
+        return [
+            None if i < 0 else bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+            for i in indexes.tolist()
+        ]
+
+    def movie_docs(self) -> List[Dict[str, Any]]:
+        """Every movie in the search index document shape, ordered by id."""
+        c = self.columns
+        directors = dict(zip(c["director_ids"].tolist(), self.strings(c["director_names"])))
+        genres = dict(zip(c["genre_ids"].tolist(), self.strings(c["genre_names"])))
+        genre_offsets = c["movie_genre_offsets"].tolist()
+        genre_ids = [genres[genre_id] for genre_id in c["movie_genre_ids"].tolist()]
+
+        docs = []
+        rows = zip(
+            c["movie_ids"].tolist(),
+            c["movie_years"].tolist(),
+            c["movie_director_ids"].tolist(),
+            self.strings(c["movie_titles"]),
+            self.strings(c["movie_casts"]),
+        )
+        for row, (movie_id, year, director_id, title, cast) in enumerate(rows):
+            docs.append({
+                "id": movie_id,
+                "title": title,
+                "release_year": year,
+                "director": {"id": director_id, "name": directors[director_id]} if director_id in directors else None,
+                "genres": genre_ids[genre_offsets[row]:genre_offsets[row + 1]],
+                "cast": cast,
+            })
+        return docs
+
+    def ratings_counts(self) -> np.ndarray:
+        return self.columns["movie_histograms"].sum(axis=1)
+
+
+def build_columns(rows: Dict[str, List[tuple]]) -> Tuple[Dict[str, np.ndarray], int]:
+    """
+    Column arrays for CatalogRepository.get_snapshot_rows output. Strings
+    (titles, cast, names) go to one shared string table.
+    """
+    strings = StringTable()
+    movies, links = rows["movies"], rows["links"]
+    n = len(movies)
+
+    movie_ids = np.array([m[0] for m in movies], dtype=np.int32)
+    # links come ordered by movie id: CSR offsets per movie row
+    link_movies = np.array([movie_id for movie_id, _ in links], dtype=np.int32)
+    genre_offsets = np.searchsorted(link_movies, movie_ids, side="left").astype(np.int64)
+    genre_offsets = np.append(genre_offsets, len(links))
+
+    columns = {
+        "movie_ids": movie_ids,
+        "movie_director_ids": np.array([m[1] for m in movies], dtype=np.int32),
+        "movie_years": np.array([m[2] for m in movies], dtype=np.int32),
+        "movie_titles": np.array([strings.add(m[3]) for m in movies], dtype=np.int32),
+        "movie_casts": np.array([-1 if m[4] is None else strings.add(m[4]) for m in movies], dtype=np.int32),
+        "movie_histograms": np.array([m[5] for m in movies], dtype=np.int64).reshape(n, 10),
+        "movie_genre_offsets": genre_offsets,
+        "movie_genre_ids": np.array([genre_id for _, genre_id in links], dtype=np.int32),
+        "genre_ids": np.array([g[0] for g in rows["genres"]], dtype=np.int32),
+        "genre_names": np.array([strings.add(g[1]) for g in rows["genres"]], dtype=np.int32),
+        "director_ids": np.array([d[0] for d in rows["directors"]], dtype=np.int32),
+        "director_names": np.array([strings.add(d[1]) for d in rows["directors"]], dtype=np.int32),
+    }
+    columns.update(strings.columns())
+    return columns, n
+
+
+def open_snapshot(path: str) -> Optional[CatalogSnapshot]:
+    """The snapshot at `path`, or None when there is none or it is unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return CatalogSnapshot(path)
+    except Exception as e:
+        logger.warning(f"Catalogue snapshot {path} ignored: {str(e)}")
+        return None
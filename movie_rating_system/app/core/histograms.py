@@ -0,0 +1,182 @@
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCORES = range(1, 11)
+
+
+class RatingHistogramCache:
+    """
+    Per-movie 10-bucket score counters (array('i')), read through from
+    movies.rating_histogram and kept as a bounded LRU.
+
+    Ratings written through this worker are applied in place; ratings
+    written through other workers only arrive with cache events on, so
+    entries expire after `ttl` seconds and are read again from the row.
+    A ttl or size of 0 disables the cache (every read is one PK lookup).
+
+    A read-through fill is only stored when no write to the movie overlapped
+    it: rating writes run inside `updating(movie_id)` and apply `record()`
+    after their commit, so a fill that read the row before (or after) the
+    commit but finished around it would otherwise lose or double count the
+    rating for good.
+    """
+
+    def __init__(self, max_movies: int = 20000, ttl: float = 5):
+        self._lock = threading.Lock()
+        self._histograms: "OrderedDict[int, Tuple[float, array]]" = OrderedDict()
+        self.max_movies = max_movies
+        self.ttl = ttl
+        # write sequence, and the last write per movie while any fill is in flight
+        self._sequence = 0
+        self._cleared_at = 0
+        self._fills = 0
+        self._written: Dict[int, int] = {}
+        self._updating: Dict[int, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_movies > 0 and self.ttl > 0
+
+    def get(self, movie_id: int) -> Optional[array]:
+        with self._lock:
+            entry = self._histograms.get(movie_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._histograms[movie_id]
+                entry = None
+            if entry is not None:
+                self._histograms.move_to_end(movie_id)
+                return array("i", entry[1])
+            self._fills += 1
+            started = self._sequence
+
+        try:
+            stored = self._load(movie_id)
+        finally:
+            with self._lock:
+                self._fills -= 1
+                current = (
+                    self._written.get(movie_id, 0) <= started
+                    and self._cleared_at <= started
+                    and movie_id not in self._updating
+                )
+                if not self._fills:
+                    self._written.clear()
+                if current and stored is not None and self.enabled and movie_id not in self._histograms:
+                    self._histograms[movie_id] = (time.monotonic() + self.ttl, array("i", stored))
+                    while len(self._histograms) > self.max_movies:
+                        self._histograms.popitem(last=False)
+
+        return None if stored is None else array("i", stored)
+
+    @staticmethod
+    def _load(movie_id: int) -> Optional[List[int]]:
+        # always the primary: a lagging replica row would stay cached until the next write
+        from app.db.session import get_db_session
+        from app.repositories.rating_histogram_repository import RatingHistogramRepository
+
+        db = get_db_session()
+        try:
+            return RatingHistogramRepository.get_histogram(db, movie_id)
+        finally:
+            db.close()
+
+    def _mark_written(self, movie_id: int) -> None:
+        # caller holds the lock
+        self._sequence += 1
+        if self._fills:
+            self._written[movie_id] = self._sequence
+
+    @contextmanager
+    def updating(self, movie_id: int):
+        """Wraps a rating write and its record(): fills overlapping it are not stored."""
+        with self._lock:
+            self._updating[movie_id] = self._updating.get(movie_id, 0) + 1
+            self._mark_written(movie_id)
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._updating[movie_id] == 1:
+                    del self._updating[movie_id]
+                else:
+                    self._updating[movie_id] -= 1
+                self._mark_written(movie_id)
+
+    def record(self, movie_id: int, score: int, delta: int = 1) -> None:
+        with self._lock:
+            self._mark_written(movie_id)
+            entry = self._histograms.get(movie_id)
+            if entry is not None:
+                entry[1][score - 1] += delta
+
+    def invalidate(self, movie_id: int) -> None:
+        with self._lock:
+            self._mark_written(movie_id)
+            self._histograms.pop(movie_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sequence += 1
+            self._cleared_at = self._sequence
+            self._histograms.clear()
+
+
+def _score_at_rank(histogram, rank: int) -> int:
+    # rank is 1-based; walks at most 10 buckets
+    seen = 0
+    for score, count in zip(SCORES, histogram):
+        seen += count
+        if seen >= rank:
+            return score
+    return 10
+
+
+def percentile(histogram, p: float) -> Optional[int]:
+    total = sum(histogram)
+    if total == 0:
+        return None
+    rank = max(1, math.ceil(p * total / 100))  # nearest-rank
+    return _score_at_rank(histogram, rank)
+
+
+def summarize(histogram) -> Dict[str, Any]:
+    total = sum(histogram)
+    if total == 0:
+        return {
+            "ratings_count": 0,
+            "histogram": list(histogram),
+            "average_rating": None,
+            "median": None,
+            "percentiles": {"p10": None, "p25": None, "p75": None, "p90": None},
+            "share_of_10s": None,
+        }
+
+    middle = (total + 1) // 2
+    if total % 2:
+        median = _score_at_rank(histogram, middle)
+    else:
+        median = (_score_at_rank(histogram, middle) + _score_at_rank(histogram, middle + 1)) / 2
+
+    return {
+        "ratings_count": total,
+        "histogram": list(histogram),
+        "average_rating": round(sum(s * c for s, c in zip(SCORES, histogram)) / total, 2),
+        "median": median,
+        "percentiles": {f"p{p}": percentile(histogram, p) for p in (10, 25, 75, 90)},
+        "share_of_10s": round(histogram[9] / total, 4),
+    }
+
+
+rating_histograms = RatingHistogramCache(
+    max_movies=int(os.getenv("RATING_HISTOGRAM_CACHE_SIZE", "20000")),
+    ttl=float(os.getenv("RATING_HISTOGRAM_CACHE_TTL", "5")),
+)
@@ -4,10 +4,11 @@ from pathlib import Path
 from logging.handlers import RotatingFileHandler
 
 log_dir = Path("app/logs")
-log_dir.mkdir(exist_ok=True)
 
 def setup_logging():
     
+    log_dir.mkdir(exist_ok=True)
+
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     
@@ -42,6 +43,17 @@ def setup_logging():
     error_handler.setFormatter(formatter)
     root_logger.addHandler(error_handler)
     
+    slow_query_handler = RotatingFileHandler(
+        filename="app/logs/slow_queries.log",
+        maxBytes=10*1024*1024,
+        backupCount=5,
+        encoding='utf-8'
+    )
+    slow_query_handler.setFormatter(formatter)
+    slow_query_logger = logging.getLogger("sql.slow")
+    slow_query_logger.handlers.clear()
+    slow_query_logger.addHandler(slow_query_handler)
+    
     logging.getLogger("uvicorn").propagate = False
     logging.getLogger("uvicorn.access").propagate = True  
     
@@ -50,5 +62,3 @@ def setup_logging():
     api_logger.propagate = True
     
     root_logger.info("Logging setup completed")
-
-setup_logging()
@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MovieDetailCache:
+    """
+    Bounded LRU of the static part of movie details (title, year, director,
+    genres, cast). Rating aggregates are not stored here; they come from the
+    rating histogram cache, which expires its entries on its own TTL.
+
+    Writes invalidate entries of this worker only (of every worker with
+    cache events on); entries expire after `ttl` seconds so a movie edited
+    through another worker is never served stale for longer than that.
+    A ttl or size of 0 disables the cache.
+    """
+
+    def __init__(self, max_movies: int = 5000, ttl: float = 5):
+        self._lock = threading.Lock()
+        self._details: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.max_movies = max_movies
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_movies > 0 and self.ttl > 0
+
+    def get(self, movie_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._details.get(movie_id)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._details[movie_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._details.move_to_end(movie_id)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, movie) -> Dict[str, Any]:
+        detail = {
+            "id": movie.id,
+            "title": movie.title,
+            "release_year": movie.release_year,
+            "director": {
+                "id": movie.director.id,
+                "name": movie.director.name,
+            } if movie.director else None,
+            "genres": [g.name for g in movie.genres],
+            "cast": getattr(movie, "cast", "Unknown"),
+        }
+        if not self.enabled:
+            return detail
+        with self._lock:
+            self._details[movie.id] = (time.monotonic() + self.ttl, detail)
+            self._details.move_to_end(movie.id)
+            while len(self._details) > self.max_movies:
+                self._details.popitem(last=False)
+        return dict(detail)
+
+    def invalidate(self, movie_id: int) -> None:
+        with self._lock:
+            self._details.pop(movie_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._details.clear()
+
+    def preload(self, db, movie_ids) -> int:
+        from app.repositories.movie_repository import MovieRepository
+
+        if not movie_ids or not self.enabled:
+            return 0
+        movies = MovieRepository.get_movies_by_ids(db, list(movie_ids))
+        for movie in movies:
+            self.put(movie)
+        logger.info(f"Movie detail cache preloaded - movies={len(movies)}")
+        return len(movies)
+
+    def __len__(self) -> int:
+        return len(self._details)
+
+
+movie_detail_cache = MovieDetailCache(
+    max_movies=int(os.getenv("MOVIE_DETAIL_CACHE_SIZE", "5000")),
+    ttl=float(os.getenv("MOVIE_DETAIL_CACHE_TTL", "5")),
+)
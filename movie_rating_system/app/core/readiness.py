@@ -0,0 +1,69 @@
+import logging
+import os
+import threading
+import time
+from typing import Dict, Any, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """
+    Tracks whether startup warm-up has finished and caches the database
+    probe of each engine for `probe_ttl` seconds, so frequent /ready and
+    /health polling costs at most one SELECT 1 per engine per TTL per worker.
+    """
+
+    def __init__(self, probe_ttl: float = 2.0):
+        self._locks: Dict[int, threading.Lock] = {}
+        self._probes: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+        self.probe_ttl = probe_ttl
+        self.warmed_up = False
+
+    def mark_warmed_up(self) -> None:
+        self.warmed_up = True
+
+    def probe(self, engine) -> Dict[str, Any]:
+        key = id(engine)
+        probed_at, result = self._probes.get(key, (0.0, {"database": "unknown"}))
+        if time.monotonic() - probed_at < self.probe_ttl:
+            return result
+
+        # one poller refreshes, the others keep answering from the last result
+        lock = self._locks.setdefault(key, threading.Lock())
+        if not lock.acquire(blocking=False):
+            return result
+        try:
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                result = {
+                    "database": "connected",
+                    "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+                }
+            except Exception as e:
+                logger.warning(f"Readiness probe failed for {engine.url.render_as_string()}: {str(e)}")
+                result = {"database": "unreachable"}
+            self._probes[key] = (time.monotonic(), result)
+            return result
+        finally:
+            lock.release()
+
+    def probe_all(self, engine, read_engine) -> Dict[str, Any]:
+        """The primary's probe, with the replica's under "replica" when GETs read from one."""
+        probe = dict(self.probe(engine))
+        if read_engine is not engine:
+            probe["replica"] = self.probe(read_engine)
+        return probe
+
+    @staticmethod
+    def connected(probe: Dict[str, Any]) -> bool:
+        return probe["database"] == "connected" and probe.get("replica", probe)["database"] == "connected"
+
+
+readiness = Readiness(
+    probe_ttl=float(os.getenv("READY_PROBE_TTL", "2")),
+)
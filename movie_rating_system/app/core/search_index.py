@@ -0,0 +1,277 @@
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.core.cast import parse_cast
+
+logger = logging.getLogger(__name__)
+
+# characters that ILIKE treats as wildcards / escapes; such titles go to SQL
+_LIKE_SPECIAL = ("%", "_", "\\")
+
+# freed positions tolerated before the bitsets are renumbered
+_COMPACT_MIN_HOLES = 1024
+
+
+def _fold(text: str) -> str:
+    # Postgres lower() maps one character to one (U+0130 -> "i", no final sigma);
+    # Python's lower() does neither
+    if text.isascii():
+        return text.lower()
+    return "".join(c.lower()[0] for c in text)
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def _popcount(bits: int) -> int:
+    return bin(bits).count("1")
+
+
+def _movie_doc(movie) -> Dict[str, Any]:
+    return {
+        "id": movie.id,
+        "title": movie.title,
+        "release_year": movie.release_year,
+        "director": {
+            "id": movie.director.id,
+            "name": movie.director.name,
+        } if movie.director else None,
+        "genres": [g.name for g in movie.genres],
+        "cast": getattr(movie, "cast", "Unknown"),
+    }
+
+
+class MovieSearchIndex:
+    """
+    In-process index answering /search filters with set intersections.
+
+    - title: trigram -> bitset of movies, candidates are verified with a
+      substring check so the result matches ILIKE '%title%'
+    - genres: genre name -> bitset of movies
+    - cast: lower-cased person name -> bitset of movies
+    - release_year: sorted array of (year, movie_id)
+
+    Bitsets are plain Python ints where bit N is the movie at dense position N,
+    so they stay as long as the catalogue whatever the ids. Positions follow id
+    order unless a movie is added below the highest id; the page is then sorted.
+
+    Text is lower-cased per character like Postgres; a title or cast name with
+    non-ASCII characters is still served by SQL, whose case tables may differ.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+        self.ready = False
+
+    def _reset(self):
+        self._docs: Dict[int, Dict[str, Any]] = {}
+        self._titles: Dict[int, str] = {}
+        self._trigram_bits: Dict[str, int] = {}
+        self._genre_bits: Dict[str, int] = {}
+        self._cast_bits: Dict[str, int] = {}
+        self._by_year: List[Tuple[int, int]] = []
+        self._all_bits = 0
+        self._positions: Dict[int, int] = {}
+        self._ids: List[Optional[int]] = []
+        self._max_id = -1
+        self._ordered = True
+
+    # BUILD
+
+    def rebuild(self, db) -> None:
+        from app.repositories.movie_repository import MovieRepository
+
+        self.load([_movie_doc(movie) for movie in MovieRepository.get_all_movies(db)])
+
+    def load(self, docs: List[Dict[str, Any]]) -> None:
+        # docs in the movie detail shape, from the database or a catalogue snapshot
+        with self._lock:
+            self._reset()
+            for doc in sorted(docs, key=lambda d: d["id"]):
+                self._add(doc)
+            self.ready = True
+
+        logger.info(f"Search index built - movies={len(self._docs)}, trigrams={len(self._trigram_bits)}")
+
+    # INCREMENTAL UPDATES
+
+    def upsert_movie(self, movie) -> None:
+        self.upsert_doc(_movie_doc(movie))
+
+    def upsert_doc(self, doc: Dict[str, Any]) -> None:
+        # doc has the movie detail shape (id, title, release_year, director, genres, cast)
+        if not self.ready:
+            return
+        with self._lock:
+            # an update keeps its position (and so the id order)
+            self._remove(doc["id"], keep_position=True)
+            self._add(dict(doc))
+
+    def remove_movie(self, movie_id: int) -> None:
+        if not self.ready:
+            return
+        with self._lock:
+            self._remove(movie_id)
+
+    def _position(self, movie_id: int) -> int:
+        position = self._positions.get(movie_id)
+        if position is None:
+            if movie_id < self._max_id:
+                self._ordered = False
+            self._max_id = max(self._max_id, movie_id)
+            position = len(self._ids)
+            self._positions[movie_id] = position
+            self._ids.append(movie_id)
+        return position
+
+    def _add(self, doc: Dict[str, Any]) -> None:
+        movie_id = doc["id"]
+        bit = 1 << self._position(movie_id)
+        title = _fold(doc["title"])
+
+        self._docs[movie_id] = doc
+        self._titles[movie_id] = title
+        self._all_bits |= bit
+
+        for gram in _trigrams(title):
+            self._trigram_bits[gram] = self._trigram_bits.get(gram, 0) | bit
+
+        for name in doc["genres"]:
+            self._genre_bits[name] = self._genre_bits.get(name, 0) | bit
+
+        for name in parse_cast(doc.get("cast")):
+            key = _fold(name)
+            self._cast_bits[key] = self._cast_bits.get(key, 0) | bit
+
+        insort(self._by_year, (doc["release_year"], movie_id))
+
+    def _remove(self, movie_id: int, keep_position: bool = False) -> None:
+        doc = self._docs.pop(movie_id, None)
+        if doc is None:
+            return
+        position = self._positions[movie_id]
+        mask = ~(1 << position)
+        title = self._titles.pop(movie_id)
+        self._all_bits &= mask
+
+        for gram in _trigrams(title):
+            bits = self._trigram_bits.get(gram, 0) & mask
+            if bits:
+                self._trigram_bits[gram] = bits
+            else:
+                self._trigram_bits.pop(gram, None)
+
+        for name in doc["genres"]:
+            bits = self._genre_bits.get(name, 0) & mask
+            if bits:
+                self._genre_bits[name] = bits
+            else:
+                self._genre_bits.pop(name, None)
+
+        for name in parse_cast(doc.get("cast")):
+            key = _fold(name)
+            bits = self._cast_bits.get(key, 0) & mask
+            if bits:
+                self._cast_bits[key] = bits
+            else:
+                self._cast_bits.pop(key, None)
+
+        pos = bisect_left(self._by_year, (doc["release_year"], movie_id))
+        if pos < len(self._by_year) and self._by_year[pos] == (doc["release_year"], movie_id):
+            del self._by_year[pos]
+
+        if keep_position:
+            return
+        del self._positions[movie_id]
+        self._ids[position] = None
+        holes = len(self._ids) - len(self._docs)
+        if holes >= _COMPACT_MIN_HOLES and holes > len(self._docs):
+            self._compact()
+
+    def _compact(self) -> None:
+        docs = list(self._docs.values())
+        self._reset()
+        for doc in sorted(docs, key=lambda d: d["id"]):
+            self._add(doc)
+        logger.info(f"Search index compacted - movies={len(self._docs)}")
+
+    # QUERY
+
+    def can_serve(self, title: Optional[str], cast: Optional[List[str]] = None) -> bool:
+        if not self.ready:
+            return False
+        if title and (any(c in title for c in _LIKE_SPECIAL) or not title.isascii()):
+            return False
+        return not (cast and not all(name.isascii() for name in cast))
+
+    def search(
+        self,
+        page: int,
+        page_size: int,
+        title: Optional[str] = None,
+        release_year: Optional[int] = None,
+        genres: Optional[List[str]] = None,
+        cast: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        # mirrors MovieRepository.get_movies: same truthiness checks, ordered by id
+        with self._lock:
+            bits = self._all_bits
+
+            if release_year:
+                lo = bisect_left(self._by_year, (release_year, -1))
+                hi = bisect_left(self._by_year, (release_year + 1, -1))
+                year_bits = 0
+                for _, movie_id in self._by_year[lo:hi]:
+                    year_bits |= 1 << self._positions[movie_id]
+                bits &= year_bits
+
+            if genres:
+                # HAVING count(genre) == len(genres): duplicated names never match
+                if len(set(genres)) != len(genres):
+                    bits = 0
+                for name in genres:
+                    bits &= self._genre_bits.get(name, 0)
+
+            if cast:
+                for name in cast:
+                    bits &= self._cast_bits.get(_fold(name.strip()), 0)
+
+            if title and bits:
+                needle = _fold(title)
+                for gram in _trigrams(needle):
+                    bits &= self._trigram_bits.get(gram, 0)
+                matched = 0
+                for position in _iter_bits(bits):
+                    if needle in self._titles[self._ids[position]]:
+                        matched |= 1 << position
+                bits = matched
+
+            total_items = _popcount(bits)
+            offset = (page - 1) * page_size
+            if self._ordered:
+                items = []
+                for rank, position in enumerate(_iter_bits(bits)):
+                    if rank < offset:
+                        continue
+                    if len(items) >= page_size:
+                        break
+                    items.append(dict(self._docs[self._ids[position]]))
+            else:
+                movie_ids = sorted(self._ids[position] for position in _iter_bits(bits))
+                items = [dict(self._docs[movie_id]) for movie_id in movie_ids[offset:offset + page_size]]
+
+        return items, total_items
+
+
+movie_search_index = MovieSearchIndex()
@@ -0,0 +1,284 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from decimal import Decimal
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# redis://host:6379/0 shares pages across workers and pods; memory:// keeps them
+# in this process (tests, single-worker runs); empty disables the cache
+SHARED_CACHE_URL = os.getenv("SHARED_CACHE_URL", "")
+# seconds a page is served as fresh, then for up to STALE_TTL more while one caller recomputes it
+SHARED_CACHE_TTL = float(os.getenv("SHARED_CACHE_TTL", "30"))
+SHARED_CACHE_STALE_TTL = float(os.getenv("SHARED_CACHE_STALE_TTL", "30"))
+# recompute lock lifetime, and how long callers without it wait for the winner's page
+SHARED_CACHE_LOCK_TTL = float(os.getenv("SHARED_CACHE_LOCK_TTL", "5"))
+SHARED_CACHE_LOCK_WAIT = float(os.getenv("SHARED_CACHE_LOCK_WAIT", "1"))
+SHARED_CACHE_SOCKET_TIMEOUT = float(os.getenv("SHARED_CACHE_SOCKET_TIMEOUT", "0.25"))
+
+_POLL_SECONDS = 0.02
+
+
+def _json_default(value: Any) -> Any:
+    # numeric aggregates come back as Decimal; cached pages must decode to the same numbers
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class LocalCacheBackend:
+    """
+    In-process stand-in for Redis with the handful of commands SharedCache
+    uses, same signatures and bytes values as redis-py.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key)
+
+    def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            return [self._live(key) for key in keys]
+
+    def set(self, key: str, value, ex: Optional[float] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            data = value if isinstance(value, bytes) else str(value).encode()
+            self._data[key] = (data, time.monotonic() + ex if ex else None)
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            expires_at = self._data[key][1] if key in self._data else None
+            self._data[key] = (str(value).encode(), expires_at)
+            return value
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+def create_backend(url: str):
+    if not url:
+        return None
+    if url.startswith("memory://"):
+        return LocalCacheBackend()
+    # optional dependency, only needed when a redis:// URL is configured
+    import redis
+
+    return redis.Redis.from_url(
+        url, socket_timeout=SHARED_CACHE_SOCKET_TIMEOUT, socket_connect_timeout=SHARED_CACHE_SOCKET_TIMEOUT
+    )
+
+
+class SharedCache:
+    """
+    Read-through cache of JSON-serializable results in a backend shared by
+    every worker.
+
+    - invalidation: entries record the generation they were computed under;
+      writes bump the generation, so every older entry stops matching at once
+    - stampede protection: on a miss or once an entry is past its fresh TTL,
+      only the caller winning a SET NX lock recomputes. Others wait for its
+      result (miss) or keep serving the stale entry (expiry).
+
+    Backend errors never fail a read: the result is computed directly.
+    """
+
+    def __init__(self, backend=None, prefix: str = "mrs"):
+        self.backend = backend
+        self.prefix = prefix
+        self._generation_key = f"{prefix}:generation"
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "waits": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def key(self, name: str, arguments: Dict[str, Any]) -> str:
+        payload = json.dumps(arguments, sort_keys=True, default=str)
+        return f"{self.prefix}:{name}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    def bump(self) -> None:
+        # called after every committed movie or rating write
+        if not self.enabled:
+            return
+        try:
+            self.backend.incr(self._generation_key)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Shared cache generation bump failed: {str(e)}")
+
+    def _read(self, key: str) -> Tuple[Optional[dict], int]:
+        raw, generation = self.backend.mget([key, self._generation_key])
+        generation = int(generation or 0)
+        entry = json.loads(raw) if raw else None
+        if entry is not None and entry["generation"] != generation:
+            entry = None
+        return entry, generation
+
+    def _store(self, key: str, value: Any, generation: int) -> None:
+        entry = {"generation": generation, "fresh_until": time.time() + SHARED_CACHE_TTL, "value": value}
+        self.backend.set(key, json.dumps(entry, default=_json_default), ex=SHARED_CACHE_TTL + SHARED_CACHE_STALE_TTL)
+
+    def _release(self, lock_key: str, token: str) -> None:
+        if self.backend.get(lock_key) == token.encode():
+            self.backend.delete(lock_key)
+
+    def _wait(self, key: str) -> Optional[dict]:
+        deadline = time.monotonic() + SHARED_CACHE_LOCK_WAIT
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_SECONDS)
+            entry, _ = self._read(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], fill: Optional[Callable[[], Any]] = None) -> Any:
+        # `fill` computes the value that gets stored (default `compute`); results
+        # that are only returned, on backend errors or lock timeouts, use `compute`
+        fill = fill or compute
+        lock_key, token = f"{key}:lock", uuid.uuid4().hex
+        try:
+            entry, generation = self._read(key)
+            if entry is not None and time.time() < entry["fresh_until"]:
+                self._count("hits")
+                return entry["value"]
+            locked = self.backend.set(lock_key, token, ex=SHARED_CACHE_LOCK_TTL, nx=True)
+            if not locked:
+                if entry is not None:
+                    # past its fresh TTL but still current: served while the lock holder refreshes it
+                    self._count("stale_hits")
+                    return entry["value"]
+                self._count("waits")
+                entry = self._wait(key)
+                if entry is not None:
+                    return entry["value"]
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Shared cache unavailable, computing directly - key={key}: {str(e)}")
+            return compute()
+
+        if not locked:
+            # the lock holder did not finish within SHARED_CACHE_LOCK_WAIT
+            return compute()
+
+        self._count("misses")
+        try:
+            value = fill()
+        except Exception:
+            self._release_quietly(lock_key, token)
+            raise
+        try:
+            # stored under the generation read before computing: a write landing meanwhile makes it stale at once
+            self._store(key, value, generation)
+            self._release(lock_key, token)
+        except Exception as e:
+            self._count("errors")
+            logger.warning(f"Shared cache store failed - key={key}: {str(e)}")
+        return value
+
+    def _release_quietly(self, lock_key: str, token: str) -> None:
+        try:
+            self._release(lock_key, token)
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"] + stats["waits"]
+        return {
+            "enabled": self.enabled,
+            **stats,
+            "hit_ratio": round((stats["hits"] + stats["stale_hits"]) / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _normalize(value: Any) -> Any:
+    # list filters (genres, cast, fields) are sets: ["Drama", "Action"] == ["Action", "Drama"]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted(_normalize(v) for v in value)
+    return value
+
+
+def _fill_on_primary(fn, bound: inspect.BoundArguments) -> Any:
+    # the generation may already count a write that a lagging replica has not
+    # replayed: a page read there would be stored as current. The primary has
+    # every write whose bump was read, as for RatingHistogramCache fills.
+    from app.db.session import get_db_session
+
+    db = get_db_session()
+    try:
+        arguments = dict(bound.arguments)
+        if "db" in arguments:
+            arguments["db"] = db
+        else:
+            arguments["self"] = arguments["self"].using(db)
+        return fn(**arguments)
+    finally:
+        db.close()
+
+
+def shared_cached(name: str):
+    """
+    Serves the decorated read from `shared_cache`, keyed on `name` plus the
+    normalized call arguments (`self` and `db` excluded). Cached results come
+    back JSON-decoded (tuples as lists) and must be treated as read-only.
+
+    Stored results are computed on a primary session, passed as `db` or
+    through `self.using(db)`.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not shared_cache.enabled:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = shared_cache.key(name, {
+                arg: _normalize(value)
+                for arg, value in bound.arguments.items()
+                if arg not in ("self", "db")
+            })
+            return shared_cache.get_or_compute(
+                key, lambda: fn(*args, **kwargs), lambda: _fill_on_primary(fn, bound)
+            )
+
+        return wrapper
+
+    return decorator
+
+
+shared_cache = SharedCache(create_backend(SHARED_CACHE_URL))
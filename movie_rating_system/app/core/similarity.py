@@ -0,0 +1,172 @@
+import os
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.cast import parse_cast
+from app.core.similarity_config import SIMILAR_MOVIES_K
+
+# below this many ratings a movie's score profile is too noisy to compare
+SIMILAR_MIN_RATINGS = int(os.getenv("SIMILAR_MIN_RATINGS", "3"))
+
+WEIGHT_GENRES = 0.4
+WEIGHT_CAST = 0.3
+WEIGHT_DIRECTOR = 0.15
+WEIGHT_RATINGS = 0.15
+
+# similarity cells computed per block (rows x movies); bounds peak memory
+BLOCK_CELLS = 2_000_000
+
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    # bits set per row of uint64 words (last axis)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8)
+    return _POPCOUNT8[as_bytes].sum(axis=-1, dtype=np.int32)
+
+
+def cast_tokens(cast: Optional[str]) -> List[str]:
+    # "Actor 8, Actor 3" -> ["actor 3", "actor 8"]
+    return sorted(name.lower() for name in parse_cast(cast))
+
+
+class MovieFeatures:
+    """
+    Column-oriented features of every movie, indexed by position in `ids`:
+    genre bitsets (uint64 words), director ids, cast tokens as sparse
+    (movie, token) postings and unit-length rating profiles.
+    """
+
+    def __init__(
+        self,
+        movies: Sequence[Tuple[int, int, Optional[str], Sequence[int]]],
+        genre_links: Sequence[Tuple[int, int]],
+    ):
+        # movies: (id, director_id, cast, rating_histogram) ordered by id
+        self.ids = np.array([m[0] for m in movies], dtype=np.int64)
+        self.directors = np.array([m[1] for m in movies], dtype=np.int64)
+        n = len(self.ids)
+
+        # genres -> bitsets
+        genre_ids = np.unique(np.array([genre_id for _, genre_id in genre_links], dtype=np.int64))
+        self.genre_words = np.zeros((n, max(1, (len(genre_ids) + 63) // 64)), dtype=np.uint64)
+        if len(genre_ids):
+            links = np.array(genre_links, dtype=np.int64)
+            links = links[np.isin(links[:, 0], self.ids)]
+            bits = np.searchsorted(genre_ids, links[:, 1])
+            np.bitwise_or.at(
+                self.genre_words,
+                (np.searchsorted(self.ids, links[:, 0]), bits // 64),
+                np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64)),
+            )
+        self.genre_counts = _popcount(self.genre_words)
+
+        # cast -> postings sorted by token
+        self.tokens = [cast_tokens(m[2]) for m in movies]
+        vocabulary: Dict[str, int] = {}
+        pair_movies, pair_tokens = [], []
+        for row, tokens in enumerate(self.tokens):
+            for token in tokens:
+                pair_movies.append(row)
+                pair_tokens.append(vocabulary.setdefault(token, len(vocabulary)))
+        self.pair_movies = np.array(pair_movies, dtype=np.int64)
+        self.pair_tokens = np.array(pair_tokens, dtype=np.int64)
+        order = np.argsort(self.pair_tokens, kind="stable")
+        self.postings = self.pair_movies[order]
+        self.token_counts = np.bincount(self.pair_tokens, minlength=len(vocabulary))
+        self.token_starts = np.concatenate(([0], np.cumsum(self.token_counts)[:-1])).astype(np.int64)
+        self.cast_counts = np.bincount(self.pair_movies, minlength=n)
+
+        # rating histograms -> unit profiles (zero when too few ratings)
+        histograms = np.array([m[3] for m in movies], dtype=np.float64).reshape(n, 10)
+        self.ratings_counts = histograms.sum(axis=1)
+        self.profiles = np.zeros_like(histograms)
+        rated = self.ratings_counts >= max(SIMILAR_MIN_RATINGS, 1)
+        self.profiles[rated] = histograms[rated] / self.ratings_counts[rated, None]
+        norms = np.linalg.norm(self.profiles, axis=1)
+        self.unit_profiles = np.divide(
+            self.profiles, norms[:, None], out=np.zeros_like(self.profiles), where=norms[:, None] > 0
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def signatures(self) -> np.ndarray:
+        """
+        Per-movie checksum of everything similarity reads; the profile is
+        quantized so a few extra ratings do not mark a movie as changed.
+        """
+        quantized = np.round(self.profiles * 20).astype(np.int8)
+        signatures = np.empty(len(self), dtype=np.int64)
+        for row in range(len(self)):
+            payload = b"".join((
+                self.genre_words[row].tobytes(),
+                self.directors[row].tobytes(),
+                quantized[row].tobytes(),
+                "\x1f".join(self.tokens[row]).encode(),
+            ))
+            signatures[row] = zlib.crc32(payload)
+        return signatures
+
+    # Similarity of a block of movies (rows) against every movie
+
+    def _cast_overlap(self, rows: np.ndarray) -> np.ndarray:
+        n = len(self)
+        local = np.full(n, -1, dtype=np.int64)
+        local[rows] = np.arange(len(rows))
+        selected = local[self.pair_movies] >= 0
+        query_rows = local[self.pair_movies[selected]]
+        query_tokens = self.pair_tokens[selected]
+
+        # expand each (row, token) into the token's postings: a sparse X_rows @ X.T
+        lengths = self.token_counts[query_tokens]
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros((len(rows), n), dtype=np.float64)
+        offsets = np.repeat(self.token_starts[query_tokens] - (np.cumsum(lengths) - lengths), lengths)
+        others = self.postings[np.arange(total) + offsets]
+        shared = np.bincount(
+            np.repeat(query_rows, lengths) * n + others, minlength=len(rows) * n
+        ).reshape(len(rows), n)
+
+        # cosine over binary token vectors
+        scale = np.sqrt(np.outer(self.cast_counts[rows], self.cast_counts).astype(np.float64))
+        return np.divide(shared, scale, out=np.zeros(shared.shape), where=scale > 0)
+
+    def similarity(self, rows: np.ndarray) -> np.ndarray:
+        words = self.genre_words
+        shared = _popcount(words[rows][:, None, :] & words[None, :, :])
+        union = self.genre_counts[rows][:, None] + self.genre_counts[None, :] - shared
+        genres = np.divide(shared, union, out=np.zeros(shared.shape), where=union > 0)
+
+        same_director = (self.directors[rows][:, None] == self.directors[None, :]).astype(np.float64)
+        ratings = self.unit_profiles[rows] @ self.unit_profiles.T
+
+        scores = (
+            WEIGHT_GENRES * genres
+            + WEIGHT_CAST * self._cast_overlap(rows)
+            + WEIGHT_DIRECTOR * same_director
+            + WEIGHT_RATINGS * ratings
+        )
+        scores[np.arange(len(rows)), rows] = 0.0  # never similar to itself
+        return scores
+
+    def blocks(self, rows: np.ndarray):
+        """Yields (rows, similarity) in blocks of at most BLOCK_CELLS cells."""
+        size = max(1, BLOCK_CELLS // max(1, len(self) * self.genre_words.shape[1]))
+        for start in range(0, len(rows), size):
+            block = rows[start:start + size]
+            yield block, self.similarity(block)
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Column positions and scores of the k best cells per row, best first. Ties
+    go to the lower column (movie id), so a list does not depend on which
+    other rows were computed in the same block.
+    """
+    k = min(k, scores.shape[1])
+    best = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return best, np.take_along_axis(scores, best, axis=1)
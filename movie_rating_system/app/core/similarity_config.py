@@ -0,0 +1,4 @@
+import os
+
+# kept apart from app.core.similarity so the API can read them without importing numpy
+SIMILAR_MOVIES_K = int(os.getenv("SIMILAR_MOVIES_K", "20"))
@@ -0,0 +1,126 @@
+import inspect
+import logging
+import os
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_TIMEOUT", "10"))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical computations: the first caller for a key
+    runs it, callers arriving while it is in flight wait and share its result
+    (or exception). Nothing is kept once the call finishes.
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.timeout = timeout
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self.executions += 1
+            else:
+                call.waiters += 1
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                # a stuck leader must not stall every follower
+                with self._lock:
+                    self.timeouts += 1
+                logger.warning(f"Single-flight wait timed out, running independently - key={key}")
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "timeouts": self.timeouts,
+                "coalescing_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0,
+                "in_flight": len(self._calls),
+            }
+
+
+single_flight = SingleFlight(timeout=SINGLE_FLIGHT_TIMEOUT)
+
+
+def _normalize(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        # order is kept: batch results follow the order of the requested ids
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(v) for v in value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+def coalesced(name: str):
+    """
+    Runs the decorated read through `single_flight`, keyed on `name` plus the
+    normalized call arguments (`self` and `db` excluded). Callers share the
+    returned object, so it must be treated as read-only.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not SINGLE_FLIGHT_ENABLED:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name,) + tuple(
+                (arg, _normalize(value))
+                for arg, value in bound.arguments.items()
+                if arg not in ("self", "db")
+            )
+            return single_flight.do(key, lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,176 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("sql.slow")
+
+SQL_PROFILER_ENABLED = os.getenv("SQL_PROFILER_ENABLED", "false").lower() == "true"
+SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"%\([a-z0-9_]+\)s")
+_IN_LIST_RE = re.compile(r"\((?:\s*\?\s*,)*\s*\?\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+_SUFFIX_RE = re.compile(r"(_\d+)+$")
+
+
+def fingerprint(statement: str) -> str:
+    # the same query with different values (or IN-list lengths) shares a fingerprint
+    normalized = _PARAM_RE.sub("?", statement)
+    normalized = _LITERAL_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("(?...)", normalized)
+    return _SPACE_RE.sub(" ", normalized).strip()
+
+
+def parameter_shape(parameters, executemany: bool) -> str:
+    if executemany and parameters:
+        return f"{len(parameters)}x{parameter_shape(parameters[0], False)}"
+    if isinstance(parameters, dict):
+        # expanded IN parameters (id_1_1, id_1_2, ...) collapse to id:int[n]
+        shape = Counter(
+            (_SUFFIX_RE.sub("", key), type(value).__name__) for key, value in parameters.items()
+        )
+        return "{" + ", ".join(
+            f"{name}:{kind}" + (f"[{n}]" if n > 1 else "") for (name, kind), n in sorted(shape.items())
+        ) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+class RequestProfile:
+    __slots__ = ("statements", "db_ms", "endpoint_ms", "handler_ms")
+
+    def __init__(self):
+        self.statements: List[Dict[str, Any]] = []
+        self.db_ms = 0.0
+        self.endpoint_ms = 0.0
+        self.handler_ms = 0.0
+
+    @property
+    def serialize_ms(self) -> float:
+        # route handler time outside the endpoint: validation + response serialization
+        return max(0.0, self.handler_ms - self.endpoint_ms)
+
+    def repeated(self) -> Dict[str, int]:
+        counts = Counter(s["fingerprint"] for s in self.statements)
+        return {fp: n for fp, n in counts.items() if n > 1}
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def start_profile() -> RequestProfile:
+    profile = RequestProfile()
+    _current_profile.set(profile)
+    return profile
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+
+# SQLAlchemy events
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+
+    if elapsed_ms >= SLOW_QUERY_MS:
+        slow_query_logger.warning(
+            f"Slow query {elapsed_ms:.1f}ms rows={cursor.rowcount} "
+            f"params={parameter_shape(parameters, executemany)}: {_SPACE_RE.sub(' ', statement)}"
+        )
+
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    profile.db_ms += elapsed_ms
+    profile.statements.append({
+        "fingerprint": fingerprint(statement),
+        "params": parameter_shape(parameters, executemany),
+        "duration_ms": round(elapsed_ms, 3),
+        "rows": cursor.rowcount,
+    })
+
+
+def install(*engines) -> None:
+    for engine in set(engines):
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# Routing / middleware
+
+class ProfiledRoute(APIRoute):
+    """APIRoute that splits handler time into endpoint and serialization time."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        call = self.dependant.call
+
+        @wraps(call)
+        def timed_call(*c_args, **c_kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return call(*c_args, **c_kwargs)
+            start = time.perf_counter()
+            try:
+                return call(*c_args, **c_kwargs)
+            finally:
+                profile.endpoint_ms += (time.perf_counter() - start) * 1000
+
+        # async endpoints are awaited by FastAPI, so only sync ones are wrapped
+        if not asyncio.iscoroutinefunction(call):
+            self.dependant.call = timed_call
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request):
+            profile = _current_profile.get()
+            if profile is None:
+                return await handler(request)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                profile.handler_ms += (time.perf_counter() - start) * 1000
+
+        return profiled_handler
+
+
+async def profile_request(request, call_next):
+    profile = start_profile()
+    start = time.perf_counter()
+    response = await call_next(request)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    response.headers["Server-Timing"] = (
+        f"db;dur={profile.db_ms:.1f}, serialize;dur={profile.serialize_ms:.1f}, total;dur={total_ms:.1f}"
+    )
+    response.headers["X-Query-Count"] = str(len(profile.statements))
+
+    repeated = profile.repeated()
+    if repeated:
+        for fp, count in repeated.items():
+            logger.warning(f"Repeated statement x{count} in {request.method} {request.url.path} (possible N+1): {fp}")
+    logger.info(
+        f"SQL profile {request.method} {request.url.path} - queries={len(profile.statements)}, "
+        f"db={profile.db_ms:.1f}ms, serialize={profile.serialize_ms:.1f}ms, total={total_ms:.1f}ms"
+    )
+    return response
@@ -0,0 +1,51 @@
+import threading
+from typing import Dict, Any
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+
+class StatementCacheStats:
+    """Counts SQLAlchemy compiled-statement cache hits per executed statement."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        cache_hit = getattr(context, "cache_hit", None)
+        with self._lock:
+            if cache_hit is CACHE_HIT:
+                self.hits += 1
+            elif cache_hit is CACHE_MISS:
+                self.misses += 1
+            else:
+                # caching disabled, no cache key (driver-level SQL) or no dialect support
+                self.uncached += 1
+
+    def install(self, *engines) -> None:
+        for engine in set(engines):
+            if not event.contains(engine, "after_cursor_execute", self._after_cursor_execute):
+                event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.uncached = 0
+
+    def stats(self, engine=None) -> Dict[str, Any]:
+        with self._lock:
+            cached = self.hits + self.misses
+            data = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "uncached": self.uncached,
+                "hit_rate": round(self.hits / cached, 4) if cached else 0.0,
+            }
+        if engine is not None and engine._compiled_cache is not None:
+            data["compiled_cache_entries"] = len(engine._compiled_cache)
+        return data
+
+
+statement_cache_stats = StatementCacheStats()
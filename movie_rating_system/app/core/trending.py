@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+import time
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# window name -> (bucket seconds, number of buckets)
+WINDOWS = {
+    "1h": (300, 12),
+    "24h": (3600, 24),
+    "7d": (3600, 168),
+}
+
+_RINGS = {
+    300: 12,
+    3600: 168,
+}
+
+
+def _window_total(slots: array, counts: array, seconds: int, buckets: int, now: float) -> int:
+    newest = int(now // seconds)
+    oldest = newest - buckets
+    return sum(c for b, c in zip(slots, counts) if oldest < b <= newest)
+
+
+class _MovieCounters:
+    __slots__ = ("rings",)
+
+    def __init__(self):
+        # bucket seconds -> (bucket numbers held by each slot, counts)
+        self.rings = {
+            seconds: (array("q", [-1] * size), array("I", [0] * size))
+            for seconds, size in _RINGS.items()
+        }
+
+    def add(self, ts: float) -> None:
+        for seconds, size in _RINGS.items():
+            slots, counts = self.rings[seconds]
+            bucket = int(ts // seconds)
+            i = bucket % size
+            if slots[i] == bucket:
+                counts[i] += 1
+            elif slots[i] < bucket:
+                slots[i] = bucket
+                counts[i] = 1
+            # older than the slot's bucket: already outside every window
+
+    def total(self, window: str, now: float) -> int:
+        seconds, buckets = WINDOWS[window]
+        slots, counts = self.rings[seconds]
+        return _window_total(slots, counts, seconds, buckets, now)
+
+    def copy_ring(self, seconds: int) -> Tuple[array, array]:
+        slots, counts = self.rings[seconds]
+        return slots[:], counts[:]
+
+
+class TrendingCounters:
+    """
+    Bucketed sliding-window rating counters per movie.
+
+    Ratings land in a 5-minute ring (1h window) and an hourly ring (24h and 7d
+    windows). Only the TRENDING_MAX_MOVIES most active movies over 7d
+    are kept; the rest are evicted.
+
+    Counts only go up: deleting a rating does not take it out of the windows.
+    Each worker counts the ratings it wrote itself, plus the other workers'
+    when cache events are on.
+    """
+
+    def __init__(self, max_movies: int = 10000, ranking_ttl: float = 5.0):
+        self._lock = threading.Lock()
+        # one ranking computation at a time, outside the lock record() takes
+        self._ranking_lock = threading.Lock()
+        self._movies: Dict[int, _MovieCounters] = {}
+        self._rankings: Dict[str, Tuple[float, List[Tuple[int, int]]]] = {}
+        # bumped whenever movies leave the counters: rankings computed before are dropped
+        self._version = 0
+        # (movie_id, ts) recorded while rebuild() reads the database, None otherwise
+        self._recorded_during_rebuild: Optional[List[Tuple[int, float]]] = None
+        self.max_movies = max_movies
+        self.ranking_ttl = ranking_ttl
+
+    def record(self, movie_id: int, created_at: Optional[datetime] = None) -> None:
+        ts = created_at.timestamp() if created_at else time.time()
+        with self._lock:
+            counters = self._movies.get(movie_id)
+            if counters is None:
+                counters = self._movies[movie_id] = _MovieCounters()
+            counters.add(ts)
+            if self._recorded_during_rebuild is not None:
+                self._recorded_during_rebuild.append((movie_id, ts))
+            if len(self._movies) > self.max_movies:
+                self._evict(time.time())
+
+    def remove(self, movie_id: int) -> None:
+        with self._lock:
+            self._movies.pop(movie_id, None)
+            self._version += 1
+            self._rankings.clear()
+
+    def rebuild(self, db) -> None:
+        from app.repositories.rating_repository import RatingRepository
+
+        now = time.time()
+        since = datetime.fromtimestamp(now - WINDOWS["7d"][0] * WINDOWS["7d"][1], tz=timezone.utc)
+        with self._lock:
+            # the app serves ratings while this runs
+            self._recorded_during_rebuild = []
+        rows = [(movie_id, created_at.timestamp()) for movie_id, created_at in RatingRepository.get_ratings_since(db, since)]
+
+        with self._lock:
+            recorded, self._recorded_during_rebuild = self._recorded_during_rebuild or [], None
+            read = set(rows)
+            self._movies = {}
+            self._version += 1
+            self._rankings.clear()
+            for movie_id, ts in rows + [item for item in recorded if item not in read]:
+                counters = self._movies.get(movie_id)
+                if counters is None:
+                    counters = self._movies[movie_id] = _MovieCounters()
+                counters.add(ts)
+            if len(self._movies) > self.max_movies:
+                self._evict(now)
+
+        logger.info(f"Trending counters rebuilt - ratings={len(rows)}, movies={len(self._movies)}")
+
+    def top(self, window: str, limit: int) -> List[Tuple[int, int]]:
+        now = time.time()
+        cached = self._rankings.get(window)
+        if cached is not None and now - cached[0] <= self.ranking_ttl:
+            return cached[1][:limit]
+
+        with self._ranking_lock:
+            cached = self._rankings.get(window)
+            if cached is None or now - cached[0] > self.ranking_ttl:
+                seconds, buckets = WINDOWS[window]
+                with self._lock:
+                    # array copies only; the totals and the sort run without the lock
+                    version = self._version
+                    snapshot = [
+                        (movie_id, counters.copy_ring(seconds))
+                        for movie_id, counters in self._movies.items()
+                    ]
+                ranking = [
+                    (movie_id, total)
+                    for movie_id, total in (
+                        (movie_id, _window_total(slots, counts, seconds, buckets, now))
+                        for movie_id, (slots, counts) in snapshot
+                    )
+                    if total > 0
+                ]
+                ranking.sort(key=lambda item: (-item[1], item[0]))
+                cached = (now, ranking)
+                with self._lock:
+                    if version == self._version:
+                        self._rankings[window] = cached
+        return cached[1][:limit]
+
+    def _evict(self, now: float) -> None:
+        # drop movies with no 7d activity, then the coldest down to 90% of the cap
+        activity = sorted(
+            (counters.total("7d", now), movie_id)
+            for movie_id, counters in self._movies.items()
+        )
+        keep = int(self.max_movies * 0.9)
+        evicted = 0
+        for total, movie_id in activity:
+            if total > 0 and len(self._movies) <= keep:
+                break
+            del self._movies[movie_id]
+            evicted += 1
+        self._version += 1
+        self._rankings.clear()
+        logger.info(f"Trending counters evicted {evicted} cold movies")
+
+
+trending_counters = TrendingCounters(
+    max_movies=int(os.getenv("TRENDING_MAX_MOVIES", "10000")),
+)
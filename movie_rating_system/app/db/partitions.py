@@ -0,0 +1,157 @@
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "movie_ratings"
+DEFAULT_PARTITION = "movie_ratings_default"
+_PARTITION_RE = re.compile(r"^movie_ratings_p(\d{4})(\d{2})$")
+# advisory lock serializing partition DDL: workers starting together (and the
+# cron script) would otherwise race between the to_regclass check and CREATE TABLE
+_DDL_LOCK_KEY = 0x6D72735F70617274  # "mrs_part"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"movie_ratings_p{month:%Y%m}"
+
+
+def _bound(month: date) -> datetime:
+    return datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+
+
+def is_partitioned(conn) -> bool:
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": PARENT_TABLE},
+    ).scalar()
+    return relkind == "p"
+
+
+def list_rating_partitions(conn) -> List[str]:
+    return list(conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table) "
+            "ORDER BY c.relname"
+        ),
+        {"table": PARENT_TABLE},
+    ).scalars())
+
+
+def create_month_partition(conn, month: date) -> bool:
+    name = partition_name(month)
+    if conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar():
+        return False
+
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    params = {"lower": lower, "upper": upper}
+
+    # rows that already landed in the default partition are moved before attaching
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    if conn.execute(text(f"SELECT to_regclass('{DEFAULT_PARTITION}')")).scalar():
+        conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ),
+            params,
+        )
+    conn.execute(text(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    ))
+    logger.info(f"Created rating partition {name}")
+    return True
+
+
+def lock_partition_ddl(conn) -> None:
+    # held until the caller's transaction ends
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _DDL_LOCK_KEY})
+
+
+def ensure_rating_partitions(conn, months_ahead: int = 3, months_back: int = 0) -> List[str]:
+    if not is_partitioned(conn):
+        logger.warning(f"{PARENT_TABLE} is not partitioned; run the alembic migrations first")
+        return []
+
+    lock_partition_ddl(conn)
+
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT"))
+
+    current = month_start(datetime.now(timezone.utc).date())
+    created = []
+    for offset in range(-months_back, months_ahead + 1):
+        month = add_months(current, offset)
+        if create_month_partition(conn, month):
+            created.append(partition_name(month))
+    return created
+
+
+def subtract_from_histograms(conn, table: str) -> int:
+    """
+    Takes the ratings in `table` (a detached partition) out of
+    movies.rating_histogram, so the histograms, and the director_stats folded
+    from them, count attached ratings only, as `rebuild_histograms` does.
+    """
+    buckets = ", ".join(f"count(*) FILTER (WHERE score = {score}) AS c{score}" for score in range(1, 11))
+    histogram = ", ".join(f"rating_histogram[{score}] - a.c{score}" for score in range(1, 11))
+    result = conn.execute(text(
+        f"UPDATE movies SET rating_histogram = ARRAY[{histogram}] "
+        f"FROM (SELECT movie_id, {buckets} FROM {table} GROUP BY movie_id) AS a "
+        "WHERE movies.id = a.movie_id"
+    ))
+    return result.rowcount
+
+
+def detach_rating_partitions(
+    conn,
+    older_than: date,
+    archive_schema: Optional[str] = "archive",
+    drop: bool = False,
+) -> List[str]:
+    """
+    Detaches monthly partitions that end on or before `older_than`.
+    They are moved into `archive_schema` (or dropped when `drop` is set).
+    Their ratings leave the movie histograms (and so director_stats at its
+    next refresh); daily rollups keep their history either way.
+    """
+    cutoff = month_start(older_than)
+    detached = []
+    lock_partition_ddl(conn)
+
+    for name in list_rating_partitions(conn):
+        match = _PARTITION_RE.match(name)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) > cutoff:
+            continue
+
+        # detached first: the parent lock, held until commit, keeps rating deletes
+        # from changing the partition between the subtraction and the detach
+        conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        movies = subtract_from_histograms(conn, name)
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        elif archive_schema:
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+        detached.append(name)
+        logger.info(f"Detached rating partition {name} (drop={drop}, archive_schema={archive_schema}, movies={movies})")
+
+    return detached
@@ -0,0 +1,51 @@
+import os
+from contextlib import contextmanager
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.pool import NullPool
+
+from app.db.database import DATABASE_URL
+
+ALEMBIC_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "alembic")
+
+
+# Throwaway databases on the DATABASE_URL server, migrated to head: the query
+# plan check and the tests write to these, never to the application database.
+
+def scratch_database_url(url: str = "", suffix: str = "scratch") -> URL:
+    """`url`, or "<DATABASE_URL database>_<suffix>"; refuses the application database."""
+    app_url = make_url(DATABASE_URL)
+    scratch_url = make_url(url) if url else app_url.set(database=f"{app_url.database}_{suffix}")
+    same = lambda u: (u.host, u.port, u.database, dict(u.query))
+    if same(scratch_url) == same(app_url):
+        raise SystemExit(f"{scratch_url.database} is the application database; scratch databases are dropped, use another one")
+    return scratch_url
+
+
+def migrate(url: URL) -> None:
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_PATH)
+    # configparser interpolation: a literal % is written %%
+    config.set_main_option("sqlalchemy.url", url.render_as_string(hide_password=False).replace("%", "%%"))
+    command.upgrade(config, "head")
+
+
+@contextmanager
+def scratch_database(url: URL):
+    """Engine on a freshly created database at `url` migrated to head, dropped on exit."""
+    admin = create_engine(url.set(database="postgres"), isolation_level="AUTOCOMMIT", poolclass=NullPool)
+    with admin.connect() as conn:
+        conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+        conn.execute(text(f'CREATE DATABASE "{url.database}"'))
+    scratch = create_engine(url, poolclass=NullPool)
+    try:
+        migrate(url)
+        yield scratch
+    finally:
+        scratch.dispose()
+        with admin.connect() as conn:
+            conn.execute(text(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)'))
+        admin.dispose()
@@ -1,4 +1,7 @@
-from app.db.database import SessionLocal
+from app.db.database import SessionLocal, ReadSessionLocal
 
 def get_db_session():
-    return SessionLocal()
\ No newline at end of file
+    return SessionLocal()
+
+def get_read_db_session():
+    return ReadSessionLocal()
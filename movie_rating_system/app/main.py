@@ -1,29 +1,153 @@
+import os
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.db.database import engine, Base
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
+from app.db.database import engine, read_engine, Base
+from app.db.session import get_db_session
 
-from app.models import director, genre, movie, rating
+from app.models import catalog_change, director, director_stats, genre, movie, movie_similar, person, rating, rating_rollup
 
 from app.core.logging_config import setup_logging
+from app.core.trending import trending_counters
+from app.core.cache_events import cache_events
+from app.core.readiness import readiness
+from app.core import sql_profiler
+from app.core.admission import write_admission
+from app.core.single_flight import single_flight
+from app.core.shared_cache import shared_cache
+from app.core.statement_cache import statement_cache_stats
+from app.services.cache_sync import register_cache_handlers
+from app.services.warmup import run_warmup
+from app.services.similarity_refresher import similarity_refresher
+from app.services.director_stats_refresher import director_stats_refresher
+from app.services.rating_partition_maintainer import create_rating_partitions, rating_partition_maintainer
+from app.services.catalog_snapshot_job import load_catalog_indexes, rebuild_catalog_indexes, catalog_changes_pruner
 
 try:
-    from app.controllers import movie_controller, rating_controller
+    from app.controllers import movie_controller, rating_controller, director_controller, person_controller
     HAS_CONTROLLERS = True
 except ImportError as e:
     print(f"Controllers not ready yet: {e}")
     HAS_CONTROLLERS = False
 
-setup_logging()
-
 import logging
 logger = logging.getLogger(__name__)
 
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX_ENABLED", "false").lower() == "true"
+AUTOCOMPLETE_ENABLED = os.getenv("AUTOCOMPLETE_ENABLED", "true").lower() == "true"
+# build the in-memory indexes from the catalogue snapshot file when there is one
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", "true").lower() == "true"
+CACHE_EVENTS_ENABLED = os.getenv("CACHE_EVENTS_ENABLED", "false").lower() == "true"
+# disable when the schema is managed with `alembic upgrade head`
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "true").lower() == "true"
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+# responses larger than this many bytes are gzip-compressed for clients that accept it
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1000"))
+
+
+# Startup steps (run from the lifespan, never at import time)
+
+def init_schema():
+    if not DB_CREATE_ALL:
+        return
+    Base.metadata.create_all(bind=engine)
+    logger.info("Database tables checked")
+
+def install_sql_profiler():
+    if sql_profiler.SQL_PROFILER_ENABLED:
+        sql_profiler.install(engine, read_engine)
+        logger.info(f"SQL profiler enabled - slow query threshold={sql_profiler.SLOW_QUERY_MS}ms")
+
+def start_cache_event_listener():
+    # listen before the caches below are built so no event falls in between
+    if not CACHE_EVENTS_ENABLED:
+        return
+    cache_events.enabled = True
+    register_cache_handlers()
+    cache_events.start(engine)
+
+def stop_cache_event_listener():
+    cache_events.stop()
+
+def build_catalog_indexes():
+    # search index and title autocomplete: snapshot plus catch-up, else the whole catalogue
+    if not (SEARCH_INDEX_ENABLED or AUTOCOMPLETE_ENABLED):
+        return
+    db = get_db_session()
+    try:
+        if CATALOG_SNAPSHOT_ENABLED and load_catalog_indexes(db, SEARCH_INDEX_ENABLED, AUTOCOMPLETE_ENABLED):
+            return
+        rebuild_catalog_indexes(db, SEARCH_INDEX_ENABLED, AUTOCOMPLETE_ENABLED)
+    finally:
+        db.close()
+
+def rebuild_trending_counters():
+    db = get_db_session()
+    try:
+        trending_counters.rebuild(db)
+    finally:
+        db.close()
+
+def warm_up():
+    if WARMUP_ENABLED:
+        try:
+            run_warmup()
+        except Exception as e:
+            # a cold worker is still a working one; /ready keeps probing the database
+            logger.error(f"Warm-up failed: {str(e)}", exc_info=True)
+    readiness.mark_warmed_up()
+
+def rebuild_and_warm_up():
+    # meanwhile /search and the list use SQL and /autocomplete answers 503
+    try:
+        build_catalog_indexes()
+        rebuild_trending_counters()
+    except Exception as e:
+        logger.error(f"Startup rebuild failed: {str(e)}", exc_info=True)
+    warm_up()
+
+def start_background_rebuild() -> threading.Thread:
+    # the in-memory rebuilds and warm-up run behind /ready, not before the app serves
+    thread = threading.Thread(target=rebuild_and_warm_up, name="startup-rebuild", daemon=True)
+    thread.start()
+    return thread
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    install_sql_profiler()
+    statement_cache_stats.install(engine, read_engine)
+    init_schema()
+    create_rating_partitions()
+    start_cache_event_listener()
+    startup_rebuild = start_background_rebuild()
+    similarity_refresher.start()
+    catalog_changes_pruner.start()
+    director_stats_refresher.start()
+    rating_partition_maintainer.start()
+    logger.info("Application started successfully")
+    yield
+    startup_rebuild.join(timeout=5)
+    rating_partition_maintainer.stop()
+    director_stats_refresher.stop()
+    catalog_changes_pruner.stop()
+    similarity_refresher.stop()
+    stop_cache_event_listener()
+    logger.info("Application stopped")
+
+
 app = FastAPI(
     title="Movie Rating System API",
     description="Backend API for Movie Rating System - Phase 2 (with Logging)",
     version="2.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 # CORS
@@ -35,10 +159,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+# Server-Timing / X-Query-Count headers (SQL_PROFILER_ENABLED)
+if sql_profiler.SQL_PROFILER_ENABLED:
+    app.middleware("http")(sql_profiler.profile_request)
+
 # Register controllers if available
 if HAS_CONTROLLERS:
     app.include_router(movie_controller.router)
     app.include_router(rating_controller.router)
+    app.include_router(director_controller.router)
+    app.include_router(person_controller.router)
 
 @app.get("/")
 def read_root():
@@ -52,9 +184,35 @@ def read_root():
 
 @app.get("/health")
 def health_check():
+    # liveness: stays 200 while the process is up, but reports the real database state
     logger.debug("Health check endpoint accessed")
-    return {"status": "healthy", "database": "connected"}
+    return {"status": "healthy", **readiness.probe_all(engine, read_engine)}
+
+@app.get("/ready")
+def ready_check():
+    # the read replica too, when one is configured: GET endpoints fail without it
+    probe = readiness.probe_all(engine, read_engine)
+    if not readiness.warmed_up or not readiness.connected(probe):
+        return JSONResponse(
+            status_code=503,
+            content={"status": "not_ready", "warmed_up": readiness.warmed_up, **probe},
+        )
+    return {"status": "ready", "warmed_up": True, **probe}
 
-Base.metadata.create_all(bind=engine)
-logger.info("Database tables created")
-logger.info("Application started successfully")
+@app.get("/metrics")
+def metrics():
+    pool = engine.pool
+    return {
+        "status": "success",
+        "data": {
+            "write_admission": write_admission.stats(),
+            "single_flight": single_flight.stats(),
+            "shared_cache": shared_cache.stats(),
+            "statement_cache": statement_cache_stats.stats(engine),
+            "db_pool": {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            },
+        },
+    }
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, text
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+class CatalogChange(Base):
+    __tablename__ = "catalog_changes"
+
+    # append-only log of movie writes (ratings are not logged); workers starting from a
+    # catalogue snapshot re-read only the movies logged by transactions the
+    # snapshot may not have seen (xact_id at or above its xmin)
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # no foreign key: deletes are logged too
+    movie_id = Column(Integer, nullable=False)
+    action = Column(String(16), nullable=False)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # id of the writing transaction (xid8, never wraps)
+    xact_id = Column(BigInteger, server_default=text("(pg_current_xact_id()::text::bigint)"), nullable=False, index=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey
+from app.db.database import Base
+
+class DirectorStats(Base):
+    __tablename__ = "director_stats"
+
+    # movies_count maintained by the movie writes, rating totals refreshed periodically (see DirectorStatsRepository)
+    director_id = Column(Integer, ForeignKey("directors.id", ondelete="CASCADE"), primary_key=True)
+    movies_count = Column(Integer, nullable=False, default=0)
+    ratings_count = Column(BigInteger, nullable=False, default=0)
+    score_sum = Column(BigInteger, nullable=False, default=0)
@@ -1,12 +1,14 @@
-from sqlalchemy import Column, Integer, String, Text, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 movie_genres = Table(
     'movie_genres',
     Base.metadata,
-    Column('movie_id', Integer, ForeignKey('movies.id'), primary_key=True),
-    Column('genre_id', Integer, ForeignKey('genres.id'), primary_key=True)
+    Column('movie_id', Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True),
+    Column('genre_id', Integer, ForeignKey('genres.id'), primary_key=True),
+    # genre filters look links up by genre; the primary key leads with movie_id
+    Index('ix_movie_genres_genre_id_movie_id', 'genre_id', 'movie_id'),
 )
 
 class Genre(Base):
@@ -1,19 +1,31 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Index, text
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Movie(Base):
     __tablename__ = "movies"
+    __table_args__ = (
+        # keyset pagination of a director's filmography
+        Index("ix_movies_director_id_release_year_id", "director_id", "release_year", "id"),
+        # release_year filter of the list endpoints
+        Index("ix_movies_release_year", "release_year"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     title = Column(String(255), nullable=False)
     director_id = Column(Integer, ForeignKey("directors.id"), nullable=False)
     release_year = Column(Integer, nullable=False)
     cast = Column(Text, nullable=True)
+    # rating_histogram[1] .. rating_histogram[10] = number of ratings with that score
+    rating_histogram = Column(
+        ARRAY(Integer), nullable=False, server_default=text("'{0,0,0,0,0,0,0,0,0,0}'")
+    )
     
     director = relationship("Director", back_populates="movies")
-    genres = relationship("Genre", secondary="movie_genres", back_populates="movies")
-    ratings = relationship("Rating", back_populates="movie", cascade="all, delete-orphan")
+    genres = relationship("Genre", secondary="movie_genres", back_populates="movies", passive_deletes=True)
+    # rows go through the ON DELETE CASCADE foreign key instead of being loaded and deleted one by one
+    ratings = relationship("Rating", back_populates="movie", cascade="all, delete-orphan", passive_deletes=True)
     
     @property
     def average_rating(self):
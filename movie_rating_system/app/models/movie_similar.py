@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, BigInteger, Float, ForeignKey, DateTime, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.db.database import Base
+
+class MovieSimilar(Base):
+    __tablename__ = "movie_similar"
+
+    # top-K neighbours of one movie, best first (built by app/services/similarity_job.py)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    similar_ids = Column(ARRAY(Integer), nullable=False)
+    scores = Column(ARRAY(Float(precision=24)), nullable=False)
+    # checksum of the features the list was built from, to find changed movies
+    signature = Column(BigInteger, nullable=False)
+    built_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
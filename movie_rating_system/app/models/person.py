@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index, func
+from app.db.database import Base
+
+# normalized Movie.cast: one row per credited person, kept in sync by the movie writes
+movie_cast = Table(
+    'movie_cast',
+    Base.metadata,
+    Column('movie_id', Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True),
+    Column('person_id', Integer, ForeignKey('people.id', ondelete='CASCADE'), primary_key=True),
+    # billing order within the movie, from 1
+    Column('position', Integer, nullable=False),
+    Index('ix_movie_cast_person_id', 'person_id'),
+)
+
+class Person(Base):
+    __tablename__ = "people"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=False)
+
+# names are matched case-insensitively
+Index("ix_people_lower_name", func.lower(Person.name), unique=True)
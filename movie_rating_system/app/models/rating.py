@@ -1,17 +1,21 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, CheckConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Rating(Base):
     __tablename__ = "movie_ratings"
+    # monthly range partitions on created_at, managed by app.db.partitions
     __table_args__ = (
         CheckConstraint('score >= 1 AND score <= 10', name='score_range_check'),
+        Index('ix_movie_ratings_movie_id_created_at', 'movie_id', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
     score = Column(Integer, nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # part of the primary key because the table is partitioned on it
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), nullable=False)
     
     movie = relationship("Movie", back_populates="ratings")
\ No newline at end of file
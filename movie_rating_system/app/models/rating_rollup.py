@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey, Date
+from sqlalchemy.dialects.postgresql import ARRAY
+from app.db.database import Base
+
+class RatingDailyRollup(Base):
+    __tablename__ = "movie_rating_daily"
+
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    ratings_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(Integer, nullable=False, default=0)
+    # histogram[1] .. histogram[10] = number of ratings with that score
+    histogram = Column(ARRAY(Integer), nullable=False)
@@ -0,0 +1,89 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, literal, text
+from datetime import datetime
+from typing import List, Dict, Iterable
+
+from app.models.catalog_change import CatalogChange
+from app.models.movie import Movie
+from app.models.genre import Genre, movie_genres
+from app.models.director import Director
+from app.repositories.director_stats_repository import histogram_totals
+
+
+class CatalogRepository:
+
+    # Change log (the caller commits: these run in the same transaction as the movie write)
+
+    @staticmethod
+    def record_changes(db: Session, movie_ids: Iterable[int], action: str = "upsert") -> None:
+        rows = [{"movie_id": movie_id, "action": action} for movie_id in movie_ids]
+        if rows:
+            db.execute(insert(CatalogChange), rows)
+
+    @staticmethod
+    def record_changes_cte(written, action: str):
+        # logs the ids RETURNING'd by a data-modifying CTE within the same statement
+        return (
+            insert(CatalogChange)
+            .from_select(["movie_id", "action"], select(written.c.id, literal(action)))
+            .cte(f"logged_{action}")
+        )
+
+    @staticmethod
+    def prune_changes(db: Session, before: datetime) -> int:
+        result = db.execute(delete(CatalogChange).where(CatalogChange.changed_at < before))
+        return result.rowcount
+
+    # Snapshot reads
+
+    @staticmethod
+    def get_snapshot_xmin(db: Session) -> int:
+        # transactions from this id on may be invisible to the current (REPEATABLE READ) snapshot
+        return db.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint")).scalar()
+
+    @staticmethod
+    def get_snapshot_rows(db: Session) -> Dict[str, List[tuple]]:
+        movies = db.execute(
+            select(Movie.id, Movie.director_id, Movie.release_year, Movie.title, Movie.cast, Movie.rating_histogram)
+            .order_by(Movie.id)
+        ).all()
+        links = db.execute(
+            select(movie_genres.c.movie_id, movie_genres.c.genre_id)
+            .order_by(movie_genres.c.movie_id, movie_genres.c.genre_id)
+        ).all()
+        genres = db.execute(select(Genre.id, Genre.name).order_by(Genre.id)).all()
+        directors = db.execute(select(Director.id, Director.name).order_by(Director.id)).all()
+        return {
+            "movies": [tuple(row) for row in movies],
+            "links": [tuple(row) for row in links],
+            "genres": [tuple(row) for row in genres],
+            "directors": [tuple(row) for row in directors],
+        }
+
+    # Catch-up after a snapshot
+
+    # Both take the snapshot's xmin: rows written by older transactions are in
+    # the snapshot, newer ones may or may not be (re-reading them is harmless).
+
+    @staticmethod
+    def get_changed_movie_ids(db: Session, since_xact_id: int) -> List[int]:
+        return db.execute(
+            select(CatalogChange.movie_id)
+            .where(CatalogChange.xact_id >= since_xact_id)
+            .distinct()
+        ).scalars().all()
+
+    @staticmethod
+    def get_rated_movie_counts(db: Session, since_xact_id: int) -> Dict[int, int]:
+        """
+        Current ratings count of every movie whose row was last written (a
+        rating updates its histogram) by a transaction from `since_xact_id`
+        on, read from the row's xmin: rating writes are not logged. Compared
+        by age() so 32-bit xid wraparound is handled; frozen rows are older.
+        """
+        ratings_count, _ = histogram_totals(Movie.rating_histogram)
+        written_since = text("age(movies.xmin) <= age(CAST(CAST(:since_xid AS text) AS xid))").bindparams(
+            since_xid=since_xact_id % 2**32
+        )
+        rows = db.execute(select(Movie.id, ratings_count).where(written_since))
+        return {movie_id: count for movie_id, count in rows}
@@ -1,16 +1,20 @@
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from sqlalchemy import select, exists, func, lambda_stmt
+from typing import Optional, List, Dict, Tuple
 from app.models.director import Director
+from app.models.director_stats import DirectorStats
 
 class DirectorRepository:
     
     @staticmethod
     def get_director_by_id(db: Session, director_id: int) -> Optional[Director]:
-        return db.query(Director).filter(Director.id == director_id).first()
+        stmt = lambda_stmt(lambda: select(Director).where(Director.id == director_id))
+        return db.execute(stmt).scalars().first()
     
     @staticmethod
     def director_exists(db: Session, director_id: int) -> bool:
-        return db.query(Director).filter(Director.id == director_id).first() is not None
+        stmt = lambda_stmt(lambda: select(exists().where(Director.id == director_id)))
+        return db.execute(stmt).scalar()
     
     @staticmethod
     def get_all_directors(db: Session) -> List[Director]:
@@ -23,3 +27,42 @@ class DirectorRepository:
         db.commit()
         db.refresh(director)
         return director
+
+    @staticmethod
+    def get_director_names(db: Session, director_ids: List[int]) -> Dict[int, str]:
+        if not director_ids:
+            return {}
+        rows = db.execute(select(Director.id, Director.name).where(Director.id.in_(director_ids)))
+        return {director_id: name for director_id, name in rows}
+
+    # Reads with the maintained career totals (no row yet = no movies)
+
+    @staticmethod
+    def _with_stats():
+        return (
+            select(
+                Director.id,
+                Director.name,
+                Director.birth_year,
+                Director.description,
+                func.coalesce(DirectorStats.movies_count, 0).label("movies_count"),
+                func.coalesce(DirectorStats.ratings_count, 0).label("ratings_count"),
+                func.coalesce(DirectorStats.score_sum, 0).label("score_sum"),
+            )
+            .outerjoin(DirectorStats, DirectorStats.director_id == Director.id)
+        )
+
+    @staticmethod
+    def get_director_with_stats(db: Session, director_id: int) -> Optional[dict]:
+        stmt = lambda_stmt(lambda: DirectorRepository._with_stats().where(Director.id == director_id))
+        row = db.execute(stmt).mappings().first()
+        return dict(row) if row else None
+
+    @staticmethod
+    def get_directors_with_stats(db: Session, page: int, page_size: int) -> Tuple[List[dict], int]:
+        total_items = db.execute(lambda_stmt(lambda: select(func.count(Director.id)))).scalar()
+        offset, limit = (page - 1) * page_size, page_size
+        stmt = lambda_stmt(
+            lambda: DirectorRepository._with_stats().order_by(Director.id).offset(offset).limit(limit)
+        )
+        return [dict(row) for row in db.execute(stmt).mappings()], total_items
@@ -0,0 +1,91 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text, select, update, func
+from typing import List, Tuple
+
+from app.models.director_stats import DirectorStats
+
+
+def histogram_totals(histogram) -> Tuple:
+    """SQL expressions for (ratings count, score sum) of a rating_histogram column."""
+    ratings = sum(histogram[score] for score in range(1, 11))
+    score_sum = sum(score * histogram[score] for score in range(1, 11))
+    return ratings, score_sum
+
+
+class DirectorStatsRepository:
+
+    # movie counts: the caller commits, these run in the same transaction as the movie write.
+    # Rating totals are not touched by rating writes (one hot row per director);
+    # refresh_ratings folds them in from movies.rating_histogram periodically.
+
+    @staticmethod
+    def add_movies(db: Session, director_ids: List[int]) -> None:
+        # one entry per new movie, repeated ids count several times
+        if not director_ids:
+            return
+        db.execute(
+            text(
+                "INSERT INTO director_stats (director_id, movies_count, ratings_count, score_sum) "
+                "SELECT director_id, count(*), 0, 0 FROM unnest(CAST(:ids AS integer[])) AS director_id "
+                "GROUP BY director_id "
+                "ON CONFLICT (director_id) DO UPDATE SET "
+                "movies_count = director_stats.movies_count + EXCLUDED.movies_count"
+            ),
+            {"ids": director_ids},
+        )
+
+    @staticmethod
+    def remove_movies_cte(deleted):
+        """
+        UPDATE subtracting the movies in `deleted` (a DELETE ... RETURNING
+        director_id CTE), as a CTE to attach to the delete statement so both
+        run in one round trip. Their ratings leave the totals on the next
+        refresh_ratings.
+        """
+        totals = (
+            select(deleted.c.director_id, func.count().label("movies_count"))
+            .group_by(deleted.c.director_id)
+            .subquery("deleted_totals")
+        )
+        return (
+            update(DirectorStats)
+            .where(DirectorStats.director_id == totals.c.director_id)
+            .values(movies_count=DirectorStats.movies_count - totals.c.movies_count)
+            .cte("director_stats_removed")
+        )
+
+    @staticmethod
+    def refresh_ratings(db: Session) -> int:
+        # one pass over movies; only directors whose totals changed are written
+        ratings = " + ".join(f"m.rating_histogram[{score}]" for score in range(1, 11))
+        score_sum = " + ".join(f"{score} * m.rating_histogram[{score}]" for score in range(1, 11))
+        result = db.execute(
+            text(
+                "UPDATE director_stats SET ratings_count = t.ratings_count, score_sum = t.score_sum "
+                f"FROM (SELECT s.director_id, coalesce(sum({ratings}), 0) AS ratings_count, "
+                f"coalesce(sum({score_sum}), 0) AS score_sum "
+                "FROM director_stats s LEFT JOIN movies m ON m.director_id = s.director_id "
+                "GROUP BY s.director_id) AS t "
+                "WHERE director_stats.director_id = t.director_id "
+                "AND (director_stats.ratings_count, director_stats.score_sum) "
+                "IS DISTINCT FROM (t.ratings_count, t.score_sum)"
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def rebuild_all(db: Session) -> int:
+        # recomputed from movies.rating_histogram, directors without movies get no row
+        db.execute(text("DELETE FROM director_stats"))
+        ratings = " + ".join(f"rating_histogram[{score}]" for score in range(1, 11))
+        score_sum = " + ".join(f"{score} * rating_histogram[{score}]" for score in range(1, 11))
+        result = db.execute(
+            text(
+                "INSERT INTO director_stats (director_id, movies_count, ratings_count, score_sum) "
+                f"SELECT director_id, count(*), coalesce(sum({ratings}), 0), coalesce(sum({score_sum}), 0) "
+                "FROM movies GROUP BY director_id"
+            )
+        )
+        db.commit()
+        return result.rowcount
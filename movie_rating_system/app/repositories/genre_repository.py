@@ -1,4 +1,5 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import select, lambda_stmt
 from typing import List, Optional
 from app.models.genre import Genre
 
@@ -30,4 +31,5 @@ class GenreRepository:
     def get_genres_by_names(db: Session, genre_names: List[str]) -> List[Genre]:
         if not genre_names:
             return []
-        return db.query(Genre).filter(Genre.name.in_(genre_names)).all()
+        stmt = lambda_stmt(lambda: select(Genre).where(Genre.name.in_(genre_names)))
+        return db.execute(stmt).scalars().all()
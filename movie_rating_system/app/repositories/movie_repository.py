@@ -1,10 +1,88 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from typing import Optional, List, Tuple
+from sqlalchemy.orm import Session, joinedload, selectinload, load_only
+from sqlalchemy import func, or_, select, exists, lambda_stmt, insert, update, delete, values, column, tuple_, true, cast, Integer, Numeric, String, Text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import Select
+from typing import Optional, List, Tuple, Dict, Iterable, Collection, Any
 
 from app.models.movie import Movie
-from app.models.genre import Genre
-from app.models.rating import Rating
+from app.models.genre import Genre, movie_genres
+from app.models.director import Director
+from app.repositories.director_stats_repository import DirectorStatsRepository, histogram_totals
+from app.repositories.person_repository import PersonRepository
+from app.repositories.catalog_repository import CatalogRepository
+from app.models.person import Person, movie_cast
+from app.core.cast import parse_cast
+from app.core.cache_events import cache_events
+
+
+# item fields of the list endpoints, in response order; `fields=` picks a subset
+MOVIE_LIST_FIELDS = ("id", "title", "release_year", "director", "genres", "cast", "average_rating", "ratings_count")
+RATING_FIELDS = ("average_rating", "ratings_count")
+
+_LIST_COLUMNS = {"title": Movie.title, "release_year": Movie.release_year, "cast": Movie.cast}
+
+
+def list_load_options(fields: Optional[Collection[str]]) -> tuple:
+    """
+    Loader options for a list page: only the requested columns, and the
+    director / genres relationships only when those fields are wanted (both
+    selectin loads, one extra statement each per page).
+    """
+    wanted = MOVIE_LIST_FIELDS if fields is None else fields
+    options = [load_only(Movie.id, *(column for name, column in _LIST_COLUMNS.items() if name in wanted))]
+    if "director" in wanted:
+        options.append(selectinload(Movie.director))
+    if "genres" in wanted:
+        options.append(selectinload(Movie.genres))
+    return tuple(options)
+
+
+def _histogram_rating_columns() -> tuple:
+    # (average_rating, ratings_count) of a movie row, from its rating_histogram
+    ratings_count, score_sum = histogram_totals(Movie.rating_histogram)
+    average = func.coalesce(cast(score_sum, Numeric) / func.nullif(ratings_count, 0), 0)
+    return average.label("average_rating"), ratings_count.label("ratings_count")
+
+
+def _credited_movie_ids(names) -> Select:
+    """
+    Ids of movies crediting every named person: lower(name) index, then
+    movie_cast by person. Names are lowered (and told apart) by Postgres, the
+    same way as the people key; Python's lower() disagrees for some scripts.
+    """
+    wanted = func.unnest(names).table_valued("name").render_derived(name="wanted")
+    wanted_count = select(func.count(func.distinct(func.lower(wanted.c.name)))).scalar_subquery()
+    return (
+        select(movie_cast.c.movie_id)
+        .join(Person, Person.id == movie_cast.c.person_id)
+        .where(func.lower(Person.name).in_(select(func.lower(wanted.c.name))))
+        .group_by(movie_cast.c.movie_id)
+        .having(func.count() == wanted_count)
+    )
+
+
+def movie_list_item(movie, avg, count, fields: Optional[Collection[str]] = None) -> Dict[str, Any]:
+    # reads only the attributes loaded by list_load_options(fields)
+    wanted = MOVIE_LIST_FIELDS if fields is None else fields
+    item = {"id": movie.id}
+    if "title" in wanted:
+        item["title"] = movie.title
+    if "release_year" in wanted:
+        item["release_year"] = movie.release_year
+    if "director" in wanted:
+        item["director"] = {
+            "id": movie.director.id,
+            "name": movie.director.name,
+        } if movie.director else None
+    if "genres" in wanted:
+        item["genres"] = [g.name for g in movie.genres]
+    if "cast" in wanted:
+        item["cast"] = getattr(movie, "cast", "Unknown")
+    if "average_rating" in wanted:
+        item["average_rating"] = round(float(avg), 2) if count > 0 else None
+    if "ratings_count" in wanted:
+        item["ratings_count"] = count
+    return item
 
 
 class MovieRepository:
@@ -33,7 +111,16 @@ class MovieRepository:
         if genre_name:
             query = query.join(Movie.genres).filter(Genre.name == genre_name)
 
-        total_items = query.count()
+        if genre_name and not (title or release_year):
+            # every link references an existing movie: counting them needs no scan of movies
+            total_items = (
+                db.query(func.count(movie_genres.c.movie_id))
+                .join(Genre, Genre.id == movie_genres.c.genre_id)
+                .filter(Genre.name == genre_name)
+                .scalar()
+            )
+        else:
+            total_items = query.count()
         offset = (page - 1) * page_size
         movies = query.offset(offset).limit(page_size).all()
 
@@ -57,6 +144,11 @@ class MovieRepository:
         movie = Movie(**movie_data)
         movie.genres = genres  
         db.add(movie)
+        db.flush()
+        DirectorStatsRepository.add_movies(db, [movie.director_id])
+        PersonRepository.set_movie_cast(db, {movie.id: parse_cast(movie.cast)})
+        CatalogRepository.record_changes(db, [movie.id])
+        cache_events.publish(db, "movie", "upsert", movie.id)
         db.commit()
         db.refresh(movie)
         return movie
@@ -67,42 +159,236 @@ class MovieRepository:
         db: Session,
         movie_id: int,
         update_data: dict,
-        genres: Optional[List[Genre]] = None  
-    ) -> Optional[Movie]:
-
-        movie = db.query(Movie).filter(Movie.id == movie_id).first()
-        if not movie:
-            return None
+        genre_ids: Optional[List[int]] = None
+    ) -> Optional[dict]:
+        """
+        Single round trip: UPDATE ... RETURNING in a CTE, the movie_genres diff
+        (when genre_ids is given) in sibling CTEs, and the director name joined
+        in the outer SELECT. Returns None when the movie does not exist.
+        A new cast string also rewrites movie_cast before the commit (as does
+        the cache event, when cache events are on).
+        """
+        movies = Movie.__table__
+        updated = (
+            update(movies)
+            .where(movies.c.id == movie_id)
+            .values(**{k: v for k, v in update_data.items() if v is not None} or {"title": movies.c.title})
+            .returning(
+                movies.c.id, movies.c.title, movies.c.release_year, movies.c.cast,
+                movies.c.director_id, movies.c.rating_histogram,
+            )
+            .cte("updated")
+        )
+        stmt = (
+            select(updated, Director.name.label("director_name"))
+            .select_from(updated)
+            .outerjoin(Director, Director.id == updated.c.director_id)
+            .add_cte(CatalogRepository.record_changes_cte(updated, "upsert"))
+        )
 
-        for key, value in update_data.items():
-            if value is not None:
-                setattr(movie, key, value)
+        if genre_ids is None:
+            current_genres = (
+                select(func.array_agg(Genre.name))
+                .join(movie_genres, movie_genres.c.genre_id == Genre.id)
+                .where(movie_genres.c.movie_id == updated.c.id)
+                .scalar_subquery()
+            )
+            stmt = stmt.add_columns(current_genres.label("genres"))
+        else:
+            removed = (
+                delete(movie_genres)
+                .where(movie_genres.c.movie_id.in_(select(updated.c.id)))
+                .where(movie_genres.c.genre_id.not_in(genre_ids))
+                .cte("removed_genres")
+            )
+            added = (
+                pg_insert(movie_genres)
+                .from_select(
+                    ["movie_id", "genre_id"],
+                    select(updated.c.id, Genre.id)
+                    .select_from(updated)
+                    .join(Genre, true())
+                    .where(Genre.id.in_(genre_ids)),
+                )
+                .on_conflict_do_nothing()
+                .cte("added_genres")
+            )
+            stmt = stmt.add_cte(removed, added)
 
-        if genres is not None:
-            movie.genres = genres  
+        row = db.execute(stmt).mappings().first()
+        if row and update_data.get("cast") is not None:
+            PersonRepository.set_movie_cast(db, {movie_id: parse_cast(update_data["cast"])})
+        if row:
+            cache_events.publish(db, "movie", "upsert", movie_id)
         db.commit()
-        db.refresh(movie)
-        return movie
+        return dict(row) if row else None
+
 
+    @staticmethod
+    def _delete_movies_stmt(where):
+        # movie_genres links, ratings and rollups go through ON DELETE CASCADE;
+        # the director totals and the change log are written from the deleted rows in the same statement
+        movies = Movie.__table__
+        deleted = (
+            delete(movies)
+            .where(where)
+            .returning(movies.c.id, movies.c.director_id, movies.c.rating_histogram)
+            .cte("deleted_movies")
+        )
+        return select(deleted.c.id).add_cte(
+            DirectorStatsRepository.remove_movies_cte(deleted),
+            CatalogRepository.record_changes_cte(deleted, "delete"),
+        )
 
     @staticmethod
     def delete_movie(db: Session, movie_id: int) -> bool:
-        movie = db.query(Movie).filter(Movie.id == movie_id).first()
-        if not movie:
-            return False
+        stmt = MovieRepository._delete_movies_stmt(Movie.__table__.c.id == movie_id)
+        deleted = db.execute(stmt).first() is not None
+        if deleted:
+            cache_events.publish(db, "movie", "delete", movie_id)
+        db.commit()
+        return deleted
 
-        db.delete(movie)
+    @staticmethod
+    def delete_movies(db: Session, movie_ids: List[int]) -> List[int]:
+        if not movie_ids:
+            return []
+        stmt = MovieRepository._delete_movies_stmt(Movie.__table__.c.id.in_(movie_ids))
+        deleted = db.execute(stmt).scalars().all()
+        cache_events.publish_many(db, "movie", "delete", sorted(deleted))
         db.commit()
-        return True
+        return list(deleted)
+
+    # Bulk writes (the caller commits)
+
+    @staticmethod
+    def get_movie_directors(db: Session, movie_ids: List[int]) -> Dict[int, int]:
+        if not movie_ids:
+            return {}
+        rows = db.execute(select(Movie.id, Movie.director_id).where(Movie.id.in_(movie_ids)))
+        return {movie_id: director_id for movie_id, director_id in rows}
+
+    @staticmethod
+    def bulk_insert_movies(db: Session, rows: List[dict]) -> List[int]:
+        if not rows:
+            return []
+        # multi-row INSERT ... RETURNING, ids come back in the order of `rows`
+        result = db.execute(
+            insert(Movie).returning(Movie.id, sort_by_parameter_order=True),
+            rows,
+        )
+        movie_ids = list(result.scalars())
+        DirectorStatsRepository.add_movies(db, [row["director_id"] for row in rows])
+        CatalogRepository.record_changes(db, movie_ids)
+        return movie_ids
+
+    @staticmethod
+    def bulk_update_movies(db: Session, rows: List[dict]) -> None:
+        if not rows:
+            return
+        data = values(
+            column("id", Integer),
+            column("title", String),
+            column("release_year", Integer),
+            column("cast", Text),
+            name="data",
+        ).data([(r["id"], r["title"], r["release_year"], r.get("cast")) for r in rows])
+        db.execute(
+            update(Movie)
+            .where(Movie.id == data.c.id)
+            .values(
+                title=data.c.title,
+                release_year=data.c.release_year,
+                cast=func.coalesce(data.c.cast, Movie.cast),
+            )
+        )
+        CatalogRepository.record_changes(db, [r["id"] for r in rows])
+
+    @staticmethod
+    def set_movie_genres(db: Session, links: Dict[int, Iterable[int]]) -> None:
+        # diff applied set-wise: drop links not wanted, add missing ones
+        if not links:
+            return
+        pairs = [(movie_id, genre_id) for movie_id, genre_ids in links.items() for genre_id in set(genre_ids)]
+        db.execute(
+            delete(movie_genres)
+            .where(movie_genres.c.movie_id.in_(list(links)))
+            .where(tuple_(movie_genres.c.movie_id, movie_genres.c.genre_id).not_in(pairs))
+        )
+        if pairs:
+            db.execute(
+                pg_insert(movie_genres)
+                .values([{"movie_id": m, "genre_id": g} for m, g in pairs])
+                .on_conflict_do_nothing()
+            )
+
+    # Hot read paths are lambda statements: after the first call SQLAlchemy
+    # reuses both the built construct and its compiled SQL, only binding values.
 
     @staticmethod
     def movie_exists(db: Session, movie_id: int) -> bool:
-        return db.query(Movie).filter(Movie.id == movie_id).first() is not None
+        stmt = lambda_stmt(lambda: select(exists().where(Movie.id == movie_id)))
+        return db.execute(stmt).scalar()
 
     @staticmethod
     def get_movies_by_director(db: Session, director_id: int) -> List[Movie]:
         return db.query(Movie).filter(Movie.director_id == director_id).all()
 
+    @staticmethod
+    def get_director_filmography(
+        db: Session,
+        director_id: int,
+        limit: int,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> List[dict]:
+        """
+        One page of a director's movies, newest first, keyset-paginated on
+        (release_year, id). Genres and the score histogram come in the same row.
+        """
+        stmt = lambda_stmt(
+            lambda: select(
+                Movie.id,
+                Movie.title,
+                Movie.release_year,
+                Movie.rating_histogram,
+                select(func.array_agg(Genre.name))
+                .join(movie_genres, movie_genres.c.genre_id == Genre.id)
+                .where(movie_genres.c.movie_id == Movie.id)
+                .scalar_subquery()
+                .label("genres"),
+            ).where(Movie.director_id == director_id)
+        )
+        if after is not None:
+            after_year, after_id = after
+            stmt += lambda s: s.where(tuple_(Movie.release_year, Movie.id) < tuple_(after_year, after_id))
+        stmt += lambda s: s.order_by(Movie.release_year.desc(), Movie.id.desc()).limit(limit)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+
+    @staticmethod
+    def get_movies_by_ids(db: Session, movie_ids: List[int]) -> List[Movie]:
+        if not movie_ids:
+            return []
+        stmt = lambda_stmt(
+            lambda: select(Movie)
+            .options(joinedload(Movie.director), selectinload(Movie.genres))
+            .where(Movie.id.in_(movie_ids))
+        )
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def get_autocomplete_rows(db: Session) -> List[Tuple[int, str, int, int]]:
+        ratings_count, _ = histogram_totals(Movie.rating_histogram)
+        return db.execute(select(Movie.id, Movie.title, Movie.release_year, ratings_count)).all()
+
+    @staticmethod
+    def get_all_movies(db: Session) -> List[Movie]:
+        return (
+            db.query(Movie)
+            .options(joinedload(Movie.director), selectinload(Movie.genres))
+            .order_by(Movie.id)
+            .all()
+        )
+
 
     def __init__(self, db: Session):
         self.db = db
@@ -114,34 +400,84 @@ class MovieRepository:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genres: Optional[List[str]] = None,
+        cast: Optional[List[str]] = None,
+        fields: Optional[Collection[str]] = None,
     ) -> Tuple[List[Movie], int]:
 
-        query = self.db.query(Movie)
+        total_items = self._count_movies(title, release_year, genres, cast)
 
+        offset, limit = (page - 1) * page_size, page_size
+        stmt = self._filter_movies(lambda_stmt(lambda: select(Movie)), title, release_year, genres, cast)
+        stmt += lambda s: s.order_by(Movie.id).offset(offset).limit(limit)
+        # loader options are not SQL values: the statement is cached per field set instead
+        options = list_load_options(fields)
+        fields_key = None if fields is None else tuple(sorted(fields))
+        stmt = stmt.add_criteria(
+            lambda s: s.options(*options), track_on=[fields_key], track_closure_variables=False
+        )
+        movies = self.db.execute(stmt).scalars().all()
+
+        return movies, total_items
+
+    @staticmethod
+    def _filter_movies(
+        stmt,
+        title: Optional[str],
+        release_year: Optional[int],
+        genres: Optional[List[str]],
+        cast: Optional[List[str]] = None,
+    ):
+        # one cached statement per combination of filters
         if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
+            pattern = f"%{title}%"
+            stmt += lambda s: s.where(Movie.title.ilike(pattern))
 
         if release_year:
-            query = query.filter(Movie.release_year == release_year)
+            stmt += lambda s: s.where(Movie.release_year == release_year)
 
         if genres:
-            query = (
-                query.join(Movie.genres)
-                .filter(Genre.name.in_(genres))
-                .group_by(Movie.id)
-                .having(func.count(Genre.id) == len(genres))
+            # movies having every requested genre, as a semi-join
+            genre_count = len(genres)
+            stmt += lambda s: s.where(
+                Movie.id.in_(
+                    select(movie_genres.c.movie_id)
+                    .join(Genre, Genre.id == movie_genres.c.genre_id)
+                    .where(Genre.name.in_(genres))
+                    .group_by(movie_genres.c.movie_id)
+                    .having(func.count(Genre.id) == genre_count)
+                )
             )
 
-        total_items = query.count()
+        if cast:
+            names = sorted({name.strip() for name in cast})
+            stmt += lambda s: s.where(Movie.id.in_(_credited_movie_ids(names)))
 
-        movies = (
-            query
-            .offset((page - 1) * page_size)
-            .limit(page_size)
-            .all()
-        )
+        return stmt
 
-        return movies, total_items
+    def _count_movies(
+        self,
+        title: Optional[str],
+        release_year: Optional[int],
+        genres: Optional[List[str]],
+        cast: Optional[List[str]] = None,
+    ) -> int:
+        if genres and not (title or release_year or cast):
+            # genres only: every link references an existing movie (foreign key), so the
+            # matches are counted in movie_genres alone instead of joined back to movies
+            genre_count = len(genres)
+            stmt = lambda_stmt(lambda: select(func.count()).select_from(
+                select(movie_genres.c.movie_id)
+                .join(Genre, Genre.id == movie_genres.c.genre_id)
+                .where(Genre.name.in_(genres))
+                .group_by(movie_genres.c.movie_id)
+                .having(func.count(Genre.id) == genre_count)
+                .subquery()
+            ))
+        else:
+            stmt = self._filter_movies(
+                lambda_stmt(lambda: select(func.count(Movie.id))), title, release_year, genres, cast
+            )
+        return self.db.execute(stmt).scalar()
 
     def get_movies_with_ratings(
         self,
@@ -150,54 +486,27 @@ class MovieRepository:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genres: Optional[List[str]] = None,
+        fields: Optional[Collection[str]] = None,
     ) -> Tuple[List[dict], int]:
-
-        query = (
-            self.db.query(
-                Movie,
-                func.coalesce(func.avg(Rating.score), 0).label("average_rating"),
-                func.count(Rating.id).label("ratings_count"),
-            )
-            .outerjoin(Rating)
-            .options(joinedload(Movie.director), joinedload(Movie.genres))
-            .group_by(Movie.id)
+        """
+        Same filters and paging as get_movies, with each movie's average and
+        count read from its maintained rating_histogram: neither the page nor
+        the count touches movie_ratings.
+        """
+        total_items = self._count_movies(title, release_year, genres)
+
+        offset, limit = (page - 1) * page_size, page_size
+        stmt = self._filter_movies(
+            lambda_stmt(lambda: select(Movie, *_histogram_rating_columns())), title, release_year, genres
         )
+        stmt += lambda s: s.order_by(Movie.id).offset(offset).limit(limit)
+        options = list_load_options(fields)
+        fields_key = None if fields is None else tuple(sorted(fields))
+        stmt = stmt.add_criteria(
+            lambda s: s.options(*options), track_on=[fields_key], track_closure_variables=False
+        )
+        movies = self.db.execute(stmt).all()
 
-        if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
-
-        if release_year:
-            query = query.filter(Movie.release_year == release_year)
-
-        if genres:
-            query = (
-                query.join(Movie.genres)
-                .filter(Genre.name.in_(genres))
-                .group_by(Movie.id)
-                .having(func.count(Genre.id) == len(genres))
-            )
-
-        total_items = query.count()
-
-        movies = query.offset((page - 1) * page_size).limit(page_size).all()
-
-        items = []
-        for row in movies:
-            movie = row[0]
-            avg = row[1]
-            count = row[2]
-            items.append({
-                "id": movie.id,
-                "title": movie.title,
-                "release_year": movie.release_year,
-                "director": {
-                    "id": movie.director.id,
-                    "name": movie.director.name,
-                } if movie.director else None,
-                "genres": [g.name for g in movie.genres],
-                "cast": getattr(movie, "cast", "Unknown"),
-                "average_rating": round(avg, 2) if count > 0 else None,
-                "ratings_count": count,
-            })
+        items = [movie_list_item(movie, avg, count, fields) for movie, avg, count in movies]
 
         return items, total_items
@@ -0,0 +1,74 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import List, Tuple, Dict, Optional
+
+from app.models.movie import Movie
+from app.models.genre import movie_genres
+from app.models.movie_similar import MovieSimilar
+
+
+class MovieSimilarRepository:
+
+    @staticmethod
+    def get_feature_rows(db: Session) -> Tuple[List[tuple], List[tuple]]:
+        # everything the similarity job reads, in two passes over movies / movie_genres
+        movies = db.execute(
+            select(Movie.id, Movie.director_id, Movie.cast, Movie.rating_histogram).order_by(Movie.id)
+        ).all()
+        links = db.execute(select(movie_genres.c.movie_id, movie_genres.c.genre_id)).all()
+        return [tuple(row) for row in movies], [tuple(row) for row in links]
+
+    @staticmethod
+    def get_stored_lists(db: Session) -> Dict[int, Tuple[int, List[int], List[float]]]:
+        rows = db.execute(
+            select(MovieSimilar.movie_id, MovieSimilar.signature, MovieSimilar.similar_ids, MovieSimilar.scores)
+        )
+        return {movie_id: (signature, ids, scores) for movie_id, signature, ids, scores in rows}
+
+    @staticmethod
+    def save_lists(db: Session, rows: List[dict]) -> None:
+        # the caller commits
+        if not rows:
+            return
+        stmt = pg_insert(MovieSimilar)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[MovieSimilar.movie_id],
+                set_={
+                    "similar_ids": stmt.excluded.similar_ids,
+                    "scores": stmt.excluded.scores,
+                    "signature": stmt.excluded.signature,
+                    "built_at": func.now(),
+                },
+            ),
+            rows,
+        )
+
+    @staticmethod
+    def try_lock(db: Session, key: int) -> bool:
+        # held until the transaction ends, so only one worker rebuilds at a time
+        return db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key}).scalar()
+
+    @staticmethod
+    def get_similar(db: Session, movie_id: int, limit: int) -> Optional[List[dict]]:
+        """
+        The stored neighbour list joined to the neighbours' rows in one
+        statement. None when no list has been built for the movie.
+        """
+        rows = db.execute(
+            text(
+                "SELECT ms.movie_id AS source_id, m.id, m.title, m.release_year, m.rating_histogram, s.score "
+                "FROM movie_similar ms "
+                "LEFT JOIN LATERAL unnest(ms.similar_ids, ms.scores) WITH ORDINALITY AS s(movie_id, score, rank) "
+                "ON s.rank <= :limit "
+                "LEFT JOIN movies m ON m.id = s.movie_id "
+                "WHERE ms.movie_id = :movie_id "
+                "ORDER BY s.rank"
+            ),
+            {"movie_id": movie_id, "limit": limit},
+        ).mappings().all()
+        if not rows:
+            return None
+        # neighbours deleted since the build drop out of the join
+        return [dict(row) for row in rows if row["id"] is not None]
@@ -0,0 +1,105 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func, tuple_, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Optional, List, Dict, Tuple
+
+from app.models.movie import Movie
+from app.models.person import Person, movie_cast
+
+
+class PersonRepository:
+
+    @staticmethod
+    def set_movie_cast(db: Session, casts: Dict[int, List[str]]) -> None:
+        """
+        Replaces the movie_cast rows of each movie with the given names (in
+        billing order, as parsed by parse_cast), creating missing people.
+        Names are matched on Postgres lower(name), the people key, never on
+        Python's lower(): the two disagree for some scripts. The caller commits.
+        """
+        if not casts:
+            return
+        names = sorted({name for cast in casts.values() for name in cast})
+        person_ids = {}
+        if names:
+            db.execute(
+                pg_insert(Person)
+                .values([{"name": name} for name in names])
+                .on_conflict_do_nothing(index_elements=[func.lower(Person.name)])
+            )
+            # each name as sent, with the person its lower() resolves to
+            sent = func.unnest(names).table_valued("name").render_derived(name="sent")
+            person_ids = dict(
+                db.execute(
+                    select(sent.c.name, Person.id).join(Person, func.lower(Person.name) == func.lower(sent.c.name))
+                ).all()
+            )
+
+        rows, linked = [], set()
+        for movie_id, cast in casts.items():
+            for position, name in enumerate(cast, start=1):
+                # names only Postgres folds together credit the person once, at the first position
+                if (movie_id, person_ids[name]) not in linked:
+                    linked.add((movie_id, person_ids[name]))
+                    rows.append({"movie_id": movie_id, "person_id": person_ids[name], "position": position})
+        stmt = delete(movie_cast).where(movie_cast.c.movie_id.in_(list(casts)))
+        if rows:
+            stmt = stmt.where(
+                tuple_(movie_cast.c.movie_id, movie_cast.c.person_id).not_in(
+                    [(row["movie_id"], row["person_id"]) for row in rows]
+                )
+            )
+        db.execute(stmt)
+        if rows:
+            insert = pg_insert(movie_cast).values(rows)
+            db.execute(
+                insert.on_conflict_do_update(
+                    index_elements=[movie_cast.c.movie_id, movie_cast.c.person_id],
+                    set_={"position": insert.excluded.position},
+                )
+            )
+
+    @staticmethod
+    def get_person_by_id(db: Session, person_id: int) -> Optional[Person]:
+        stmt = lambda_stmt(lambda: select(Person).where(Person.id == person_id))
+        return db.execute(stmt).scalars().first()
+
+    @staticmethod
+    def get_people_by_name(db: Session, name: str) -> List[Person]:
+        # served by the unique lower(name) index; lowered by Postgres like the index
+        key = name.strip()
+        stmt = lambda_stmt(lambda: select(Person).where(func.lower(Person.name) == func.lower(key)))
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def get_filmography(
+        db: Session,
+        person_id: int,
+        limit: int,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> List[dict]:
+        """
+        One page of a person's movies, newest first, keyset-paginated on
+        (release_year, id), found through the movie_cast person_id index.
+        """
+        stmt = lambda_stmt(
+            lambda: select(
+                Movie.id,
+                Movie.title,
+                Movie.release_year,
+                Movie.rating_histogram,
+                movie_cast.c.position,
+            )
+            .join(movie_cast, movie_cast.c.movie_id == Movie.id)
+            .where(movie_cast.c.person_id == person_id)
+        )
+        if after is not None:
+            after_year, after_id = after
+            stmt += lambda s: s.where(tuple_(Movie.release_year, Movie.id) < tuple_(after_year, after_id))
+        stmt += lambda s: s.order_by(Movie.release_year.desc(), Movie.id.desc()).limit(limit)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+
+    @staticmethod
+    def count_movies(db: Session, person_id: int) -> int:
+        stmt = lambda_stmt(lambda: select(func.count()).select_from(movie_cast).where(movie_cast.c.person_id == person_id))
+        return db.execute(stmt).scalar()
@@ -0,0 +1,62 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text, select, lambda_stmt
+from typing import List, Optional
+
+from app.models.movie import Movie
+from app.models.rating import Rating
+
+
+class RatingHistogramRepository:
+
+    # the caller commits: these run in the same transaction as the rating write
+
+    @staticmethod
+    def add_score(db: Session, movie_id: int, score: int) -> None:
+        db.execute(
+            text("UPDATE movies SET rating_histogram[:score] = rating_histogram[:score] + 1 WHERE id = :movie_id"),
+            {"movie_id": movie_id, "score": score},
+        )
+
+    @staticmethod
+    def remove_score(db: Session, movie_id: int, score: int) -> None:
+        db.execute(
+            text("UPDATE movies SET rating_histogram[:score] = rating_histogram[:score] - 1 WHERE id = :movie_id"),
+            {"movie_id": movie_id, "score": score},
+        )
+
+    @staticmethod
+    def get_histogram(db: Session, movie_id: int) -> Optional[List[int]]:
+        stmt = lambda_stmt(lambda: select(Movie.rating_histogram).where(Movie.id == movie_id))
+        return db.execute(stmt).scalar()
+
+    @staticmethod
+    def rebuild_all(db: Session) -> int:
+        # one pass over movie_ratings, bucketed with NumPy, written back in one UPDATE
+        import numpy as np
+
+        movie_ids = np.array(
+            db.query(Movie.id).order_by(Movie.id).all(), dtype=np.int64
+        ).reshape(-1)
+        rows = np.array(db.query(Rating.movie_id, Rating.score).all(), dtype=np.int64).reshape(-1, 2)
+
+        histograms = np.zeros((len(movie_ids), 10), dtype=np.int64)
+        if len(rows) and len(movie_ids):
+            positions = np.searchsorted(movie_ids, rows[:, 0])
+            flat = positions * 10 + (rows[:, 1] - 1)
+            histograms = np.bincount(flat, minlength=len(movie_ids) * 10).reshape(-1, 10)
+
+        params = {"ids": movie_ids.tolist()}
+        params.update({f"c{i + 1}": histograms[:, i].tolist() for i in range(10)})
+        columns = ", ".join(f"CAST(:c{i} AS integer[])" for i in range(1, 11))
+        buckets = ", ".join(f"v.c{i}" for i in range(1, 11))
+        names = ", ".join(f"c{i}" for i in range(1, 11))
+        result = db.execute(
+            text(
+                f"UPDATE movies SET rating_histogram = ARRAY[{buckets}] "
+                f"FROM unnest(CAST(:ids AS integer[]), {columns}) AS v(id, {names}) "
+                "WHERE movies.id = v.id"
+            ),
+            params,
+        )
+        db.commit()
+        return result.rowcount
@@ -1,7 +1,12 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, select, lambda_stmt
+from typing import List, Optional, Dict, Tuple
+from datetime import datetime
 from app.models.rating import Rating
 from app.models.movie import Movie
+from app.repositories.rating_rollup_repository import RatingRollupRepository
+from app.repositories.rating_histogram_repository import RatingHistogramRepository
+from app.core.cache_events import cache_events
 
 
 class RatingRepository:
@@ -10,13 +15,18 @@ class RatingRepository:
     def create_rating(db: Session, movie_id: int, score: int) -> Rating:
         rating = Rating(movie_id=movie_id, score=score)
         db.add(rating)
+        RatingRollupRepository.add_rating(db, movie_id, score)
+        RatingHistogramRepository.add_score(db, movie_id, score)
+        db.flush()
+        cache_events.publish(db, "rating", "create", movie_id, score=score, ts=rating.created_at.isoformat())
         db.commit()
         db.refresh(rating)
         return rating
     
     @staticmethod
     def get_ratings_by_movie(db: Session, movie_id: int) -> List[Rating]:
-        return db.query(Rating).filter(Rating.movie_id == movie_id).all()
+        stmt = lambda_stmt(lambda: select(Rating).where(Rating.movie_id == movie_id))
+        return db.execute(stmt).scalars().all()
     
     @staticmethod
     def get_rating_by_id(db: Session, rating_id: int) -> Optional[Rating]:
@@ -28,6 +38,9 @@ class RatingRepository:
         if not rating:
             return False
         
+        RatingRollupRepository.remove_rating(db, rating.movie_id, rating.score, rating.created_at)
+        RatingHistogramRepository.remove_score(db, rating.movie_id, rating.score)
+        cache_events.publish(db, "rating", "delete", rating.movie_id, score=rating.score)
         db.delete(rating)
         db.commit()
         return True
@@ -41,3 +54,27 @@ class RatingRepository:
     @staticmethod
     def get_ratings_count(db: Session, movie_id: int) -> int:
         return db.query(Rating).filter(Rating.movie_id == movie_id).count()
+
+    @staticmethod
+    def get_rating_aggregates(db: Session, movie_ids: List[int]) -> Dict[int, Tuple[float, int]]:
+        if not movie_ids:
+            return {}
+        stmt = lambda_stmt(
+            lambda: select(
+                Rating.movie_id,
+                func.coalesce(func.avg(Rating.score), 0),
+                func.count(Rating.id),
+            )
+            .where(Rating.movie_id.in_(movie_ids))
+            .group_by(Rating.movie_id)
+        )
+        rows = db.execute(stmt).all()
+        return {movie_id: (float(avg), count) for movie_id, avg, count in rows}
+
+    @staticmethod
+    def get_ratings_since(db: Session, since: datetime) -> List[Tuple[int, datetime]]:
+        return (
+            db.query(Rating.movie_id, Rating.created_at)
+            .filter(Rating.created_at >= since)
+            .all()
+        )
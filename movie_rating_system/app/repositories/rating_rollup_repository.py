@@ -0,0 +1,87 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import List, Optional
+from datetime import date, datetime
+
+from app.models.rating_rollup import RatingDailyRollup
+
+
+_HISTOGRAM_SQL = ", ".join(
+    f"count(*) FILTER (WHERE score = {score})::int" for score in range(1, 11)
+)
+
+
+class RatingRollupRepository:
+
+    # the caller commits: these run in the same transaction as the rating write
+
+    @staticmethod
+    def add_rating(db: Session, movie_id: int, score: int) -> None:
+        db.execute(
+            text(
+                "INSERT INTO movie_rating_daily (movie_id, day, ratings_count, score_sum, histogram) "
+                "VALUES (:movie_id, (now() AT TIME ZONE 'UTC')::date, 1, :score, :histogram) "
+                "ON CONFLICT (movie_id, day) DO UPDATE SET "
+                "ratings_count = movie_rating_daily.ratings_count + 1, "
+                "score_sum = movie_rating_daily.score_sum + EXCLUDED.score_sum, "
+                "histogram[:score] = movie_rating_daily.histogram[:score] + 1"
+            ),
+            {
+                "movie_id": movie_id,
+                "score": score,
+                "histogram": [1 if bucket == score else 0 for bucket in range(1, 11)],
+            },
+        )
+
+    @staticmethod
+    def remove_rating(db: Session, movie_id: int, score: int, created_at: Optional[datetime]) -> None:
+        if created_at is None:
+            return
+        db.execute(
+            text(
+                "UPDATE movie_rating_daily SET "
+                "ratings_count = ratings_count - 1, "
+                "score_sum = score_sum - :score, "
+                "histogram[:score] = histogram[:score] - 1 "
+                "WHERE movie_id = :movie_id AND day = (CAST(:created_at AS timestamptz) AT TIME ZONE 'UTC')::date"
+            ),
+            {"movie_id": movie_id, "score": score, "created_at": created_at},
+        )
+
+    @staticmethod
+    def backfill(db: Session, movie_id: Optional[int] = None) -> int:
+        where = "WHERE created_at IS NOT NULL"
+        params = {}
+        if movie_id is not None:
+            where += " AND movie_id = :movie_id"
+            params["movie_id"] = movie_id
+            db.execute(text("DELETE FROM movie_rating_daily WHERE movie_id = :movie_id"), params)
+        else:
+            db.execute(text("DELETE FROM movie_rating_daily"))
+
+        result = db.execute(
+            text(
+                "INSERT INTO movie_rating_daily (movie_id, day, ratings_count, score_sum, histogram) "
+                "SELECT movie_id, (created_at AT TIME ZONE 'UTC')::date, count(*)::int, sum(score)::int, "
+                f"ARRAY[{_HISTOGRAM_SQL}] "
+                f"FROM movie_ratings {where} "
+                "GROUP BY 1, 2"
+            ),
+            params,
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def get_rollups(
+        db: Session,
+        movie_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> List[RatingDailyRollup]:
+        query = db.query(RatingDailyRollup).filter(RatingDailyRollup.movie_id == movie_id)
+        if date_from:
+            query = query.filter(RatingDailyRollup.day >= date_from)
+        if date_to:
+            query = query.filter(RatingDailyRollup.day <= date_to)
+        return query.order_by(RatingDailyRollup.day).all()
@@ -46,6 +46,17 @@ class ResponseModel(BaseModel):
     error: Optional[dict] = None
 
 
+class BatchMovieResponse(BaseModel):
+    items: List[MovieBase]
+    missing_ids: List[int]
+
+
+class ResponseBatchModel(BaseModel):
+    status: str
+    data: Optional[BatchMovieResponse] = None
+    error: Optional[dict] = None
+
+
 class MovieCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     director_id: int
@@ -61,6 +72,21 @@ class MovieUpdate(BaseModel):
     genres: Optional[List[str]] = None
 
 
+class MovieBulkItem(BaseModel):
+    # without id the movie is created; with id it is updated (director cannot change)
+    id: Optional[int] = None
+    title: str = Field(..., min_length=1, max_length=255)
+    director_id: int
+    release_year: int = Field(..., ge=1888, le=datetime.now().year)
+    cast: Optional[str] = None
+    # omitted on an update: the movie keeps its genres
+    genres: Optional[List[str]] = None
+
+
+class MovieBulkRequest(BaseModel):
+    items: List[MovieBulkItem]
+
+
 
 class DirectorSimple(BaseModel):
     id: int
@@ -0,0 +1,20 @@
+import sys
+
+from app.db.session import get_db_session
+from app.repositories.rating_rollup_repository import RatingRollupRepository
+
+
+def backfill_rollups(movie_id=None):
+    """Rebuilds movie_rating_daily from movie_ratings (all movies, or one movie)."""
+    db = get_db_session()
+    try:
+        rows = RatingRollupRepository.backfill(db, movie_id)
+        scope = f"movie {movie_id}" if movie_id is not None else "all movies"
+        print(f"Rollups rebuilt for {scope}: {rows} daily rows")
+        return rows
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m app.scripts.backfill_rollups [movie_id]
+    backfill_rollups(int(sys.argv[1]) if len(sys.argv) > 1 else None)
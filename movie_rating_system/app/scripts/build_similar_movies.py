@@ -0,0 +1,29 @@
+import argparse
+
+from app.db.session import get_db_session
+from app.models import director, director_stats, genre, movie, movie_similar, rating
+
+
+def build_similar_movies(full: bool = False):
+    """Builds movie_similar: changed movies only, or every movie with --full."""
+    from app.services.similarity_job import rebuild_similar_movies
+
+    db = get_db_session()
+    try:
+        result = rebuild_similar_movies(db, full=full)
+        if result["skipped"]:
+            print("Another rebuild is running, nothing done")
+        else:
+            print(
+                f"Similar movies: {result['rebuilt']} lists rebuilt "
+                f"({result['changed']} of {result['movies']} movies changed) in {result['elapsed_ms']}ms"
+            )
+        return result
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m app.scripts.build_similar_movies [--full]
+    parser = argparse.ArgumentParser(description="build the similar movies lists")
+    parser.add_argument("--full", action="store_true", help="rebuild every list")
+    build_similar_movies(full=parser.parse_args().full)
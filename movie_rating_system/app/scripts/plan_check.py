@@ -0,0 +1,570 @@
+import argparse
+import difflib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.db.partitions import ensure_rating_partitions
+from app.db.scratch import scratch_database, scratch_database_url
+from app.models import catalog_change, director, director_stats, genre, movie, person, rating, rating_rollup
+from app.repositories.director_repository import DirectorRepository
+from app.repositories.director_stats_repository import DirectorStatsRepository
+from app.repositories.genre_repository import GenreRepository
+from app.repositories.movie_repository import MovieRepository
+from app.repositories.rating_histogram_repository import RatingHistogramRepository
+from app.repositories.rating_repository import RatingRepository
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "plan_baseline.json")
+
+# database the check creates (dropping any leftover of an earlier run), migrates to
+# head, seeds and drops again; defaults to "<DATABASE_URL database>_plan_check" on
+# the same server
+PLAN_CHECK_DATABASE_URL = os.getenv("PLAN_CHECK_DATABASE_URL", "")
+
+# representative dataset, seeded into that database
+SEED_DIRECTORS = 2000
+SEED_MOVIES = 20000
+SEED_PEOPLE = 5000
+SEED_GENRES = 12
+POPULAR_GENRES = 3
+SEED_RATINGS_PER_MOVIE = 12
+SEED_MONTHS = 3
+
+# a sequential scan of these is a failure unless the case lists the table in "full_scan"
+GUARDED_TABLES = ("movies", "movie_ratings")
+# relations estimated below this many rows (empty future partitions) are cheapest read sequentially
+SMALL_RELATION_ROWS = 1000
+# a case fails above this multiple of its baseline cost; generous, as estimates vary between servers
+COST_FACTOR = float(os.getenv("PLAN_CHECK_COST_FACTOR", "3"))
+
+# partitions differ per month: plans name them all movie_ratings_<partition>
+_PARTITION_RE = re.compile(r"movie_ratings_(?:p\d{6}|default)")
+
+
+def analyze(scratch: Engine) -> None:
+    # all-visible pages and statistics sampling every seeded row: the same plans on every run
+    with scratch.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SET default_statistics_target = 1000"))
+        conn.execute(text("VACUUM ANALYZE"))
+
+
+def seed(db: Session) -> dict:
+    """Seeds the dataset through plain SQL and returns the ids the cases use."""
+    ensure_rating_partitions(db.connection(), months_ahead=1, months_back=SEED_MONTHS)
+
+    db.execute(
+        text("INSERT INTO genres (name) SELECT 'Plan Genre ' || g FROM generate_series(1, :n) g ON CONFLICT DO NOTHING"),
+        {"n": SEED_GENRES},
+    )
+    genre_ids = db.execute(text("SELECT id FROM genres ORDER BY id")).scalars().all()
+    genre_names = db.execute(text("SELECT name FROM genres ORDER BY id")).scalars().all()
+
+    director_ids = db.execute(
+        text(
+            "INSERT INTO directors (name, birth_year) "
+            "SELECT 'Plan Director ' || g, 1930 + g % 60 FROM generate_series(1, :n) g RETURNING id"
+        ),
+        {"n": SEED_DIRECTORS},
+    ).scalars().all()
+
+    db.execute(
+        text("INSERT INTO people (name) SELECT 'Plan Person ' || g FROM generate_series(1, :n) g ON CONFLICT DO NOTHING"),
+        {"n": SEED_PEOPLE},
+    )
+    movie_ids = db.execute(
+        text(
+            "INSERT INTO movies (title, director_id, release_year, \"cast\") "
+            "SELECT 'Plan Movie ' || g || ' ' || md5(g::text), "
+            "(CAST(:directors AS integer[]))[1 + g % cardinality(CAST(:directors AS integer[]))], "
+            "1950 + g % 75, "
+            "'Plan Person ' || (1 + g % :people) || ', Plan Person ' || (1 + (g * 7) % :people) "
+            "FROM generate_series(1, :n) g RETURNING id"
+        ),
+        {"directors": director_ids, "people": SEED_PEOPLE, "n": SEED_MOVIES},
+    ).scalars().all()
+    params = {"movies": movie_ids, "genres": genre_ids}
+
+    db.execute(
+        text(
+            "INSERT INTO movie_cast (movie_id, person_id, position) "
+            "SELECT m.id, p.id, c.position FROM movies m "
+            "CROSS JOIN LATERAL unnest(string_to_array(m.\"cast\", ', ')) WITH ORDINALITY AS c(name, position) "
+            "JOIN people p ON lower(p.name) = lower(c.name) "
+            "WHERE m.id = ANY(CAST(:movies AS integer[])) ON CONFLICT DO NOTHING"
+        ),
+        params,
+    )
+    # two genres per movie: one of the POPULAR_GENRES first ones, then any genre
+    db.execute(
+        text(
+            "INSERT INTO movie_genres (movie_id, genre_id) "
+            "SELECT m.id, (CAST(:genres AS integer[]))[1 + m.id % :popular] FROM unnest(CAST(:movies AS integer[])) AS m(id) "
+            "UNION ALL "
+            "SELECT m.id, (CAST(:genres AS integer[]))[1 + (m.id / :popular) % cardinality(CAST(:genres AS integer[]))] "
+            "FROM unnest(CAST(:movies AS integer[])) AS m(id) "
+            "ON CONFLICT DO NOTHING"
+        ),
+        {**params, "popular": POPULAR_GENRES},
+    )
+    db.execute(
+        text(
+            "INSERT INTO movie_ratings (movie_id, score, created_at) "
+            "SELECT m.id, 1 + (g * 7 + m.id) % 10, "
+            "now() - ((g * 37 + m.id) % (:months * 28)) * interval '1 day' - g * interval '1 minute' "
+            "FROM unnest(CAST(:movies AS integer[])) AS m(id), generate_series(1, :per_movie) g"
+        ),
+        {"movies": movie_ids, "months": SEED_MONTHS, "per_movie": SEED_RATINGS_PER_MOVIE},
+    )
+
+    # maintained aggregates
+    RatingHistogramRepository.rebuild_all(db)
+    DirectorStatsRepository.rebuild_all(db)
+
+    return {
+        "movie_ids": movie_ids,
+        "director_ids": director_ids,
+        "genre_ids": genre_ids,
+        "genre_names": genre_names,
+        "rating_id": db.execute(
+            text("SELECT max(id) FROM movie_ratings WHERE movie_id = :movie_id"), {"movie_id": movie_ids[100]}
+        ).scalar(),
+    }
+
+
+def _movie_row(ids: dict, n: int) -> dict:
+    return {"title": f"Plan Insert {n}", "director_id": ids["director_ids"][n], "release_year": 2001, "cast": None}
+
+
+# name -> (call(db, ids), expectations). Expectations:
+#   indexes:   index names the plan must use ("a|b": either one)
+#   full_scan: guarded tables this case may read sequentially, and why
+# Every case also has a cost ceiling: COST_FACTOR x the summed estimated total cost
+# of its statements recorded in the baseline.
+# Reads come first; writes run last, against movies the reads no longer need.
+CASES = {
+    # MovieRepository
+    "MovieRepository.get_movie_by_id": (
+        lambda db, ids: MovieRepository.get_movie_by_id(db, ids["movie_ids"][100]),
+        {"indexes": ["movies_pkey|ix_movies_id", "ix_movie_ratings_movie_id_created_at"]},
+    ),
+    "MovieRepository.movie_exists": (
+        lambda db, ids: MovieRepository.movie_exists(db, ids["movie_ids"][100]),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.get_movies_by_ids": (
+        lambda db, ids: MovieRepository.get_movies_by_ids(db, ids["movie_ids"][100:150]),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.get_movie_directors": (
+        lambda db, ids: MovieRepository.get_movie_directors(db, ids["movie_ids"][100:150]),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.get_movies_by_director": (
+        lambda db, ids: MovieRepository.get_movies_by_director(db, ids["director_ids"][10]),
+        {"indexes": ["ix_movies_director_id_release_year_id"]},
+    ),
+    "MovieRepository.get_director_filmography": (
+        lambda db, ids: MovieRepository.get_director_filmography(db, ids["director_ids"][10], 10),
+        {"indexes": ["ix_movies_director_id_release_year_id"]},
+    ),
+    "MovieRepository.get_director_filmography (after cursor)": (
+        lambda db, ids: MovieRepository.get_director_filmography(db, ids["director_ids"][10], 10, (2000, 0)),
+        {"indexes": ["ix_movies_director_id_release_year_id"]},
+    ),
+    "MovieRepository.get_movies_with_pagination": (
+        lambda db, ids: MovieRepository.get_movies_with_pagination(db, 1, 10, genre_name=ids["genre_names"][0]),
+        {"indexes": ["ix_movie_genres_genre_id_movie_id"]},
+    ),
+    "MovieRepository.get_movies (first page)": (
+        lambda db, ids: MovieRepository(db).get_movies(1, 10),
+        {"indexes": ["movies_pkey|ix_movies_id"], "full_scan": {"movies": "count(*) of the whole catalogue"}},
+    ),
+    "MovieRepository.get_movies (release_year)": (
+        lambda db, ids: MovieRepository(db).get_movies(1, 10, release_year=1999),
+        {"indexes": ["ix_movies_release_year"]},
+    ),
+    "MovieRepository.get_movies (popular genres)": (
+        lambda db, ids: MovieRepository(db).get_movies(1, 10, genres=ids["genre_names"][:2]),
+        {"indexes": ["movies_pkey|ix_movies_id"], "full_scan": {"movies": "count(*) of a broad match"}},
+    ),
+    "MovieRepository.get_movies (rare genre)": (
+        lambda db, ids: MovieRepository(db).get_movies(1, 10, genres=ids["genre_names"][-1:]),
+        {"indexes": ["ix_movie_genres_genre_id_movie_id", "movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.get_movies (cast)": (
+        lambda db, ids: MovieRepository(db).get_movies(1, 10, cast=["Plan Person 42"]),
+        {"indexes": ["ix_people_lower_name", "ix_movie_cast_person_id", "movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.get_movies (title)": (
+        lambda db, ids: MovieRepository(db).get_movies(1, 10, title="Movie 42"),
+        {"indexes": [], "full_scan": {"movies": "substring match, served by the search index when enabled"}},
+    ),
+    "MovieRepository.get_movies_with_ratings (first page)": (
+        lambda db, ids: MovieRepository(db).get_movies_with_ratings(1, 10),
+        {"indexes": [], "full_scan": {"movies": "count(*) of the whole catalogue"}},
+    ),
+    "MovieRepository.get_movies_with_ratings (rare genre)": (
+        lambda db, ids: MovieRepository(db).get_movies_with_ratings(1, 10, genres=ids["genre_names"][-1:]),
+        {"indexes": ["ix_movie_genres_genre_id_movie_id"]},
+    ),
+    "MovieRepository.get_autocomplete_rows": (
+        lambda db, ids: MovieRepository.get_autocomplete_rows(db),
+        {"indexes": [], "full_scan": {"movies": "startup build of the whole catalogue"}},
+    ),
+    "MovieRepository.get_all_movies": (
+        lambda db, ids: MovieRepository.get_all_movies(db),
+        {"indexes": [], "full_scan": {"movies": "startup build of the whole catalogue"}},
+    ),
+    # RatingRepository
+    "RatingRepository.get_ratings_by_movie": (
+        lambda db, ids: RatingRepository.get_ratings_by_movie(db, ids["movie_ids"][100]),
+        {"indexes": ["ix_movie_ratings_movie_id_created_at"]},
+    ),
+    "RatingRepository.get_rating_by_id": (
+        lambda db, ids: RatingRepository.get_rating_by_id(db, ids["rating_id"]),
+        {"indexes": ["ix_movie_ratings_id"]},
+    ),
+    "RatingRepository.get_average_rating": (
+        lambda db, ids: RatingRepository.get_average_rating(db, ids["movie_ids"][100]),
+        {"indexes": ["ix_movie_ratings_movie_id_created_at"]},
+    ),
+    "RatingRepository.get_ratings_count": (
+        lambda db, ids: RatingRepository.get_ratings_count(db, ids["movie_ids"][100]),
+        {"indexes": ["ix_movie_ratings_movie_id_created_at"]},
+    ),
+    "RatingRepository.get_rating_aggregates": (
+        lambda db, ids: RatingRepository.get_rating_aggregates(db, ids["movie_ids"][100:110]),
+        {"indexes": ["ix_movie_ratings_movie_id_created_at"]},
+    ),
+    "RatingRepository.get_ratings_since": (
+        lambda db, ids: RatingRepository.get_ratings_since(db, datetime.now(timezone.utc) - timedelta(days=7)),
+        {"indexes": [], "full_scan": {"movie_ratings": "reads the whole (pruned) window"}},
+    ),
+    # GenreRepository
+    "GenreRepository.get_genres_by_ids": (
+        lambda db, ids: GenreRepository.get_genres_by_ids(db, ids["genre_ids"][:3]),
+        {"indexes": []},
+    ),
+    "GenreRepository.get_genre_by_id": (
+        lambda db, ids: GenreRepository.get_genre_by_id(db, ids["genre_ids"][0]),
+        {"indexes": []},
+    ),
+    "GenreRepository.get_genres_by_names": (
+        lambda db, ids: GenreRepository.get_genres_by_names(db, ids["genre_names"][:3]),
+        {"indexes": []},
+    ),
+    "GenreRepository.get_all_genres": (
+        lambda db, ids: GenreRepository.get_all_genres(db),
+        {"indexes": []},
+    ),
+    # DirectorRepository
+    "DirectorRepository.get_director_by_id": (
+        lambda db, ids: DirectorRepository.get_director_by_id(db, ids["director_ids"][10]),
+        {"indexes": ["directors_pkey|ix_directors_id"]},
+    ),
+    "DirectorRepository.director_exists": (
+        lambda db, ids: DirectorRepository.director_exists(db, ids["director_ids"][10]),
+        {"indexes": ["directors_pkey|ix_directors_id"]},
+    ),
+    "DirectorRepository.get_director_names": (
+        lambda db, ids: DirectorRepository.get_director_names(db, ids["director_ids"][:20]),
+        {"indexes": []},
+    ),
+    "DirectorRepository.get_director_with_stats": (
+        lambda db, ids: DirectorRepository.get_director_with_stats(db, ids["director_ids"][10]),
+        {"indexes": ["directors_pkey|ix_directors_id", "director_stats_pkey"]},
+    ),
+    "DirectorRepository.get_directors_with_stats": (
+        lambda db, ids: DirectorRepository.get_directors_with_stats(db, 5, 20),
+        {"indexes": ["directors_pkey|ix_directors_id"]},
+    ),
+    "DirectorRepository.get_all_directors": (
+        lambda db, ids: DirectorRepository.get_all_directors(db),
+        {"indexes": []},
+    ),
+    # Writes
+    "DirectorRepository.create_director": (
+        lambda db, ids: DirectorRepository.create_director(db, "Plan Check Director"),
+        {"indexes": ["directors_pkey|ix_directors_id"]},
+    ),
+    "GenreRepository.create_genre": (
+        lambda db, ids: GenreRepository.create_genre(db, "Plan Check Genre"),
+        {"indexes": []},
+    ),
+    "MovieRepository.create_movie": (
+        lambda db, ids: MovieRepository.create_movie(db, _movie_row(ids, 1), []),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.update_movie": (
+        lambda db, ids: MovieRepository.update_movie(db, ids["movie_ids"][200], {"title": "Plan Renamed"}),
+        {"indexes": ["movies_pkey|ix_movies_id", "movie_genres_pkey"]},
+    ),
+    "MovieRepository.update_movie (genres)": (
+        lambda db, ids: MovieRepository.update_movie(db, ids["movie_ids"][201], {}, ids["genre_ids"][:2]),
+        {"indexes": ["movies_pkey|ix_movies_id", "movie_genres_pkey"]},
+    ),
+    "MovieRepository.bulk_insert_movies": (
+        lambda db, ids: MovieRepository.bulk_insert_movies(db, [_movie_row(ids, n) for n in range(2, 12)]),
+        {"indexes": []},
+    ),
+    "MovieRepository.bulk_update_movies": (
+        lambda db, ids: MovieRepository.bulk_update_movies(
+            db, [{"id": movie_id, "title": "Plan Bulk", "release_year": 2002} for movie_id in ids["movie_ids"][300:310]]
+        ),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.set_movie_genres": (
+        lambda db, ids: MovieRepository.set_movie_genres(
+            db, {movie_id: ids["genre_ids"][:2] for movie_id in ids["movie_ids"][300:310]}
+        ),
+        {"indexes": ["movie_genres_pkey"]},
+    ),
+    "RatingRepository.create_rating": (
+        lambda db, ids: RatingRepository.create_rating(db, ids["movie_ids"][400], 7),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "RatingRepository.delete_rating": (
+        lambda db, ids: RatingRepository.delete_rating(db, ids["rating_id"]),
+        {"indexes": ["ix_movie_ratings_id", "movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.delete_movie": (
+        lambda db, ids: MovieRepository.delete_movie(db, ids["movie_ids"][500]),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+    "MovieRepository.delete_movies": (
+        lambda db, ids: MovieRepository.delete_movies(db, ids["movie_ids"][501:511]),
+        {"indexes": ["movies_pkey|ix_movies_id"]},
+    ),
+}
+
+
+class PlanRecorder:
+    """
+    before_cursor_execute listener: every statement the case runs is also
+    EXPLAINed (same SQL, same parameters) on a second cursor of its connection.
+    """
+
+    _SKIPPED = re.compile(r"^\s*(SAVEPOINT|RELEASE|ROLLBACK|ANALYZE|SELECT pg_catalog)", re.IGNORECASE)
+
+    def __init__(self):
+        self.plans = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or self._SKIPPED.match(statement):
+            return
+        with cursor.connection.cursor() as explain:
+            explain.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = explain.fetchone()[0]
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        self.plans.append(plan[0]["Plan"])
+
+
+def _relation(node: dict) -> str:
+    return _PARTITION_RE.sub("movie_ratings_<partition>", node.get("Relation Name", ""))
+
+
+def _index(node: dict) -> str:
+    # partition indexes are named after the partition, e.g. movie_ratings_p202610_movie_id_created_at_idx
+    name = node.get("Index Name", "")
+    return _PARTITION_RE.sub("movie_ratings_<partition>", name)
+
+
+def render_plan(node: dict, depth: int = 0) -> list:
+    """Plan shape without costs or row estimates, one line per node."""
+    label = node["Node Type"]
+    for key in ("Join Type", "Strategy", "Operation"):
+        if key in node:
+            label += f" ({node[key]})"
+    if _relation(node):
+        label += f" on {_relation(node)}"
+    if _index(node):
+        label += f" using {_index(node)}"
+    if "CTE Name" in node:
+        label += f" [{node['CTE Name']}]"
+    if "Subplan Name" in node:
+        label += f" [{node['Subplan Name']}]"
+
+    children = [render_plan(child, depth + 1) for child in node.get("Plans", [])]
+    if node["Node Type"] in ("Append", "Merge Append"):
+        # one child per partition would differ every month: each distinct partition plan is listed once
+        children = sorted({tuple(child): child for child in children}.values())
+    return ["  " * depth + label] + [line for child in children for line in child]
+
+
+def render_case(plans: list) -> list:
+    # each distinct statement plan once (selectin batches repeat), separated by a blank line;
+    # sorted, as relationship loads run in no fixed order
+    statements = sorted({tuple(render_plan(plan)) for plan in plans})
+    return [line for lines in statements for line in lines + ("",)][:-1]
+
+
+def walk(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def _index_names(node: dict) -> set:
+    # a partition's index stands for the partitioned index it was created from
+    names = set()
+    for child in walk(node):
+        name = child.get("Index Name")
+        if name:
+            names.add(name)
+            match = re.match(r"movie_ratings_(?:p\d{6}|default)_(.+)_idx$", name)
+            if match:
+                names.add(f"ix_movie_ratings_{match.group(1)}")
+    return names
+
+
+def check_case(plans: list, expected: dict, small_relations: set) -> list:
+    """Problems with a case's plans (missing indexes, sequential scans), empty when there are none."""
+    problems = []
+    used = set().union(*(_index_names(plan) for plan in plans)) if plans else set()
+    for wanted in expected["indexes"]:
+        if not used & set(wanted.split("|")):
+            problems.append(f"expected index {wanted} is not used (used: {', '.join(sorted(used)) or 'none'})")
+
+    allowed = expected.get("full_scan", {})
+    for plan in plans:
+        for node in walk(plan):
+            if node["Node Type"] != "Seq Scan":
+                continue
+            table = _PARTITION_RE.sub("movie_ratings", node.get("Relation Name", ""))
+            if table in GUARDED_TABLES and table not in allowed and node["Relation Name"] not in small_relations:
+                problems.append(f"sequential scan on {node['Relation Name']}")
+    return problems
+
+
+def run_cases(scratch: Engine) -> dict:
+    """
+    Seeds the scratch database, then EXPLAINs every case. Per case: its
+    rendered plan, estimated cost and problems. Writes are rolled back.
+    """
+    with Session(scratch) as db:
+        ids = seed(db)
+        db.commit()
+    analyze(scratch)
+
+    results = {}
+    with scratch.connect() as conn:
+        transaction = conn.begin()
+        # no parallel plans: they depend on server settings
+        conn.execute(text("SET LOCAL max_parallel_workers_per_gather = 0"))
+        small_relations = set(conn.execute(
+            text("SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples < :rows"), {"rows": SMALL_RELATION_ROWS}
+        ).scalars())
+        # repository commits become savepoint releases: nothing outlives the outer transaction
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            for name, (call, expected) in CASES.items():
+                recorder = PlanRecorder()
+                event.listen(scratch, "before_cursor_execute", recorder)
+                try:
+                    call(db, ids)
+                finally:
+                    event.remove(scratch, "before_cursor_execute", recorder)
+                db.expire_all()
+                results[name] = {
+                    "plan": render_case(recorder.plans),
+                    "cost": sum(plan["Total Cost"] for plan in recorder.plans),
+                    "problems": check_case(recorder.plans, expected, small_relations),
+                }
+        finally:
+            db.close()
+            transaction.rollback()
+    return results
+
+
+def load_baseline() -> dict:
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+def cost_ceiling(name: str, baseline: dict):
+    return baseline[name]["cost"] * COST_FACTOR if name in baseline else None
+
+
+def check_costs(results: dict, baseline: dict) -> None:
+    """Adds a problem to every case without a baseline cost or estimated above its ceiling."""
+    for name, result in results.items():
+        ceiling = cost_ceiling(name, baseline)
+        if ceiling is None:
+            result["problems"].append("no baseline cost (run with --update)")
+        elif result["cost"] > ceiling:
+            result["problems"].append(
+                f"estimated cost {result['cost']:.0f} over the ceiling of {ceiling:.0f} "
+                f"({COST_FACTOR:g}x the baseline {baseline[name]['cost']:.0f})"
+            )
+
+
+def check_plans(costs: bool = True) -> dict:
+    """run_cases() on a scratch database created and dropped around it, then the cost ceilings."""
+    with scratch_database(scratch_database_url(PLAN_CHECK_DATABASE_URL, "plan_check")) as scratch:
+        results = run_cases(scratch)
+    if costs:
+        check_costs(results, load_baseline())
+    return results
+
+
+def advisories(name: str, result: dict, baseline: dict) -> list:
+    """Differences from the baseline plan: reported, never a failure (the check is on indexes and cost)."""
+    if name not in baseline or baseline[name]["plan"] == result["plan"]:
+        return []
+    return ["plan differs from the baseline:", *difflib.unified_diff(
+        baseline[name]["plan"], result["plan"], "baseline", "current", lineterm=""
+    )]
+
+
+def main():
+    """
+    Creates a scratch database, migrates it to head, seeds a representative
+    dataset and EXPLAINs every query of the movie, rating, genre and director
+    repositories. Fails when a query does not use its expected indexes,
+    scans a guarded table sequentially without an allowance or is estimated
+    above COST_FACTOR x its baseline cost; differences from the recorded
+    baseline plan are only reported. --update records plans and costs.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--update", action="store_true", help="rewrite the plan baseline with the current plans")
+    args = parser.parse_args()
+
+    # recording: only the index and sequential scan checks apply
+    results = check_plans(costs=not args.update)
+    baseline = {} if args.update else load_baseline()
+
+    failed = False
+    for name, result in results.items():
+        failed |= bool(result["problems"])
+        status = "FAIL" if result["problems"] else "ok  "
+        ceiling = cost_ceiling(name, baseline)
+        print(f"{status} {name:<56} cost={result['cost']:.0f} (max {'-' if ceiling is None else f'{ceiling:.0f}'})")
+        for problem in result["problems"]:
+            print(f"       - {problem}")
+        for note in advisories(name, result, baseline):
+            print(f"         {note}")
+
+    if args.update:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(
+                {name: {"cost": round(result["cost"], 2), "plan": result["plan"]} for name, result in results.items()},
+                f,
+                indent=2,
+            )
+            f.write("\n")
+        print(f"Plan baseline written to {BASELINE_PATH}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    # python -m app.scripts.plan_check [--update]
+    main()
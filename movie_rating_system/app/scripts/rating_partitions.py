@@ -0,0 +1,50 @@
+import argparse
+from datetime import datetime, timezone
+
+from app.db.database import engine
+from app.core.shared_cache import shared_cache
+from app.db.partitions import (
+    add_months, month_start, ensure_rating_partitions,
+    detach_rating_partitions, list_rating_partitions,
+)
+
+
+def main():
+    """Maintenance for the monthly movie_ratings partitions (run from cron)."""
+    parser = argparse.ArgumentParser(description="movie_ratings partition maintenance")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ensure = sub.add_parser("ensure", help="create the current and upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=3)
+
+    detach = sub.add_parser("detach", help="detach partitions older than N months")
+    detach.add_argument("--older-than-months", type=int, required=True)
+    detach.add_argument("--archive-schema", default="archive")
+    detach.add_argument("--drop", action="store_true", help="drop instead of archiving")
+
+    sub.add_parser("list", help="list attached partitions")
+
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        if args.command == "ensure":
+            created = ensure_rating_partitions(conn, months_ahead=args.months_ahead)
+            print(f"Created partitions: {created or 'none'}")
+        elif args.command == "detach":
+            current = month_start(datetime.now(timezone.utc).date())
+            cutoff = add_months(current, -args.older_than_months)
+            detached = detach_rating_partitions(
+                conn, cutoff, archive_schema=args.archive_schema, drop=args.drop
+            )
+            print(f"Detached partitions: {detached or 'none'}")
+        else:
+            for name in list_rating_partitions(conn):
+                print(name)
+
+    if args.command == "detach" and detached:
+        # cached list pages still count the detached ratings
+        shared_cache.bump()
+
+if __name__ == "__main__":
+    # python -m app.scripts.rating_partitions ensure --months-ahead 3
+    main()
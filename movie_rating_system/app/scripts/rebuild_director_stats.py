@@ -0,0 +1,18 @@
+from app.db.session import get_db_session
+from app.models import director, director_stats, genre, movie, rating
+from app.repositories.director_stats_repository import DirectorStatsRepository
+
+
+def rebuild_director_stats():
+    """Recomputes director_stats for every director from movies.rating_histogram."""
+    db = get_db_session()
+    try:
+        rebuilt = DirectorStatsRepository.rebuild_all(db)
+        print(f"Director stats rebuilt for {rebuilt} directors")
+        return rebuilt
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m app.scripts.rebuild_director_stats
+    rebuild_director_stats()
@@ -0,0 +1,18 @@
+from app.db.session import get_db_session
+from app.models import director, genre, movie, rating
+from app.repositories.rating_histogram_repository import RatingHistogramRepository
+
+
+def rebuild_histograms():
+    """Recomputes movies.rating_histogram for every movie from movie_ratings."""
+    db = get_db_session()
+    try:
+        updated = RatingHistogramRepository.rebuild_all(db)
+        print(f"Rating histograms rebuilt for {updated} movies")
+        return updated
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m app.scripts.rebuild_histograms
+    rebuild_histograms()
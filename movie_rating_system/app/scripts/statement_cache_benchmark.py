@@ -0,0 +1,101 @@
+import argparse
+import time
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.db.database import engine
+from app.db.session import get_db_session
+from app.models import director, genre, movie, rating
+from app.models.movie import Movie
+from app.models.rating import Rating
+from app.core.statement_cache import statement_cache_stats
+from app.repositories.movie_repository import MovieRepository
+from app.repositories.rating_repository import RatingRepository
+
+
+# the db.query forms the repositories used before switching to lambda statements
+
+def legacy_movie_exists(db, movie_id):
+    return db.query(Movie).filter(Movie.id == movie_id).first() is not None
+
+
+def legacy_get_movies_by_ids(db, movie_ids):
+    return (
+        db.query(Movie)
+        .options(joinedload(Movie.director), selectinload(Movie.genres))
+        .filter(Movie.id.in_(movie_ids))
+        .all()
+    )
+
+
+def legacy_get_rating_aggregates(db, movie_ids):
+    return (
+        db.query(Rating.movie_id, func.coalesce(func.avg(Rating.score), 0), func.count(Rating.id))
+        .filter(Rating.movie_id.in_(movie_ids))
+        .group_by(Rating.movie_id)
+        .all()
+    )
+
+
+def legacy_search(db, release_year):
+    query = db.query(Movie).filter(Movie.release_year == release_year)
+    total = query.count()
+    return query.order_by(Movie.id).limit(10).all(), total
+
+
+def bench(label, fn, iterations):
+    fn(0)  # first call builds and compiles
+    cpu, wall = time.process_time(), time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(f"  {label:<8} cpu={cpu / iterations * 1e6:8.1f}us/call  wall={wall / iterations * 1e6:8.1f}us/call")
+    return cpu / iterations
+
+
+def main():
+    """Per-call CPU of the hot repository reads: legacy db.query vs lambda statements."""
+    parser = argparse.ArgumentParser(description="statement cache microbenchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    statement_cache_stats.install(engine)
+    db = get_db_session()
+    try:
+        ids = [m.id for m in db.query(Movie.id).order_by(Movie.id).limit(20)]
+        if not ids:
+            raise SystemExit("No movies in the database; seed it first")
+        repo = MovieRepository(db)
+
+        cases = [
+            ("movie_exists",
+             lambda i: legacy_movie_exists(db, ids[i % len(ids)]),
+             lambda i: MovieRepository.movie_exists(db, ids[i % len(ids)])),
+            ("get_movies_by_ids",
+             lambda i: legacy_get_movies_by_ids(db, ids[: 1 + i % 5]),
+             lambda i: MovieRepository.get_movies_by_ids(db, ids[: 1 + i % 5])),
+            ("get_rating_aggregates",
+             lambda i: legacy_get_rating_aggregates(db, ids[: 1 + i % 5]),
+             lambda i: RatingRepository.get_rating_aggregates(db, ids[: 1 + i % 5])),
+            ("search by year",
+             lambda i: legacy_search(db, 1990 + i % 30),
+             lambda i: repo.get_movies(page=1, page_size=10, release_year=1990 + i % 30)),
+        ]
+
+        for name, legacy, cached in cases:
+            print(name)
+            before = bench("legacy", legacy, args.iterations)
+            db.expunge_all()
+            statement_cache_stats.reset()
+            after = bench("lambda", cached, args.iterations)
+            db.expunge_all()
+            stats = statement_cache_stats.stats()
+            print(f"  saved {(1 - after / before) * 100:.0f}% cpu/call, cache hit rate {stats['hit_rate']:.2%}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # python -m app.scripts.statement_cache_benchmark --iterations 2000
+    main()
@@ -0,0 +1,26 @@
+import argparse
+
+from app.db.session import get_db_session
+from app.models import catalog_change, director, director_stats, genre, movie, movie_similar, person, rating
+from app.services.catalog_snapshot_job import CATALOG_SNAPSHOT_PATH, write_catalog_snapshot
+
+
+def write_snapshot(path: str = CATALOG_SNAPSHOT_PATH):
+    """Writes the catalogue snapshot workers build their in-memory indexes from."""
+    db = get_db_session()
+    try:
+        result = write_catalog_snapshot(db, path)
+        print(
+            f"Catalogue snapshot: {result['movies']} movies, {result['bytes']} bytes written to {path} "
+            f"(xmin {result['xmin']}, "
+            f"{result['pruned_changes']} old changes pruned) in {result['elapsed_ms']}ms"
+        )
+        return result
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    # python -m app.scripts.write_catalog_snapshot [--path app/data/catalog.snapshot]
+    parser = argparse.ArgumentParser(description="write the catalogue snapshot")
+    parser.add_argument("--path", default=CATALOG_SNAPSHOT_PATH, help="snapshot file")
+    write_snapshot(parser.parse_args().path)
@@ -0,0 +1,70 @@
+import logging
+from datetime import datetime
+from typing import Dict, Any
+
+from app.core.autocomplete import title_autocomplete
+from app.core.cache_events import cache_events
+from app.core.histograms import rating_histograms
+from app.core.movie_cache import movie_detail_cache
+from app.core.search_index import movie_search_index
+from app.core.trending import trending_counters
+from app.db.session import get_db_session
+from app.repositories.movie_repository import MovieRepository
+
+logger = logging.getLogger(__name__)
+
+
+# Applies cache events published by other workers to this worker's caches
+
+def apply_movie_event(event: Dict[str, Any]) -> None:
+    movie_id = event["id"]
+    movie_detail_cache.invalidate(movie_id)
+
+    if event["a"] == "delete":
+        movie_search_index.remove_movie(movie_id)
+        title_autocomplete.remove(movie_id)
+        trending_counters.remove(movie_id)
+        rating_histograms.invalidate(movie_id)
+        return
+
+    if movie_search_index.ready or title_autocomplete.ready:
+        db = get_db_session()
+        try:
+            movies = MovieRepository.get_movies_by_ids(db, [movie_id])
+            if movies:
+                movie_search_index.upsert_movie(movies[0])
+                title_autocomplete.upsert(movie_id, movies[0].title, movies[0].release_year)
+            else:
+                movie_search_index.remove_movie(movie_id)
+                title_autocomplete.remove(movie_id)
+        finally:
+            db.close()
+
+
+def apply_rating_event(event: Dict[str, Any]) -> None:
+    movie_id = event["id"]
+    # reloaded on next read, so a concurrent read-through cannot double count
+    rating_histograms.invalidate(movie_id)
+    if event["a"] == "create" and event.get("ts"):
+        trending_counters.record(movie_id, datetime.fromisoformat(event["ts"]))
+    title_autocomplete.record_rating(movie_id, 1 if event["a"] == "create" else -1)
+
+
+def flush_local_caches() -> None:
+    rating_histograms.clear()
+    movie_detail_cache.clear()
+    db = get_db_session()
+    try:
+        trending_counters.rebuild(db)
+        if movie_search_index.ready:
+            movie_search_index.rebuild(db)
+        if title_autocomplete.ready:
+            title_autocomplete.rebuild(db)
+    finally:
+        db.close()
+
+
+def register_cache_handlers() -> None:
+    cache_events.subscribe("movie", apply_movie_event)
+    cache_events.subscribe("rating", apply_rating_event)
+    cache_events.on_flush(flush_local_caches)
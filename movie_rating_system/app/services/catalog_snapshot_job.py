@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.autocomplete import title_autocomplete
+from app.core.search_index import movie_search_index
+from app.db.session import get_db_session
+from app.repositories.catalog_repository import CatalogRepository
+from app.repositories.movie_repository import MovieRepository
+
+logger = logging.getLogger(__name__)
+
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "app/data/catalog.snapshot")
+# catalog_changes rows older than this are pruned (by the snapshot job and every
+# CATALOG_CHANGES_PRUNE_SECONDS in the app); an older snapshot can no longer be
+# caught up and is ignored
+CATALOG_CHANGES_RETENTION_HOURS = float(os.getenv("CATALOG_CHANGES_RETENTION_HOURS", "168"))
+CATALOG_CHANGES_PRUNE_SECONDS = float(os.getenv("CATALOG_CHANGES_PRUNE_SECONDS", "3600"))
+
+
+def write_catalog_snapshot(db: Session, path: str = CATALOG_SNAPSHOT_PATH) -> Dict[str, Any]:
+    """
+    Writes movies, genres, directors and rating histograms to `path`, with
+    the xmin of the snapshot they were read in, then prunes change log
+    entries past the retention window.
+    """
+    from app.core.catalog_snapshot import build_columns, write_snapshot
+
+    started = time.perf_counter()
+    # one REPEATABLE READ transaction: every row is read from the snapshot whose xmin is recorded
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    xmin = CatalogRepository.get_snapshot_xmin(db)
+    rows = CatalogRepository.get_snapshot_rows(db)
+    db.commit()
+
+    columns, movies = build_columns(rows)
+    size = write_snapshot(path, columns, {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "xmin": xmin,
+        "movies": movies,
+    })
+
+    pruned = prune_catalog_changes(db)
+
+    result = {
+        "movies": movies,
+        "bytes": size,
+        "xmin": xmin,
+        "pruned_changes": pruned,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"Catalogue snapshot written to {path} - {result}")
+    return result
+
+
+def load_catalog_indexes(
+    db: Session,
+    search_index: bool,
+    autocomplete: bool,
+    path: str = CATALOG_SNAPSHOT_PATH,
+) -> bool:
+    """
+    Builds the search index and / or title autocomplete from the snapshot at
+    `path`, then re-reads from the database only the movies written or rated
+    after it. False (nothing built) when there is no usable snapshot.
+
+    The snapshot saves reading and decoding the catalogue from the database,
+    not memory: the structures built here are per-worker Python objects.
+    """
+    # numpy is only loaded at startup, not when importing the app
+    from app.core.catalog_snapshot import open_snapshot
+
+    started = time.perf_counter()
+    snapshot = open_snapshot(path)
+    if snapshot is None:
+        return False
+
+    with snapshot:
+        meta = snapshot.meta
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(meta["created_at"])
+        if age > timedelta(hours=CATALOG_CHANGES_RETENTION_HOURS):
+            logger.warning(f"Catalogue snapshot {path} ignored: {age} old, past the change log retention")
+            return False
+        if "xmin" not in meta:
+            logger.warning(f"Catalogue snapshot {path} ignored: written by an older version, no xmin")
+            return False
+
+        docs = snapshot.movie_docs()
+        if search_index:
+            movie_search_index.load(docs)
+        if autocomplete:
+            counts = snapshot.ratings_counts().tolist()
+            title_autocomplete.load(
+                (doc["id"], doc["title"], doc["release_year"], count) for doc, count in zip(docs, counts)
+            )
+
+    changed, deleted, rated = catch_up_catalog_indexes(db, meta["xmin"], search_index, autocomplete)
+
+    logger.info(
+        f"Catalogue indexes loaded from snapshot in {(time.perf_counter() - started) * 1000:.0f}ms - "
+        f"movies={meta['movies']}, changed={changed}, deleted={deleted}, rated={rated}"
+    )
+    return True
+
+
+def rebuild_catalog_indexes(db: Session, search_index: bool, autocomplete: bool) -> None:
+    """
+    Builds the search index and / or title autocomplete from the database,
+    then catches up the writes made while they were read: the worker already
+    serves requests while it builds them.
+    """
+    xmin = CatalogRepository.get_snapshot_xmin(db)
+    db.commit()
+    if search_index:
+        movie_search_index.rebuild(db)
+    if autocomplete:
+        title_autocomplete.rebuild(db)
+    changed, deleted, rated = catch_up_catalog_indexes(db, xmin, search_index, autocomplete)
+    logger.info(f"Catalogue indexes caught up after the rebuild - changed={changed}, deleted={deleted}, rated={rated}")
+
+
+def catch_up_catalog_indexes(db: Session, xmin: int, search_index: bool, autocomplete: bool) -> Tuple[int, int, int]:
+    """
+    Movies written by transactions from `xmin` on are re-read whole, movies
+    only rated since then just get their ratings count refreshed. Returns
+    how many were changed, deleted and rated.
+    """
+    changed_ids = CatalogRepository.get_changed_movie_ids(db, xmin)
+    movies = MovieRepository.get_movies_by_ids(db, changed_ids)
+    for movie in movies:
+        if search_index:
+            movie_search_index.upsert_movie(movie)
+        if autocomplete:
+            title_autocomplete.upsert(movie.id, movie.title, movie.release_year, sum(movie.rating_histogram))
+    deleted = set(changed_ids) - {movie.id for movie in movies}
+    for movie_id in deleted:
+        movie_search_index.remove_movie(movie_id)
+        title_autocomplete.remove(movie_id)
+
+    rated = {}
+    if autocomplete:
+        rated = CatalogRepository.get_rated_movie_counts(db, xmin)
+        for movie_id, count in rated.items():
+            title_autocomplete.set_ratings_count(movie_id, count)
+    db.commit()
+    return len(movies), len(deleted), len(rated)
+
+
+def prune_catalog_changes(db: Session) -> int:
+    """Deletes change log entries past the retention window; returns how many."""
+    pruned = CatalogRepository.prune_changes(
+        db, datetime.now(timezone.utc) - timedelta(hours=CATALOG_CHANGES_RETENTION_HOURS)
+    )
+    db.commit()
+    return pruned
+
+
+class CatalogChangesPruner:
+    """Background thread pruning the change log every `interval` seconds, with or without the snapshot job."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="catalog-changes-pruner", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = get_db_session()
+            try:
+                pruned = prune_catalog_changes(db)
+                if pruned:
+                    logger.info(f"Catalogue change log pruned - rows={pruned}")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Catalogue change log pruning failed: {str(e)}", exc_info=True)
+            finally:
+                db.close()
+
+
+catalog_changes_pruner = CatalogChangesPruner(CATALOG_CHANGES_PRUNE_SECONDS)
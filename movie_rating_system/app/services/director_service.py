@@ -0,0 +1,98 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+from app.repositories.director_repository import DirectorRepository
+from app.repositories.movie_repository import MovieRepository
+from app.core.histograms import summarize
+from app.core.single_flight import coalesced
+
+logger = logging.getLogger(__name__)
+api_logger = logging.getLogger("api")
+
+
+def _career(row: Dict[str, Any]) -> Dict[str, Any]:
+    ratings_count = row["ratings_count"]
+    return {
+        "movies_count": row["movies_count"],
+        "ratings_count": ratings_count,
+        "average_rating": round(row["score_sum"] / ratings_count, 2) if ratings_count else None,
+    }
+
+
+class DirectorService:
+
+    @staticmethod
+    @coalesced("directors.list")
+    def list_directors(db: Session, page: int = 1, page_size: int = 10) -> Dict[str, Any]:
+        logger.info(f"Listing directors - page={page}, page_size={page_size}")
+
+        rows, total_items = DirectorRepository.get_directors_with_stats(db, page, page_size)
+        items = [
+            {
+                "id": row["id"],
+                "name": row["name"],
+                "birth_year": row["birth_year"],
+                **_career(row),
+            }
+            for row in rows
+        ]
+
+        logger.info(f"Retrieved {len(items)} directors from database")
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total_items": total_items,
+            "items": items,
+        }
+
+    @staticmethod
+    @coalesced("directors.detail")
+    def get_director(
+        db: Session,
+        director_id: int,
+        movies_limit: int = 20,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, Any]:
+        logger.info(f"Getting director - director_id={director_id}, movies_limit={movies_limit}, after={after}")
+
+        row = DirectorRepository.get_director_with_stats(db, director_id)
+        if row is None:
+            logger.warning(f"Director not found: director_id={director_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Director not found"
+            )
+
+        # one extra row tells whether another page follows
+        movies = MovieRepository.get_director_filmography(db, director_id, movies_limit + 1, after)
+        has_more = len(movies) > movies_limit
+        movies = movies[:movies_limit]
+
+        items = []
+        for movie in movies:
+            summary = summarize(movie["rating_histogram"])
+            items.append({
+                "id": movie["id"],
+                "title": movie["title"],
+                "release_year": movie["release_year"],
+                "genres": movie["genres"] or [],
+                "average_rating": summary["average_rating"],
+                "ratings_count": summary["ratings_count"],
+            })
+
+        next_cursor = f"{movies[-1]['release_year']}:{movies[-1]['id']}" if has_more else None
+        logger.info(f"Director found - director_id={director_id}, filmography page={len(items)}")
+
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "birth_year": row["birth_year"],
+            "description": row["description"],
+            **_career(row),
+            "filmography": {
+                "items": items,
+                "next_cursor": next_cursor,
+            },
+        }
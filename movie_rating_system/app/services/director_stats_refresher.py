@@ -0,0 +1,49 @@
+import logging
+import os
+import threading
+
+from app.db.session import get_db_session
+from app.repositories.director_stats_repository import DirectorStatsRepository
+
+logger = logging.getLogger(__name__)
+
+# seconds between folds of the ratings into director_stats; director career totals lag by up to this
+DIRECTOR_STATS_REFRESH_SECONDS = float(os.getenv("DIRECTOR_STATS_REFRESH_SECONDS", "60"))
+
+
+class DirectorStatsRefresher:
+    """Background thread refreshing director rating totals every `interval` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="director-stats-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = get_db_session()
+            try:
+                refreshed = DirectorStatsRepository.refresh_ratings(db)
+                if refreshed:
+                    logger.info(f"Director stats refreshed - directors={refreshed}")
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Director stats refresh failed: {str(e)}", exc_info=True)
+            finally:
+                db.close()
+
+
+director_stats_refresher = DirectorStatsRefresher(DIRECTOR_STATS_REFRESH_SECONDS)
@@ -1,14 +1,24 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from fastapi import HTTPException
 import logging
 
-from app.repositories.movie_repository import MovieRepository
+from app.repositories.movie_repository import MovieRepository, MOVIE_LIST_FIELDS, RATING_FIELDS, movie_list_item
 from app.repositories.director_repository import DirectorRepository
 from app.repositories.genre_repository import GenreRepository
-from app.models.rating import Rating
-from app.schemas.movie_schema import MovieCreate, MovieUpdate
+from app.repositories.rating_repository import RatingRepository
+from app.repositories.movie_similar_repository import MovieSimilarRepository
+from app.repositories.person_repository import PersonRepository
+from app.core.search_index import movie_search_index
+from app.core.autocomplete import title_autocomplete
+from app.core.trending import trending_counters
+from app.core.cache_events import cache_events
+from app.core.histograms import rating_histograms, summarize
+from app.core.movie_cache import movie_detail_cache
+from app.core.single_flight import coalesced
+from app.core.shared_cache import shared_cache, shared_cached
+from app.core.cast import parse_cast
+from app.schemas.movie_schema import MovieCreate, MovieUpdate, MovieBulkItem
 
 logger = logging.getLogger(__name__)
 api_logger = logging.getLogger("api")
@@ -23,9 +33,15 @@ class MovieService:
         self.movie_repo = movie_repo
         self.director_repo = director_repo
         self.genre_repo = genre_repo
+
+    def using(self, db: Session) -> "MovieService":
+        # the same service on another session: shared cache fills run on the primary
+        return MovieService(MovieRepository(db), self.director_repo, self.genre_repo)
         
     # LIST MOVIES (pagination)
     
+    @shared_cached("movies.list")
+    @coalesced("movies.list")
     def list_movies(
         self,
         page: int = 1,
@@ -33,38 +49,25 @@ class MovieService:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genres: Optional[List[str]] = None,
+        cast: Optional[List[str]] = None,
+        fields: Optional[Tuple[str, ...]] = None,
     ) -> Dict[str, Any]:
         
-        logger.info(f"Service: Listing movies - page={page}, page_size={page_size}, filters: title={title}, year={release_year}")
+        logger.info(f"Service: Listing movies - page={page}, page_size={page_size}, filters: title={title}, year={release_year}, cast={cast}, fields={fields}")
         
+        if movie_search_index.can_serve(title, cast):
+            return self._list_movies_from_index(page, page_size, title, release_year, genres, cast, fields)
+
         movies, total_items = self.movie_repo.get_movies(
-            page=page, page_size=page_size, title=title, release_year=release_year, genres=genres
+            page=page, page_size=page_size, title=title, release_year=release_year, genres=genres, cast=cast,
+            fields=fields,
         )
 
-        items = []
-        for movie in movies:
-            avg, count = (
-                self.movie_repo.db.query(
-                    func.coalesce(func.avg(Rating.score), 0),
-                    func.count(Rating.id),
-                )
-                .filter(Rating.movie_id == movie.id)
-                .one()
-            )
-
-            items.append({
-                "id": movie.id,
-                "title": movie.title,
-                "release_year": movie.release_year,
-                "director": {
-                    "id": movie.director.id,
-                    "name": movie.director.name,
-                } if movie.director else None,
-                "genres": [g.name for g in movie.genres],
-                "cast": getattr(movie, "cast", "Unknown"),
-                "average_rating": round(avg, 2) if count > 0 else None,
-                "ratings_count": count,
-            })
+        # one aggregate query for the page, skipped when no rating field is wanted
+        aggregates = {}
+        if set(fields or MOVIE_LIST_FIELDS) & set(RATING_FIELDS):
+            aggregates = RatingRepository.get_rating_aggregates(self.movie_repo.db, [movie.id for movie in movies])
+        items = [movie_list_item(movie, *aggregates.get(movie.id, (0, 0)), fields) for movie in movies]
 
         logger.info(f"Service: Retrieved {len(items)} movies from database")
         
@@ -75,8 +78,46 @@ class MovieService:
             "items": items,
         }
 
+    def _list_movies_from_index(
+        self,
+        page: int,
+        page_size: int,
+        title: Optional[str],
+        release_year: Optional[int],
+        genres: Optional[List[str]],
+        cast: Optional[List[str]] = None,
+        fields: Optional[Tuple[str, ...]] = None,
+    ) -> Dict[str, Any]:
+
+        items, total_items = movie_search_index.search(
+            page=page, page_size=page_size, title=title, release_year=release_year, genres=genres, cast=cast
+        )
+
+        wanted = fields or MOVIE_LIST_FIELDS
+        if set(wanted) & set(RATING_FIELDS):
+            aggregates = RatingRepository.get_rating_aggregates(
+                self.movie_repo.db, [item["id"] for item in items]
+            )
+            for item in items:
+                avg, count = aggregates.get(item["id"], (0, 0))
+                item["average_rating"] = round(avg, 2) if count > 0 else None
+                item["ratings_count"] = count
+        if fields is not None:
+            items = [{name: item[name] for name in MOVIE_LIST_FIELDS if name in fields} for item in items]
+
+        logger.info(f"Service: Retrieved {len(items)} movies from search index")
+
+        return {
+            "page": page,
+            "page_size": page_size,
+            "total_items": total_items,
+            "items": items,
+        }
+
     # LIST MOVIES WITH RATINGS
 
+    @shared_cached("movies.list_ratings")
+    @coalesced("movies.list_ratings")
     def list_movies_ratings(
         self,
         page: int = 1,
@@ -84,9 +125,10 @@ class MovieService:
         title: Optional[str] = None,
         release_year: Optional[int] = None,
         genres: Optional[List[str]] = None,
+        fields: Optional[Tuple[str, ...]] = None,
     ) -> tuple[list[dict], int]:
         
-        logger.info(f"Service: Listing movies with ratings - page={page}, page_size={page_size}")
+        logger.info(f"Service: Listing movies with ratings - page={page}, page_size={page_size}, fields={fields}")
         
         return self.movie_repo.get_movies_with_ratings(
             page=page,
@@ -94,44 +136,143 @@ class MovieService:
             title=title,
             release_year=release_year,
             genres=genres,
+            fields=fields,
         )
 
     # GET MOVIE BY ID
 
+    @coalesced("movies.detail")
     def get_movie_by_id(self, movie_id: int) -> Dict[str, Any]:
         
         logger.info(f"Service: Getting movie by ID - movie_id={movie_id}")
         
-        movie = self.movie_repo.get_movie_by_id(self.movie_repo.db, movie_id)
-        if not movie:
+        db = self.movie_repo.db
+        detail = movie_detail_cache.get(movie_id)
+        if detail is None:
+            movies = self.movie_repo.get_movies_by_ids(db, [movie_id])
+            if not movies:
+                logger.warning(f"Service: Movie not found in database - movie_id={movie_id}")
+                raise HTTPException(status_code=404, detail="Movie not found")
+            detail = movie_detail_cache.put(movies[0])
+
+        # aggregates come from the score histogram (cached for a few seconds, see RatingHistogramCache)
+        histogram = rating_histograms.get(movie_id)
+        if histogram is None:
+            movie_detail_cache.invalidate(movie_id)
             logger.warning(f"Service: Movie not found in database - movie_id={movie_id}")
             raise HTTPException(status_code=404, detail="Movie not found")
+        summary = summarize(histogram)
 
-        avg, count = (
-            self.movie_repo.db.query(
-                func.coalesce(func.avg(Rating.score), 0),
-                func.count(Rating.id),
-            )
-            .filter(Rating.movie_id == movie_id)
-            .one()
-        )
-
-        logger.info(f"Service: Movie found - movie_id={movie_id}, title={movie.title}")
+        logger.info(f"Service: Movie found - movie_id={movie_id}, title={detail['title']}")
         
         return {
-            "id": movie.id,
-            "title": movie.title,
-            "release_year": movie.release_year,
-            "director": {
-                "id": movie.director.id,
-                "name": movie.director.name,
-            } if movie.director else None,
-            "genres": [g.name for g in movie.genres],
-            "cast": getattr(movie, "cast", "Unknown"),
-            "average_rating": round(avg, 2) if count > 0 else None,
-            "ratings_count": count,
+            **detail,
+            "average_rating": summary["average_rating"],
+            "ratings_count": summary["ratings_count"],
+        }
+
+
+    # GET MOVIES BY IDS (batch)
+
+    @coalesced("movies.batch")
+    def get_movies_by_ids(self, movie_ids: List[int]) -> Dict[str, Any]:
+
+        logger.info(f"Service: Getting movies by IDs - count={len(movie_ids)}")
+
+        db = self.movie_repo.db
+        movies = {movie.id: movie for movie in self.movie_repo.get_movies_by_ids(db, movie_ids)}
+        aggregates = RatingRepository.get_rating_aggregates(db, list(movies))
+
+        items = []
+        missing_ids = []
+        for movie_id in movie_ids:
+            movie = movies.get(movie_id)
+            if movie is None:
+                missing_ids.append(movie_id)
+                continue
+
+            avg, count = aggregates.get(movie_id, (0, 0))
+            items.append({
+                "id": movie.id,
+                "title": movie.title,
+                "release_year": movie.release_year,
+                "director": {
+                    "id": movie.director.id,
+                    "name": movie.director.name,
+                } if movie.director else None,
+                "genres": [g.name for g in movie.genres],
+                "cast": getattr(movie, "cast", "Unknown"),
+                "average_rating": round(avg, 2) if count > 0 else None,
+                "ratings_count": count,
+            })
+
+        logger.info(f"Service: Batch fetch done - found={len(items)}, missing={len(missing_ids)}")
+
+        return {"items": items, "missing_ids": missing_ids}
+
+
+    # TRENDING MOVIES
+
+    @coalesced("movies.trending")
+    def get_trending_movies(self, window: str = "24h", limit: int = 10) -> Dict[str, Any]:
+
+        logger.info(f"Service: Getting trending movies - window={window}, limit={limit}")
+
+        ranking = trending_counters.top(window, limit)
+        movies = {
+            movie.id: movie
+            for movie in self.movie_repo.get_movies_by_ids(self.movie_repo.db, [movie_id for movie_id, _ in ranking])
         }
 
+        items = []
+        for movie_id, ratings_in_window in ranking:
+            movie = movies.get(movie_id)
+            if movie is None:
+                continue
+            items.append({
+                "id": movie.id,
+                "title": movie.title,
+                "release_year": movie.release_year,
+                "ratings_in_window": ratings_in_window,
+            })
+
+        logger.info(f"Service: Trending movies computed - items={len(items)}")
+
+        return {"window": window, "items": items}
+
+
+    # SIMILAR MOVIES
+
+    @coalesced("movies.similar")
+    def get_similar_movies(self, movie_id: int, limit: int = 10) -> Dict[str, Any]:
+
+        logger.info(f"Service: Getting similar movies - movie_id={movie_id}, limit={limit}")
+
+        db = self.movie_repo.db
+        neighbours = MovieSimilarRepository.get_similar(db, movie_id, limit)
+        if neighbours is None:
+            # no list yet: unknown movie, or one added since the last rebuild
+            if not self.movie_repo.movie_exists(db, movie_id):
+                logger.warning(f"Service: Movie not found in database - movie_id={movie_id}")
+                raise HTTPException(status_code=404, detail="Movie not found")
+            neighbours = []
+
+        items = []
+        for neighbour in neighbours:
+            summary = summarize(neighbour["rating_histogram"])
+            items.append({
+                "id": neighbour["id"],
+                "title": neighbour["title"],
+                "release_year": neighbour["release_year"],
+                "score": round(neighbour["score"], 4),
+                "average_rating": summary["average_rating"],
+                "ratings_count": summary["ratings_count"],
+            })
+
+        logger.info(f"Service: Similar movies found - movie_id={movie_id}, items={len(items)}")
+
+        return {"movie_id": movie_id, "items": items}
+
 
     # CREATE MOVIE
 
@@ -155,8 +296,10 @@ class MovieService:
         movie = self.movie_repo.create_movie(db, movie_data, genre_objs)
         
         logger.info(f"Service: Movie created in database - movie_id={movie.id}")
+        movie_search_index.upsert_movie(movie)
+        title_autocomplete.upsert(movie.id, movie.title, movie.release_year)
 
-        return {
+        result = {
         "id": movie.id,
         "title": movie.title,
         "release_year": movie.release_year,
@@ -166,61 +309,163 @@ class MovieService:
         "average_rating": None,
         "ratings_count": 0
     }
+        shared_cache.bump()
+        return result
     
 
+    # BULK UPSERT
+
+    def bulk_upsert_movies(self, db: Session, items: List[MovieBulkItem]) -> Dict[str, Any]:
+
+        logger.info(f"Service: Bulk upsert - items={len(items)}")
+
+        # one lookup each for directors, genres and the movies being updated
+        directors = self.director_repo.get_director_names(db, list({item.director_id for item in items}))
+        genre_ids = {
+            g.name: g.id
+            for g in self.genre_repo.get_genres_by_names(db, list({name for item in items for name in item.genres or []}))
+        }
+        existing = self.movie_repo.get_movie_directors(db, [item.id for item in items if item.id is not None])
+
+        results: List[Dict[str, Any]] = [None] * len(items)
+        to_create, to_update = [], []
+        seen_ids = set()
+
+        for index, item in enumerate(items):
+            error = None
+            unknown_genres = [name for name in item.genres or [] if name not in genre_ids]
+            if item.director_id not in directors:
+                error = "Director not found"
+            elif unknown_genres:
+                error = f"Invalid genre names: {unknown_genres}"
+            elif item.id is not None:
+                if item.id not in existing:
+                    error = "Movie not found"
+                elif item.id in seen_ids:
+                    error = "Duplicate movie id in batch"
+                elif existing[item.id] != item.director_id:
+                    error = "Director cannot be changed on update"
+                seen_ids.add(item.id)
+
+            if error:
+                results[index] = {"index": index, "status": "error", "id": item.id, "error": error}
+            elif item.id is None:
+                to_create.append((index, item))
+            else:
+                to_update.append((index, item))
+
+        try:
+            created_ids = self.movie_repo.bulk_insert_movies(db, [
+                {"title": item.title, "director_id": item.director_id,
+                 "release_year": item.release_year, "cast": item.cast}
+                for _, item in to_create
+            ])
+            self.movie_repo.bulk_update_movies(db, [
+                {"id": item.id, "title": item.title, "release_year": item.release_year, "cast": item.cast}
+                for _, item in to_update
+            ])
+
+            links = {}
+            for (index, item), movie_id in zip(to_create, created_ids):
+                links[movie_id] = [genre_ids[name] for name in item.genres or []]
+                results[index] = {"index": index, "status": "created", "id": movie_id, "error": None}
+            for index, item in to_update:
+                # a missing genres list leaves an updated movie's genres as they were
+                if item.genres is not None:
+                    links[item.id] = [genre_ids[name] for name in item.genres]
+                results[index] = {"index": index, "status": "updated", "id": item.id, "error": None}
+            self.movie_repo.set_movie_genres(db, links)
+            # a missing cast leaves an updated movie's cast as it was
+            PersonRepository.set_movie_cast(db, {
+                **{movie_id: parse_cast(item.cast) for (_, item), movie_id in zip(to_create, created_ids)},
+                **{item.id: parse_cast(item.cast) for _, item in to_update if item.cast is not None},
+            })
+
+            written = list(created_ids) + [item.id for _, item in to_update]
+            cache_events.publish_many(db, "movie", "upsert", written)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        for movie_id in written:
+            movie_detail_cache.invalidate(movie_id)
+        for (_, item), movie_id in zip(to_create, created_ids):
+            title_autocomplete.upsert(movie_id, item.title, item.release_year)
+        for _, item in to_update:
+            title_autocomplete.upsert(item.id, item.title, item.release_year)
+        if movie_search_index.ready and written:
+            for movie in self.movie_repo.get_movies_by_ids(db, written):
+                movie_search_index.upsert_movie(movie)
+        shared_cache.bump()
+
+        summary = {
+            "created": len(created_ids),
+            "updated": len(to_update),
+            "failed": len(items) - len(written),
+        }
+        logger.info(f"Service: Bulk upsert done - {summary}")
+
+        return {**summary, "results": results}
+
+
     def update_movie(self, movie_id: int, data: MovieUpdate) -> Dict[str, Any]:
         
         logger.info(f"Service: Updating movie - movie_id={movie_id}")
         
         db = self.movie_repo.db
-        genre_objs = None
+        genre_ids = genre_names = None
         if data.genres is not None:
             genre_objs = self.genre_repo.get_genres_by_names(db, data.genres)
             if len(genre_objs) != len(data.genres):
                 logger.warning(f"Service: Invalid genre names when updating - requested={data.genres}")
                 raise HTTPException(status_code=404, detail="Some genre names are invalid")
+            # read before the commit in update_movie expires the objects
+            genre_ids = [g.id for g in genre_objs]
+            genre_names = [g.name for g in genre_objs]
 
-        movie = self.movie_repo.update_movie(
+        row = self.movie_repo.update_movie(
             db,
             movie_id,
             data.dict(exclude_unset=True, exclude={"genres"}),
-            genre_objs  
+            genre_ids,
         )
 
-        if not movie:
+        if not row:
             logger.warning(f"Service: Movie not found for update - movie_id={movie_id}")
             raise HTTPException(status_code=404, detail="Movie not found")
 
-        avg, count = (
-            db.query(
-                func.coalesce(func.avg(Rating.score), 0),
-                func.count(Rating.id),
-        )
-            .filter(Rating.movie_id == movie.id)
-            .one()
-    )
+        detail = {
+            "id": row["id"],
+            "title": row["title"],
+            "release_year": row["release_year"],
+            "director": {
+                "id": row["director_id"],
+                "name": row["director_name"],
+            } if row["director_name"] is not None else None,
+            "genres": genre_names if genre_names is not None else (row["genres"] or []),
+            "cast": row["cast"],
+        }
+        summary = summarize(row["rating_histogram"])
 
+        movie_search_index.upsert_doc(detail)
+        title_autocomplete.upsert(movie_id, detail["title"], detail["release_year"])
+        movie_detail_cache.invalidate(movie_id)
         logger.info(f"Service: Movie updated successfully - movie_id={movie_id}")
 
-        return {
-        "id": movie.id,
-        "title": movie.title,
-        "release_year": movie.release_year,
-        "director": {
-            "id": movie.director.id,
-            "name": movie.director.name,
-        } if movie.director else None,
-        "genres": [g.name for g in movie.genres],
-        "cast": getattr(movie, "cast", "Unknown"),
-        "average_rating": round(avg, 2) if count > 0 else None,
-        "ratings_count": count,
-    }
+        result = {
+            **detail,
+            "average_rating": summary["average_rating"],
+            "ratings_count": summary["ratings_count"],
+        }
+        shared_cache.bump()
+        return result
 
 
 
     # DELETE MOVIE
 
-    def delete_movie(self, movie_id: int) -> None:
+    def delete_movie(self, movie_id: int) -> bool:
         
         logger.info(f"Service: Deleting movie - movie_id={movie_id}")
         
@@ -229,4 +474,35 @@ class MovieService:
             logger.warning(f"Service: Movie not found for deletion - movie_id={movie_id}")
             raise HTTPException(status_code=404, detail="Movie not found")
         
+        movie_search_index.remove_movie(movie_id)
+        title_autocomplete.remove(movie_id)
+        movie_detail_cache.invalidate(movie_id)
+        trending_counters.remove(movie_id)
+        shared_cache.bump()
         logger.info(f"Service: Movie deleted from database - movie_id={movie_id}")
+        return True
+
+
+    # DELETE MOVIES (bulk)
+
+    def delete_movies(self, movie_ids: List[int]) -> Dict[str, Any]:
+
+        logger.info(f"Service: Deleting movies - count={len(movie_ids)}")
+
+        db = self.movie_repo.db
+        deleted_ids = set(self.movie_repo.delete_movies(db, movie_ids))
+
+        for movie_id in deleted_ids:
+            movie_search_index.remove_movie(movie_id)
+            title_autocomplete.remove(movie_id)
+            movie_detail_cache.invalidate(movie_id)
+            trending_counters.remove(movie_id)
+        if deleted_ids:
+            shared_cache.bump()
+
+        logger.info(f"Service: Movies deleted from database - deleted={len(deleted_ids)}")
+
+        return {
+            "deleted_ids": [movie_id for movie_id in movie_ids if movie_id in deleted_ids],
+            "missing_ids": [movie_id for movie_id in movie_ids if movie_id not in deleted_ids],
+        }
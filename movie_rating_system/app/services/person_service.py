@@ -0,0 +1,69 @@
+from sqlalchemy.orm import Session
+from fastapi import HTTPException, status
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from app.repositories.person_repository import PersonRepository
+from app.core.histograms import summarize
+from app.core.single_flight import coalesced
+
+logger = logging.getLogger(__name__)
+api_logger = logging.getLogger("api")
+
+
+class PersonService:
+
+    @staticmethod
+    def find_people(db: Session, name: str) -> List[Dict[str, Any]]:
+        logger.info(f"Finding people - name={name}")
+
+        people = PersonRepository.get_people_by_name(db, name)
+        return [{"id": person.id, "name": person.name} for person in people]
+
+    @staticmethod
+    @coalesced("people.detail")
+    def get_person(
+        db: Session,
+        person_id: int,
+        movies_limit: int = 20,
+        after: Optional[Tuple[int, int]] = None,
+    ) -> Dict[str, Any]:
+        logger.info(f"Getting person - person_id={person_id}, movies_limit={movies_limit}, after={after}")
+
+        person = PersonRepository.get_person_by_id(db, person_id)
+        if person is None:
+            logger.warning(f"Person not found: person_id={person_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Person not found"
+            )
+
+        # one extra row tells whether another page follows
+        movies = PersonRepository.get_filmography(db, person_id, movies_limit + 1, after)
+        has_more = len(movies) > movies_limit
+        movies = movies[:movies_limit]
+
+        items = []
+        for movie in movies:
+            summary = summarize(movie["rating_histogram"])
+            items.append({
+                "id": movie["id"],
+                "title": movie["title"],
+                "release_year": movie["release_year"],
+                "billing_position": movie["position"],
+                "average_rating": summary["average_rating"],
+                "ratings_count": summary["ratings_count"],
+            })
+
+        next_cursor = f"{movies[-1]['release_year']}:{movies[-1]['id']}" if has_more else None
+        logger.info(f"Person found - person_id={person_id}, filmography page={len(items)}")
+
+        return {
+            "id": person.id,
+            "name": person.name,
+            "movies_count": PersonRepository.count_movies(db, person_id),
+            "filmography": {
+                "items": items,
+                "next_cursor": next_cursor,
+            },
+        }
@@ -0,0 +1,54 @@
+import logging
+import os
+import threading
+
+from app.db.database import engine
+from app.db.partitions import ensure_rating_partitions
+
+logger = logging.getLogger(__name__)
+
+# monthly movie_ratings partitions kept ahead of the current month, at startup and by the thread
+RATING_PARTITIONS_MONTHS_AHEAD = int(os.getenv("RATING_PARTITIONS_MONTHS_AHEAD", "3"))
+# seconds between partition checks in each worker (0 = startup and the cron script only)
+RATING_PARTITIONS_CHECK_SECONDS = float(os.getenv("RATING_PARTITIONS_CHECK_SECONDS", "21600"))
+
+
+def create_rating_partitions(months_ahead: int = RATING_PARTITIONS_MONTHS_AHEAD) -> list:
+    """Creates the missing monthly partitions; returns their names."""
+    with engine.begin() as conn:
+        created = ensure_rating_partitions(conn, months_ahead=months_ahead)
+    if created:
+        logger.info(f"Rating partitions created: {created}")
+    return created
+
+
+class RatingPartitionMaintainer:
+    """Background thread creating upcoming rating partitions every `interval` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="rating-partition-maintainer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                create_rating_partitions()
+            except Exception as e:
+                logger.error(f"Rating partition check failed: {str(e)}", exc_info=True)
+
+
+rating_partition_maintainer = RatingPartitionMaintainer(RATING_PARTITIONS_CHECK_SECONDS)
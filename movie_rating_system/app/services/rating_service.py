@@ -2,8 +2,15 @@ from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.repositories.rating_repository import RatingRepository
 from app.repositories.movie_repository import MovieRepository
+from app.repositories.rating_rollup_repository import RatingRollupRepository
 from app.schemas.rating_schema import RatingCreate
-from typing import Dict, Any, List
+from app.core.trending import trending_counters
+from app.core.histograms import rating_histograms, summarize
+from app.core.autocomplete import title_autocomplete
+from app.core.single_flight import coalesced
+from app.core.shared_cache import shared_cache
+from typing import Dict, Any, List, Optional
+from datetime import date, timedelta
 import logging
 
 logger = logging.getLogger(__name__)
@@ -32,16 +39,22 @@ class RatingService:
             )
         
         try:
-            rating = RatingRepository.create_rating(db, movie_id, rating_data.score)
+            with rating_histograms.updating(movie_id):
+                rating = RatingRepository.create_rating(db, movie_id, rating_data.score)
+                rating_histograms.record(movie_id, rating.score)
+            trending_counters.record(movie_id, rating.created_at)
+            title_autocomplete.record_rating(movie_id)
             logger.info(f"Rating created in database - rating_id={rating.id}")
             api_logger.info(f"Rating saved to DB - ID: {rating.id}")
             
-            return {
+            result = {
                 "id": rating.id,
                 "movie_id": rating.movie_id,
                 "score": rating.score,
                 "created_at": rating.created_at
             }
+            shared_cache.bump()
+            return result
             
         except Exception as e:
             logger.error(f"Database error creating rating for movie {movie_id}: {str(e)}", exc_info=True)
@@ -52,6 +65,7 @@ class RatingService:
             )
     
     @staticmethod
+    @coalesced("ratings.list")
     def get_movie_ratings(db: Session, movie_id: int) -> List[Dict[str, Any]]:
         logger.info(f"Getting ratings from database for movie: movie_id={movie_id}")
         
@@ -86,6 +100,7 @@ class RatingService:
             )
     
     @staticmethod
+    @coalesced("ratings.average")
     def get_movie_average_rating(db: Session, movie_id: int) -> Dict[str, Any]:
         logger.info(f"Calculating average rating for movie: movie_id={movie_id}")
         
@@ -116,3 +131,127 @@ class RatingService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error calculating average rating: {str(e)}"
             )
+
+    @staticmethod
+    @coalesced("ratings.timeseries")
+    def get_rating_timeseries(
+        db: Session,
+        movie_id: int,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        bucket: str = "day",
+    ) -> Dict[str, Any]:
+        logger.info(f"Getting rating timeseries: movie_id={movie_id}, from={date_from}, to={date_to}, bucket={bucket}")
+
+        if not MovieRepository.movie_exists(db, movie_id):
+            logger.warning(f"Movie not found when getting rating timeseries: movie_id={movie_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movie not found"
+            )
+
+        if date_from and date_to and date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'from' must not be after 'to'"
+            )
+
+        try:
+            rollups = RatingRollupRepository.get_rollups(db, movie_id, date_from, date_to)
+
+            points: Dict[date, Dict[str, Any]] = {}
+            for rollup in rollups:
+                if bucket == "week":
+                    period_start = rollup.day - timedelta(days=rollup.day.weekday())
+                elif bucket == "month":
+                    period_start = rollup.day.replace(day=1)
+                else:
+                    period_start = rollup.day
+
+                point = points.setdefault(period_start, {
+                    "period_start": period_start,
+                    "ratings_count": 0,
+                    "score_sum": 0,
+                    "histogram": [0] * 10,
+                })
+                point["ratings_count"] += rollup.ratings_count
+                point["score_sum"] += rollup.score_sum
+                for i, value in enumerate(rollup.histogram):
+                    point["histogram"][i] += value
+
+            series = []
+            for point in points.values():
+                if point["ratings_count"] <= 0:
+                    continue
+                series.append({
+                    "period_start": point["period_start"],
+                    "ratings_count": point["ratings_count"],
+                    "average_rating": round(point["score_sum"] / point["ratings_count"], 2),
+                    "histogram": point["histogram"],
+                })
+
+            logger.info(f"Rating timeseries built from {len(rollups)} rollup rows: movie_id={movie_id}, points={len(series)}")
+            api_logger.info(f"Rating timeseries fetched - points: {len(series)}")
+
+            return {
+                "movie_id": movie_id,
+                "bucket": bucket,
+                "from": date_from,
+                "to": date_to,
+                "points": series,
+            }
+
+        except Exception as e:
+            logger.error(f"Database error getting rating timeseries for movie {movie_id}: {str(e)}", exc_info=True)
+            api_logger.error(f"Database error getting rating timeseries: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error fetching rating timeseries: {str(e)}"
+            )
+
+    @staticmethod
+    def delete_rating(db: Session, rating_id: int) -> bool:
+        logger.info(f"Deleting rating - rating_id={rating_id}")
+
+        rating = RatingRepository.get_rating_by_id(db, rating_id)
+        if not rating:
+            return False
+
+        movie_id, score = rating.movie_id, rating.score
+        with rating_histograms.updating(movie_id):
+            if not RatingRepository.delete_rating(db, rating_id):
+                return False
+            rating_histograms.record(movie_id, score, delta=-1)
+
+        title_autocomplete.record_rating(movie_id, delta=-1)
+        shared_cache.bump()
+        logger.info(f"Rating deleted from database - rating_id={rating_id}")
+        return True
+
+    @staticmethod
+    @coalesced("ratings.distribution")
+    def get_rating_distribution(db: Session, movie_id: int) -> Dict[str, Any]:
+        logger.info(f"Getting rating distribution for movie: movie_id={movie_id}")
+
+        try:
+            histogram = rating_histograms.get(movie_id)
+        except Exception as e:
+            logger.error(f"Database error getting rating distribution for movie {movie_id}: {str(e)}", exc_info=True)
+            api_logger.error(f"Database error getting rating distribution: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error fetching rating distribution: {str(e)}"
+            )
+
+        if histogram is None:
+            logger.warning(f"Movie not found when getting rating distribution: movie_id={movie_id}")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Movie not found"
+            )
+
+        distribution = summarize(histogram)
+        logger.info(f"Rating distribution computed: movie_id={movie_id}, count={distribution['ratings_count']}")
+        api_logger.info(f"Rating distribution computed - count: {distribution['ratings_count']}")
+
+        return {"movie_id": movie_id, **distribution}
@@ -0,0 +1,89 @@
+import logging
+import time
+from typing import Dict, Any
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.similarity import MovieFeatures, SIMILAR_MOVIES_K, top_k
+from app.repositories.movie_similar_repository import MovieSimilarRepository
+
+logger = logging.getLogger(__name__)
+
+_LOCK_KEY = 0x53494D  # pg advisory lock id of the rebuild
+
+
+def rebuild_similar_movies(db: Session, full: bool = False) -> Dict[str, Any]:
+    """
+    Recomputes the top-K neighbour lists. Incremental by default: only movies
+    whose features changed (new, re-tagged, re-cast, shifted rating profile),
+    lists that point at a changed or deleted movie, and lists a changed movie
+    now scores into are rebuilt.
+    """
+    started = time.perf_counter()
+    if not MovieSimilarRepository.try_lock(db, _LOCK_KEY):
+        db.rollback()
+        logger.info("Similar movies rebuild skipped - another rebuild is running")
+        return {"skipped": True}
+
+    movies, links = MovieSimilarRepository.get_feature_rows(db)
+    features = MovieFeatures(movies, links)
+    ids = features.ids
+    signatures = features.signatures()
+    stored = {} if full else MovieSimilarRepository.get_stored_lists(db)
+
+    if full:
+        targets = np.arange(len(features))
+        changed = len(features)
+    else:
+        changed_rows = np.array(
+            [row for row, movie_id in enumerate(ids.tolist()) if stored.get(movie_id, (None,))[0] != signatures[row]],
+            dtype=np.int64,
+        )
+        changed_ids = set(ids[changed_rows].tolist())
+        live_ids = set(ids.tolist())
+
+        affected = np.zeros(len(features), dtype=bool)
+        affected[changed_rows] = True
+        # score a movie must beat to enter each stored list (0 while the list has room)
+        entry_score = np.zeros(len(features))
+        for row, movie_id in enumerate(ids.tolist()):
+            entry = stored.get(movie_id)
+            if entry is None:
+                continue
+            _, similar_ids, scores = entry
+            if any(i in changed_ids or i not in live_ids for i in similar_ids):
+                affected[row] = True
+            elif len(similar_ids) >= SIMILAR_MOVIES_K:
+                entry_score[row] = scores[-1]
+
+        # similarity is symmetric: the changed rows' scores say which lists they now enter
+        for _, scores in features.blocks(changed_rows):
+            affected |= (scores > entry_score[None, :]).any(axis=0)
+        targets = np.flatnonzero(affected)
+        changed = len(changed_rows)
+
+    rows = []
+    for block, scores in features.blocks(targets):
+        positions, best = top_k(scores, SIMILAR_MOVIES_K)
+        for row, columns, values in zip(block, positions, best):
+            keep = values > 0
+            rows.append({
+                "movie_id": int(ids[row]),
+                "similar_ids": ids[columns[keep]].tolist(),
+                "scores": np.round(values[keep], 4).tolist(),
+                "signature": int(signatures[row]),
+            })
+
+    MovieSimilarRepository.save_lists(db, rows)
+    db.commit()
+
+    result = {
+        "skipped": False,
+        "movies": len(features),
+        "changed": changed,
+        "rebuilt": len(rows),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(f"Similar movies rebuilt - {result}")
+    return result
@@ -0,0 +1,49 @@
+import logging
+import os
+import threading
+
+from app.db.session import get_db_session
+
+logger = logging.getLogger(__name__)
+
+# seconds between incremental rebuilds in the app process; 0 leaves it to the script
+SIMILAR_MOVIES_REFRESH_SECONDS = float(os.getenv("SIMILAR_MOVIES_REFRESH_SECONDS", "0"))
+
+
+class SimilarityRefresher:
+    """Background thread running the incremental rebuild every `interval` seconds."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="similar-movies-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            # numpy and the job are only loaded once a rebuild is due
+            from app.services.similarity_job import rebuild_similar_movies
+
+            db = get_db_session()
+            try:
+                rebuild_similar_movies(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Similar movies rebuild failed: {str(e)}", exc_info=True)
+            finally:
+                db.close()
+
+
+similarity_refresher = SimilarityRefresher(SIMILAR_MOVIES_REFRESH_SECONDS)
@@ -0,0 +1,74 @@
+import logging
+import os
+import time
+
+from app.core.histograms import rating_histograms
+from app.core.movie_cache import movie_detail_cache
+from app.core.trending import trending_counters
+from app.db.database import engine, read_engine
+from app.db.session import get_read_db_session
+from app.repositories.director_repository import DirectorRepository
+from app.repositories.genre_repository import GenreRepository
+from app.repositories.movie_repository import MovieRepository
+from app.repositories.rating_repository import RatingRepository
+
+logger = logging.getLogger(__name__)
+
+WARMUP_HOT_MOVIES = int(os.getenv("WARMUP_HOT_MOVIES", "200"))
+
+
+# Runs once from the lifespan before the worker reports ready
+
+def open_pool_connections(target_engine) -> int:
+    # checked out together so the pool really holds `size` live connections
+    size = target_engine.pool.size() if hasattr(target_engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(target_engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+def compile_hot_statements(db) -> None:
+    # executing each hot query once fills SQLAlchemy's compiled statement cache
+    repo = MovieRepository(db)
+    movies, _ = repo.get_movies(page=1, page_size=10)
+    movie_id = movies[0].id if movies else 0
+    MovieRepository.get_movies_by_ids(db, [movie_id])
+    MovieRepository.movie_exists(db, movie_id)
+    RatingRepository.get_rating_aggregates(db, [movie_id])
+    RatingRepository.get_ratings_by_movie(db, movie_id)
+    GenreRepository.get_genres_by_names(db, ["Drama"])
+    DirectorRepository.get_director_by_id(db, 0)
+    repo.get_movies_with_ratings(page=1, page_size=10)
+
+
+def preload_hot_movies(db) -> int:
+    hot_ids = [movie_id for movie_id, _ in trending_counters.top("7d", WARMUP_HOT_MOVIES)]
+    loaded = movie_detail_cache.preload(db, hot_ids)
+    for movie_id in hot_ids:
+        rating_histograms.get(movie_id)
+    return loaded
+
+
+def run_warmup() -> None:
+    start = time.perf_counter()
+
+    opened = open_pool_connections(engine)
+    if read_engine is not engine:
+        opened += open_pool_connections(read_engine)
+
+    db = get_read_db_session()
+    try:
+        compile_hot_statements(db)
+        loaded = preload_hot_movies(db)
+    finally:
+        db.close()
+
+    logger.info(
+        f"Warm-up finished in {(time.perf_counter() - start) * 1000:.0f}ms - "
+        f"pool_connections={opened}, hot_movies={loaded}"
+    )
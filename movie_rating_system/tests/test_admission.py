@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import admission
+from app.core.admission import TokenBucketLimiter, WriteAdmission
+
+
+def make_request(host="10.0.0.1", headers=None):
+    return SimpleNamespace(client=SimpleNamespace(host=host), headers=headers or {})
+
+
+def test_zero_rate_admits_everything():
+    limiter = TokenBucketLimiter(rate=0, burst=1)
+    assert all(limiter.acquire("client") == 0 for _ in range(100))
+
+
+def test_rate_limit_per_client():
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    assert [limiter.acquire("a") == 0 for _ in range(3)] == [True, True, False]
+    assert limiter.acquire("b") == 0
+
+
+def test_client_key_uses_connection_address_by_default(monkeypatch):
+    monkeypatch.setattr(admission, "WRITE_RATE_CLIENT_HEADER", "")
+    request = make_request(headers={"x-forwarded-for": "1.2.3.4"})
+    assert admission.client_key(request) == "10.0.0.1"
+
+
+def test_client_key_uses_last_forwarded_address(monkeypatch):
+    monkeypatch.setattr(admission, "WRITE_RATE_CLIENT_HEADER", "x-forwarded-for")
+    # a client can prepend anything; the proxy appends the address it saw
+    request = make_request(headers={"x-forwarded-for": "6.6.6.6, 1.2.3.4"})
+    assert admission.client_key(request) == "1.2.3.4"
+    assert admission.client_key(make_request()) == "10.0.0.1"
+
+
+class FakePool:
+    def __init__(self, checked_out):
+        self.checked_out = checked_out
+
+    def checkedout(self):
+        return self.checked_out
+
+
+def test_pool_usage_sheds_writes(monkeypatch):
+    monkeypatch.setattr(admission, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(admission, "DB_MAX_OVERFLOW", 5)
+    gate = WriteAdmission(TokenBucketLimiter(rate=0, burst=1), max_in_flight=100, pool_ratio=0.8)
+
+    gate.admit("a", FakePool(7))
+    gate.release()
+    with pytest.raises(HTTPException) as error:
+        gate.admit("a", FakePool(8))
+    assert error.value.status_code == 503
+    assert gate.stats()["shed_pool"] == 1
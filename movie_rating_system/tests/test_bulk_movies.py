@@ -0,0 +1,26 @@
+def bulk(client, items):
+    response = client.post("/api/v1/movies/bulk", json={"items": items})
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["results"]
+
+
+def genres_of(client, movie_id):
+    return sorted(client.get(f"/api/v1/movies/detail/{movie_id}").json()["data"]["genres"])
+
+
+def test_update_without_genres_keeps_them(client, director_id):
+    item = {"title": "Bulk genres check", "director_id": director_id, "release_year": 2002}
+    [created] = bulk(client, [{**item, "genres": ["Drama", "Action"]}])
+    movie_id = created["id"]
+    try:
+        [updated] = bulk(client, [{**item, "id": movie_id, "title": "Bulk genres check 2"}])
+        assert updated["status"] == "updated"
+        assert genres_of(client, movie_id) == ["Action", "Drama"]
+
+        bulk(client, [{**item, "id": movie_id, "genres": ["Drama"]}])
+        assert genres_of(client, movie_id) == ["Drama"]
+
+        bulk(client, [{**item, "id": movie_id, "genres": []}])
+        assert genres_of(client, movie_id) == []
+    finally:
+        client.delete(f"/api/v1/movies/{movie_id}")
@@ -0,0 +1,61 @@
+import json
+import select
+
+import pytest
+
+from app.core.cache_events import CHANNEL, cache_events
+from app.db.database import engine
+from app.db.session import get_db_session
+
+
+@pytest.fixture
+def listener(client, monkeypatch):
+    monkeypatch.setattr(cache_events, "enabled", True)
+    conn = cache_events._connect(engine)
+    yield conn
+    conn.close()
+
+
+def received(conn, timeout=0.5):
+    events = []
+    while select.select([conn], [], [], timeout) != ([], [], []):
+        conn.poll()
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            if notify.channel == CHANNEL:
+                events.append(json.loads(notify.payload))
+        timeout = 0.1
+    return events
+
+
+def test_events_are_sent_with_the_commit_only(listener):
+    db = get_db_session()
+    try:
+        cache_events.publish(db, "movie", "upsert", -1)
+        assert received(listener) == []
+        db.rollback()
+        assert received(listener) == []
+
+        cache_events.publish_many(db, "movie", "delete", [-2, -3])
+        db.commit()
+        assert [(event["a"], event["id"]) for event in received(listener)] == [("delete", -2), ("delete", -3)]
+    finally:
+        db.close()
+
+
+def test_writes_publish_in_their_transaction(client, listener, director_id):
+    created = client.post(
+        "/api/v1/movies/",
+        json={"title": "Cache events check", "director_id": director_id, "release_year": 2003, "genres": []},
+    ).json()["data"]
+    movie_id = created["id"]
+    try:
+        assert [(event["k"], event["a"], event["id"]) for event in received(listener)] == [("movie", "upsert", movie_id)]
+
+        rating = client.post(f"/api/v1/movies/{movie_id}/ratings/", json={"score": 7}).json()["data"]
+        [event] = received(listener)
+        assert (event["k"], event["a"], event["id"], event["score"]) == ("rating", "create", movie_id, 7)
+        assert event["ts"] == rating["created_at"].replace("Z", "+00:00")
+    finally:
+        client.delete(f"/api/v1/movies/{movie_id}")
+    assert [(event["a"], event["id"]) for event in received(listener)] == [("delete", movie_id)]
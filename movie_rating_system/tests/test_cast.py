@@ -0,0 +1,43 @@
+import pytest
+
+# Python lower() gives the final sigma ("σοφος"), Postgres lower() does not ("σοφοσ")
+SOPHOS = "ΣΟΦΟΣ Cast Check"
+
+
+@pytest.fixture
+def movie_ids(client, director_id):
+    created = []
+
+    def create(cast):
+        response = client.post(
+            "/api/v1/movies/",
+            json={"title": "Cast check", "director_id": director_id, "release_year": 2006, "genres": [], "cast": cast},
+        )
+        assert response.status_code == 201, response.text
+        created.append(response.json()["data"]["id"])
+        return created[-1]
+
+    yield create
+    for movie_id in created:
+        client.delete(f"/api/v1/movies/{movie_id}")
+
+
+def search_ids(client, cast):
+    response = client.get("/api/v1/movies/search", params={"cast": cast, "page_size": 100})
+    assert response.status_code == 200, response.text
+    return {item["id"] for item in response.json()["data"]["items"]}
+
+
+def test_names_lowered_differently_by_python_resolve(client, movie_ids):
+    first = movie_ids(f"{SOPHOS}, Plain Cast Check")
+    # same person for Postgres, different strings for Python
+    second = movie_ids(f"{SOPHOS.lower()}, σοφοσ cast check")
+
+    people = client.get("/api/v1/people", params={"name": SOPHOS}).json()["data"]
+    assert len(people) == 1
+
+    assert search_ids(client, [SOPHOS]) == {first, second}
+    assert search_ids(client, ["σοφοσ cast check"]) == {first, second}
+    assert search_ids(client, [SOPHOS, "plain cast check"]) == {first}
+    assert search_ids(client, [SOPHOS, "σοφοσ cast check"]) == {first, second}
+    assert search_ids(client, ["Plain Cast Check", "Nobody Cast Check"]) == set()
@@ -0,0 +1,36 @@
+from sqlalchemy import select, func
+
+from app.db.session import get_db_session
+from app.models.catalog_change import CatalogChange
+from app.repositories.catalog_repository import CatalogRepository
+
+
+def test_ratings_are_caught_up_without_the_change_log(client, director_id):
+    db = get_db_session()
+    try:
+        xmin = CatalogRepository.get_snapshot_xmin(db)
+        db.commit()
+        movie_id = client.post(
+            "/api/v1/movies/",
+            json={"title": "Catch-up check", "director_id": director_id, "release_year": 2005, "genres": []},
+        ).json()["data"]["id"]
+        try:
+            for score in (3, 8):
+                assert client.post(f"/api/v1/movies/{movie_id}/ratings/", json={"score": score}).status_code == 201
+
+            logged = db.execute(
+                select(CatalogChange.action, func.count()).where(CatalogChange.movie_id == movie_id).group_by(CatalogChange.action)
+            ).all()
+            assert logged == [("upsert", 1)]
+            assert movie_id in CatalogRepository.get_changed_movie_ids(db, xmin)
+
+            counts = CatalogRepository.get_rated_movie_counts(db, xmin)
+            assert counts[movie_id] == 2
+            # rows last written before the snapshot are not re-read
+            later = CatalogRepository.get_snapshot_xmin(db)
+            db.commit()
+            assert movie_id not in CatalogRepository.get_rated_movie_counts(db, later)
+        finally:
+            client.delete(f"/api/v1/movies/{movie_id}")
+    finally:
+        db.close()
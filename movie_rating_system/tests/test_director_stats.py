@@ -0,0 +1,37 @@
+from app.db.session import get_db_session
+from app.repositories.director_stats_repository import DirectorStatsRepository
+
+
+def refresh():
+    db = get_db_session()
+    try:
+        return DirectorStatsRepository.refresh_ratings(db)
+    finally:
+        db.close()
+
+
+def career(client, director_id):
+    data = client.get(f"/api/v1/directors/{director_id}?movies_limit=1").json()["data"]
+    return data["movies_count"], data["ratings_count"]
+
+
+def test_ratings_reach_director_totals_on_refresh(client, director_id):
+    refresh()
+    movies, ratings = career(client, director_id)
+    movie_id = client.post(
+        "/api/v1/movies/",
+        json={"title": "Director stats check", "director_id": director_id, "release_year": 2004, "genres": []},
+    ).json()["data"]["id"]
+    try:
+        for score in (9, 4):
+            assert client.post(f"/api/v1/movies/{movie_id}/ratings/", json={"score": score}).status_code == 201
+        # rating writes leave director_stats alone
+        assert career(client, director_id) == (movies + 1, ratings)
+        assert refresh() == 1
+        assert career(client, director_id) == (movies + 1, ratings + 2)
+        assert refresh() == 0
+    finally:
+        client.delete(f"/api/v1/movies/{movie_id}")
+    assert career(client, director_id) == (movies, ratings + 2)
+    refresh()
+    assert career(client, director_id) == (movies, ratings)
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+from app.core import movie_cache as movie_cache_module
+from app.core.movie_cache import MovieDetailCache
+
+
+def make_movie(movie_id=1, title="Heat"):
+    return SimpleNamespace(id=movie_id, title=title, release_year=1995, director=None, genres=[], cast="")
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(movie_cache_module.time, "monotonic", lambda: now[0])
+    cache = MovieDetailCache(max_movies=10, ttl=5)
+
+    cache.put(make_movie())
+    now[0] += 4.9
+    assert cache.get(1)["title"] == "Heat"
+    now[0] += 0.2
+    assert cache.get(1) is None
+    assert len(cache) == 0
+
+
+def test_zero_ttl_or_size_disables_the_cache():
+    for cache in (MovieDetailCache(max_movies=10, ttl=0), MovieDetailCache(max_movies=0, ttl=5)):
+        assert cache.put(make_movie())["title"] == "Heat"
+        assert cache.get(1) is None
+        assert cache.preload(None, [1]) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = MovieDetailCache(max_movies=2, ttl=60)
+    for movie_id in (1, 2):
+        cache.put(make_movie(movie_id))
+    cache.get(1)
+    cache.put(make_movie(3))
+    assert cache.get(2) is None
+    assert cache.get(1) is not None and cache.get(3) is not None
@@ -0,0 +1,46 @@
+import pytest
+
+TITLE = "Fields check movie"
+
+
+@pytest.fixture(scope="module")
+def rated_movie(client, director_id):
+    movie = client.post(
+        "/api/v1/movies/",
+        json={"title": TITLE, "director_id": director_id, "release_year": 2001, "genres": ["Drama"]},
+    ).json()["data"]
+    for score in (7, 8):
+        assert client.post(f"/api/v1/movies/{movie['id']}/ratings/", json={"score": score}).status_code == 201
+    yield movie
+    client.delete(f"/api/v1/movies/{movie['id']}")
+
+
+def _find(items, movie_id):
+    return next(item for item in items if item["id"] == movie_id)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/movies/?page_size=100000",
+    f"/api/v1/movies/search?title={TITLE}",
+    f"/api/v1/movies/ratings?title={TITLE}",
+])
+def test_fields_with_average_rating(client, rated_movie, path):
+    response = client.get(path + "&fields=title,average_rating,ratings_count")
+    assert response.status_code == 200, response.text
+
+    data = response.json()["data"]
+    items = data["items"] if isinstance(data, dict) else data
+    item = _find(items, rated_movie["id"])
+    assert item == {"id": rated_movie["id"], "title": TITLE, "average_rating": 7.5, "ratings_count": 2}
+
+
+def test_fields_match_full_items(client, rated_movie):
+    full = _find(client.get(f"/api/v1/movies/search?title={TITLE}").json()["data"]["items"], rated_movie["id"])
+    sparse = _find(
+        client.get(f"/api/v1/movies/search?title={TITLE}&fields=genres,director,average_rating").json()["data"]["items"],
+        rated_movie["id"],
+    )
+    assert set(sparse) == {"id", "genres", "director", "average_rating"}
+    assert sparse["genres"] == full["genres"] == ["Drama"]
+    assert sparse["director"] == {"id": full["director"]["id"], "name": full["director"]["name"]}
+    assert sparse["average_rating"] == full["average_rating"]
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import event
+
+from app.db.database import engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+@pytest.fixture
+def queries():
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
+
+
+@pytest.fixture
+def movie_id(client, director_id):
+    response = client.post(
+        "/api/v1/movies/",
+        json={"title": "Query count check", "director_id": director_id, "release_year": 2000, "genres": []},
+    )
+    movie_id = response.json()["data"]["id"]
+    yield movie_id
+    client.delete(f"/api/v1/movies/{movie_id}")
+
+
+def counted(queries, call):
+    queries.count = 0
+    response = call()
+    return response.status_code, queries.count
+
+
+# statements per request, cache events off: the update and the delete are one round trip each
+def test_update_is_one_round_trip(client, movie_id, queries):
+    assert counted(queries, lambda: client.put(f"/api/v1/movies/{movie_id}", json={"title": "Renamed"})) == (200, 1)
+    assert counted(queries, lambda: client.put("/api/v1/movies/0", json={"title": "x"})) == (404, 1)
+
+
+def test_update_with_genres_adds_the_genre_lookup(client, movie_id, queries):
+    payload = {"release_year": 2001, "genres": ["Action", "Drama"]}
+    assert counted(queries, lambda: client.put(f"/api/v1/movies/{movie_id}", json=payload)) == (200, 2)
+
+
+def test_delete_is_one_round_trip(client, movie_id, queries):
+    assert counted(queries, lambda: client.delete(f"/api/v1/movies/{movie_id}")) == (204, 1)
+    assert counted(queries, lambda: client.delete(f"/api/v1/movies/{movie_id}")) == (404, 1)
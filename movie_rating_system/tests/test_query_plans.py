@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from app.scripts import plan_check
+from app.scripts.plan_check import CASES
+
+
+@pytest.fixture(scope="module")
+def plan_results():
+    # seeds and EXPLAINs in a scratch database (PLAN_CHECK_DATABASE_URL), never in DATABASE_URL
+    try:
+        return plan_check.check_plans()
+    except (OperationalError, ProgrammingError) as e:
+        pytest.skip(f"cannot create the plan check database: {e}")
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_query_plan(plan_results, name):
+    # expected indexes, no unallowed sequential scans, cost within COST_FACTOR x the baseline
+    problems = plan_results[name]["problems"]
+    assert not problems, "\n".join(problems)
+
@@ -0,0 +1,47 @@
+from app.core import histograms as histograms_module
+from app.core.histograms import RatingHistogramCache
+
+
+def make_cache(monkeypatch, rows, **options):
+    now = [100.0]
+    monkeypatch.setattr(histograms_module.time, "monotonic", lambda: now[0])
+    cache = RatingHistogramCache(**options)
+    loads = []
+
+    def load(movie_id):
+        loads.append(movie_id)
+        return list(rows[movie_id])
+
+    monkeypatch.setattr(cache, "_load", load)
+    return cache, now, loads
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    rows = {1: [0] * 10}
+    cache, now, loads = make_cache(monkeypatch, rows, max_movies=10, ttl=5)
+
+    assert sum(cache.get(1)) == 0
+    # a rating taken by another worker lands in the row only
+    rows[1][6] += 1
+    now[0] += 4.9
+    assert sum(cache.get(1)) == 0
+    now[0] += 0.2
+    assert list(cache.get(1)) == rows[1]
+    assert loads == [1, 1]
+
+
+def test_local_ratings_update_the_cached_entry(monkeypatch):
+    cache, _, loads = make_cache(monkeypatch, {1: [0] * 10}, max_movies=10, ttl=5)
+    cache.get(1)
+    with cache.updating(1):
+        cache.record(1, 8)
+    assert cache.get(1)[7] == 1
+    assert loads == [1]
+
+
+def test_zero_ttl_or_size_reads_the_row_every_time(monkeypatch):
+    for options in ({"max_movies": 10, "ttl": 0}, {"max_movies": 0, "ttl": 5}):
+        cache, _, loads = make_cache(monkeypatch, {1: [1] * 10}, **options)
+        cache.get(1)
+        cache.get(1)
+        assert loads == [1, 1]
@@ -0,0 +1,60 @@
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.partitions import create_month_partition, detach_rating_partitions, ensure_rating_partitions
+from app.db.scratch import scratch_database, scratch_database_url
+from app.services import rating_partition_maintainer as maintainer_module
+from app.services.rating_partition_maintainer import RatingPartitionMaintainer
+
+
+@pytest.fixture
+def scratch():
+    try:
+        with scratch_database(scratch_database_url(suffix="partitions")) as engine:
+            yield engine
+    except OperationalError as e:
+        pytest.skip(f"cannot create the partition check database: {e}")
+
+
+def histogram(conn, movie_id):
+    return conn.execute(text("SELECT rating_histogram FROM movies WHERE id = :id"), {"id": movie_id}).scalar()
+
+
+def test_detached_ratings_leave_the_histograms(scratch):
+    with scratch.begin() as conn:
+        ensure_rating_partitions(conn)
+        create_month_partition(conn, date(2020, 1, 1))
+        conn.execute(text("INSERT INTO directors (id, name) VALUES (1, 'Partition Check Director')"))
+        conn.execute(text(
+            "INSERT INTO movies (id, title, director_id, release_year, rating_histogram) "
+            "VALUES (1, 'Partition check', 1, 2019, ARRAY[0,0,0,0,0,0,1,2,0,0])"
+        ))
+        conn.execute(text(
+            "INSERT INTO movie_ratings (movie_id, score, created_at) VALUES "
+            "(1, 8, '2020-01-10'), (1, 7, '2020-01-11'), (1, 8, now())"
+        ))
+
+    with scratch.begin() as conn:
+        detached = detach_rating_partitions(conn, date(2020, 2, 1), archive_schema="archive")
+
+    with scratch.connect() as conn:
+        assert detached == ["movie_ratings_p202001"]
+        assert histogram(conn, 1) == [0, 0, 0, 0, 0, 0, 0, 1, 0, 0]
+        assert conn.execute(text("SELECT count(*) FROM archive.movie_ratings_p202001")).scalar() == 2
+        assert conn.execute(text("SELECT count(*) FROM movie_ratings")).scalar() == 1
+
+
+def test_maintainer_checks_partitions_periodically(monkeypatch):
+    checked = threading.Event()
+    monkeypatch.setattr(maintainer_module, "create_rating_partitions", checked.set)
+
+    maintainer = RatingPartitionMaintainer(0.01)
+    maintainer.start()
+    try:
+        assert checked.wait(5)
+    finally:
+        maintainer.stop()
@@ -0,0 +1,106 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.scratch import scratch_database, scratch_database_url
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# a fresh interpreter per configuration: the engines are created from the environment at import
+RUN_REQUESTS = """
+import json, sys, time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.readiness import readiness
+
+with TestClient(app) as client:
+    while not readiness.warmed_up:
+        time.sleep(0.05)
+    results = []
+    for method, path, body in json.loads(sys.argv[1]):
+        response = client.request(method, path, json=body)
+        results.append([response.status_code, response.json()])
+print(json.dumps(results))
+"""
+
+
+def run_app(primary, replica, calls, shared_cache_url=""):
+    env = {
+        **os.environ,
+        "DATABASE_URL": primary.render_as_string(hide_password=False),
+        "DATABASE_READ_URL": replica.render_as_string(hide_password=False),
+        "CATALOG_SNAPSHOT_ENABLED": "false",
+        "SHARED_CACHE_URL": shared_cache_url,
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_REQUESTS, json.dumps(calls)],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def titles(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT title FROM movies ORDER BY id")).scalars().all()
+
+
+@pytest.fixture(scope="module")
+def databases():
+    # two local databases standing in for the primary and its replica
+    try:
+        with scratch_database(scratch_database_url(suffix="primary")) as primary, \
+                scratch_database(scratch_database_url(suffix="replica")) as replica:
+            for engine in (primary, replica):
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO directors (id, name) VALUES (1, 'Replica Check Director')"))
+            with replica.begin() as conn:
+                conn.execute(text(
+                    "INSERT INTO movies (id, title, director_id, release_year) VALUES (500, 'Only on the replica', 1, 1999)"
+                ))
+            yield primary, replica
+    except OperationalError as e:
+        pytest.skip(f"cannot create the replica check databases: {e}")
+
+
+def test_gets_read_the_replica_and_writes_go_to_the_primary(databases):
+    primary, replica = databases
+    created, listed, ready = run_app(primary.url, replica.url, [
+        ["POST", "/api/v1/movies/", {"title": "Written to the primary", "director_id": 1, "release_year": 2000, "genres": []}],
+        ["GET", "/api/v1/movies/?page_size=100", None],
+        ["GET", "/ready", None],
+    ])
+
+    assert created[0] == 201
+    assert [item["title"] for item in listed[1]["data"]["items"]] == ["Only on the replica"]
+    assert titles(primary) == ["Written to the primary"]
+    assert titles(replica) == ["Only on the replica"]
+    assert ready[0] == 200 and ready[1]["replica"]["database"] == "connected"
+
+
+def test_shared_cache_pages_are_filled_from_the_primary(databases):
+    # a replica behind the primary must not have its page cached under the current generation
+    primary, replica = databases
+    created, listed = run_app(primary.url, replica.url, [
+        ["POST", "/api/v1/movies/", {"title": "Cached from the primary", "director_id": 1, "release_year": 2001, "genres": []}],
+        ["GET", "/api/v1/movies/?page_size=100", None],
+    ], "memory://")
+
+    assert created[0] == 201
+    cached = [item["title"] for item in listed[1]["data"]["items"]]
+    assert "Cached from the primary" in cached and cached == titles(primary)
+
+
+def test_ready_fails_while_the_replica_is_unreachable(databases):
+    primary, _ = databases
+    missing = primary.url.set(database=f"{primary.url.database}_missing")
+    health, ready = run_app(primary.url, missing, [["GET", "/health", None], ["GET", "/ready", None]])
+
+    assert health[0] == 200 and health[1]["replica"]["database"] == "unreachable"
+    assert ready[0] == 503
+    assert ready[1]["database"] == "connected" and ready[1]["replica"]["database"] == "unreachable"
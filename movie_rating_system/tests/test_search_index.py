@@ -0,0 +1,112 @@
+import pytest
+
+from app.core.search_index import MovieSearchIndex
+from app.db.session import get_db_session
+from app.repositories.movie_repository import MovieRepository
+
+# titles and names that Python's lower() and Postgres lower() / ILIKE fold differently;
+# U+212A is the Kelvin sign
+MOVIES = [
+    ("İstanbul Index Check", 1961, ["Drama"], "ΣΟΦΟΣ Index Check, Plain Index Check"),
+    ("ΣΟΦΟΣ index check", 1962, ["Action", "Drama"], "σοφοσ index check"),
+    ("Amélie Index Check", 1961, ["Comedy"], "Plain Index Check"),
+    ("\u212aELVIN index check", 1963, ["Action"], "\u212aelvin Index Check"),
+    ("Straße Index Check", 1962, [], "İlker Index Check"),
+]
+
+
+@pytest.fixture(scope="module")
+def catalogue(client, director_id):
+    created = []
+    for title, year, genres, cast in MOVIES:
+        response = client.post(
+            "/api/v1/movies/",
+            json={"title": title, "director_id": director_id, "release_year": year, "genres": genres, "cast": cast},
+        )
+        assert response.status_code == 201, response.text
+        created.append(response.json()["data"]["id"])
+
+    db = get_db_session()
+    index = MovieSearchIndex()
+    try:
+        index.rebuild(db)
+        yield index, MovieRepository(db)
+    finally:
+        db.close()
+        for movie_id in created:
+            client.delete(f"/api/v1/movies/{movie_id}")
+
+
+@pytest.mark.parametrize("filters", [
+    {"title": "index check"},
+    {"title": "istanbul"},
+    {"title": "kelvin"},
+    {"title": "INDEX CHECK", "release_year": 1961},
+    {"title": "strasse"},
+    {"title": "index", "genres": ["Action"]},
+    {"genres": ["Action", "Drama"]},
+    {"genres": ["Drama", "Drama"]},
+    {"release_year": 1962},
+    {"cast": ["plain index check"]},
+    {"cast": ["ilker index check"]},
+    {"cast": ["kelvin index check", " Kelvin Index Check "]},
+    {"title": "index", "cast": ["Plain Index Check"], "genres": ["Comedy"]},
+])
+@pytest.mark.parametrize("page,page_size", [(1, 1000), (2, 2)])
+def test_index_matches_sql(catalogue, filters, page, page_size):
+    index, repo = catalogue
+    assert index.can_serve(filters.get("title"), filters.get("cast"))
+
+    items, total = index.search(page=page, page_size=page_size, **filters)
+    movies, expected_total = repo.get_movies(page=page, page_size=page_size, **filters)
+
+    assert [item["id"] for item in items] == [movie.id for movie in movies]
+    assert total == expected_total
+
+
+@pytest.mark.parametrize("filters", [
+    {"title": "amélie"},
+    {"title": "σοφοσ"},
+    {"cast": ["σοφοσ index check"]},
+    {"title": "100%"},
+])
+def test_text_the_index_cannot_fold_goes_to_sql(catalogue, filters):
+    index, _ = catalogue
+    assert not index.can_serve(filters.get("title"), filters.get("cast"))
+
+
+def doc(movie_id, title="Dense check", year=2000):
+    return {"id": movie_id, "title": title, "release_year": year, "director": None, "genres": ["Drama"], "cast": "Dense Cast"}
+
+
+def search_ids(index, **filters):
+    items, total = index.search(page=1, page_size=100, **filters)
+    assert total == len(items)
+    return [item["id"] for item in items]
+
+
+def test_bitsets_are_sized_by_the_catalogue_not_the_ids():
+    index = MovieSearchIndex()
+    index.load([doc(10 ** 9), doc(7), doc(10 ** 6)])
+
+    assert index._all_bits.bit_length() == 3
+    assert search_ids(index, title="dense") == [7, 10 ** 6, 10 ** 9]
+
+    # below the highest id: results are still ordered by id
+    index.upsert_doc(doc(5, year=1999))
+    index.upsert_doc(doc(7, title="Renamed"))
+    assert search_ids(index, title="dense") == [5, 10 ** 6, 10 ** 9]
+    assert search_ids(index, genres=["Drama"], cast=["dense cast"]) == [5, 7, 10 ** 6, 10 ** 9]
+    assert search_ids(index, release_year=1999) == [5]
+    assert index._all_bits.bit_length() == 4
+
+
+def test_freed_positions_are_compacted():
+    index = MovieSearchIndex()
+    index.load([doc(movie_id) for movie_id in range(3000)])
+    for movie_id in range(1, 3000):
+        index.remove_movie(movie_id)
+    index.upsert_doc(doc(5000))
+
+    assert index._all_bits.bit_length() < 1100
+    assert search_ids(index, title="dense") == [0, 5000]
@@ -0,0 +1,173 @@
+import threading
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.core import shared_cache as shared_cache_module
+from app.core.shared_cache import LocalCacheBackend, SharedCache, shared_cached
+
+
+class Compute:
+    def __init__(self, value=None, gate: threading.Event = None):
+        self.value = value
+        self.gate = gate
+        self.calls = 0
+        self.started = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.value if self.value is not None else {"call": self.calls}
+
+
+@pytest.fixture
+def cache():
+    return SharedCache(LocalCacheBackend(), prefix="test")
+
+
+def test_hit_after_miss(cache):
+    compute = Compute()
+    key = cache.key("page", {"page": 1})
+    assert cache.get_or_compute(key, compute) == {"call": 1}
+    assert cache.get_or_compute(key, compute) == {"call": 1}
+    assert compute.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_decimal_values_come_back_as_numbers(cache):
+    key = cache.key("page", {})
+    value = {"items": [{"average_rating": Decimal("7.50"), "ratings_count": 2}]}
+    cache.get_or_compute(key, lambda: value)
+    assert cache.get_or_compute(key, Compute()) == {"items": [{"average_rating": 7.5, "ratings_count": 2}]}
+
+
+def test_bump_invalidates_every_entry(cache):
+    compute = Compute()
+    keys = [cache.key("page", {"page": page}) for page in (1, 2)]
+    for key in keys:
+        cache.get_or_compute(key, compute)
+    cache.bump()
+    assert [cache.get_or_compute(key, compute) for key in keys] == [{"call": 3}, {"call": 4}]
+
+
+def test_write_during_compute_is_not_served(cache):
+    key = cache.key("page", {})
+    # stored under the generation read before computing, so it is stale as soon as it lands
+    cache.get_or_compute(key, lambda: (cache.bump(), {"call": "old"})[1])
+    assert cache.get_or_compute(key, Compute()) == {"call": 1}
+
+
+def test_expired_entry_is_served_stale_while_locked(cache, monkeypatch):
+    monkeypatch.setattr(shared_cache_module, "SHARED_CACHE_TTL", 0)
+    key = cache.key("page", {})
+    cache.get_or_compute(key, lambda: {"call": "old"})
+
+    # another worker holds the recompute lock
+    cache.backend.set(f"{key}:lock", "other", ex=5, nx=True)
+    compute = Compute()
+    assert cache.get_or_compute(key, compute) == {"call": "old"}
+    assert compute.calls == 0
+    assert cache.stats()["stale_hits"] == 1
+
+    cache.backend.delete(f"{key}:lock")
+    assert cache.get_or_compute(key, compute) == {"call": 1}
+
+
+def test_concurrent_misses_compute_once(cache):
+    key = cache.key("page", {})
+    gate = threading.Event()
+    compute = Compute(gate=gate)
+    results = []
+
+    def read():
+        results.append(cache.get_or_compute(key, compute))
+
+    winner = threading.Thread(target=read)
+    winner.start()
+    compute.started.wait(5)
+    waiters = [threading.Thread(target=read) for _ in range(3)]
+    for thread in waiters:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["waits"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    gate.set()
+    for thread in [winner, *waiters]:
+        thread.join(5)
+
+    assert results == [{"call": 1}] * 4
+    assert compute.calls == 1
+    assert cache.stats()["waits"] == 3
+    assert cache.backend.get(f"{key}:lock") is None
+
+
+def test_lock_wait_times_out_to_direct_compute(cache, monkeypatch):
+    monkeypatch.setattr(shared_cache_module, "SHARED_CACHE_LOCK_WAIT", 0.05)
+    key = cache.key("page", {})
+    cache.backend.set(f"{key}:lock", "other", ex=5, nx=True)
+    compute = Compute()
+    assert cache.get_or_compute(key, compute) == {"call": 1}
+    # not stored: the lock belongs to someone else
+    assert cache.backend.get(key) is None
+
+
+def test_failed_compute_releases_lock(cache):
+    key = cache.key("page", {})
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute(key, fail)
+    assert cache.backend.get(f"{key}:lock") is None
+
+
+def test_backend_errors_compute_directly():
+    class BrokenBackend:
+        def __getattr__(self, name):
+            raise ConnectionError("down")
+
+    cache = SharedCache(BrokenBackend())
+    assert cache.get_or_compute("key", Compute()) == {"call": 1}
+    cache.bump()
+    assert cache.stats()["errors"] == 2
+
+
+def test_decorator_keys_on_normalized_arguments(cache, monkeypatch):
+    monkeypatch.setattr(shared_cache_module, "shared_cache", cache)
+    calls = []
+
+    @shared_cached("list")
+    def list_movies(db, page=1, genres=None):
+        calls.append((page, genres))
+        return {"page": page}
+
+    list_movies("db-a", genres=["Drama", "Action"])
+    list_movies("db-b", 1, ["Action", "Drama"])
+    list_movies("db-a", page=2)
+    assert calls == [(1, ["Drama", "Action"]), (2, None)]
+
+
+def test_stored_pages_are_computed_on_the_primary(cache, monkeypatch):
+    from app.db.database import engine
+
+    monkeypatch.setattr(shared_cache_module, "shared_cache", cache)
+    sessions = []
+
+    @shared_cached("list")
+    def list_movies(db, page=1):
+        sessions.append(db)
+        return {"page": page}
+
+    list_movies("replica-session")
+    assert sessions[0].bind is engine
+
+    # a lock held elsewhere past the wait: computed on the caller's session, not stored
+    monkeypatch.setattr(shared_cache_module, "SHARED_CACHE_LOCK_WAIT", 0.05)
+    key = cache.key("list", {"page": 2})
+    cache.backend.set(f"{key}:lock", "other", ex=5, nx=True)
+    list_movies("replica-session", page=2)
+    assert sessions[1] == "replica-session"
@@ -0,0 +1,60 @@
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+# seconds; the median of a few cold imports, and the lifespan up to the first request
+STARTUP_IMPORT_BUDGET = float(os.getenv("STARTUP_IMPORT_BUDGET", "2.0"))
+STARTUP_LIFESPAN_BUDGET = float(os.getenv("STARTUP_LIFESPAN_BUDGET", "1.0"))
+
+# run in a fresh interpreter so nothing is already imported
+IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import app.main
+from app.db.database import engine
+elapsed = time.perf_counter() - start
+print(elapsed, engine.pool.checkedin() + engine.pool.checkedout())
+"""
+
+LIFESPAN_PROBE = """
+import asyncio, time
+from app.main import app
+from app.core.readiness import readiness
+
+async def main():
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        serving = time.perf_counter() - start
+        while not readiness.warmed_up:
+            await asyncio.sleep(0.05)
+    print(serving)
+
+asyncio.run(main())
+"""
+
+
+def run_probe(probe):
+    env = {**os.environ, "PYTHONPATH": str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-c", probe], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_import_is_within_budget_and_opens_no_connections():
+    timings = []
+    for _ in range(3):
+        elapsed, connections = run_probe(IMPORT_PROBE)[-2:]
+        assert int(connections) == 0, "importing app.main opened database connections"
+        timings.append(float(elapsed))
+    assert statistics.median(timings) <= STARTUP_IMPORT_BUDGET, timings
+
+
+def test_lifespan_serves_before_the_rebuilds_finish(database):
+    # the probe inherits DATABASE_URL, pointed at the test database by conftest
+    serving = float(run_probe(LIFESPAN_PROBE)[-1])
+    assert serving <= STARTUP_LIFESPAN_BUDGET
@@ -0,0 +1,77 @@
+import threading
+
+from app.core import trending
+from app.core.trending import TrendingCounters
+
+
+def test_record_is_not_blocked_while_ranking(monkeypatch):
+    counters = TrendingCounters()
+    for movie_id in (1, 2, 2):
+        counters.record(movie_id)
+
+    ranking_started, release = threading.Event(), threading.Event()
+    window_total = trending._window_total
+
+    def slow_total(*args):
+        ranking_started.set()
+        release.wait(5)
+        return window_total(*args)
+
+    monkeypatch.setattr(trending, "_window_total", slow_total)
+    results = []
+    ranking = threading.Thread(target=lambda: results.append(counters.top("1h", 10)))
+    ranking.start()
+    try:
+        assert ranking_started.wait(5)
+        recorded = threading.Thread(target=counters.record, args=(3,))
+        recorded.start()
+        recorded.join(1)
+        assert not recorded.is_alive()
+    finally:
+        release.set()
+        ranking.join(5)
+
+    # ranked from the snapshot taken before movie 3 was recorded
+    assert results == [[(2, 2), (1, 1)]]
+
+
+def test_ranking_computed_across_a_removal_is_not_cached(monkeypatch):
+    counters = TrendingCounters()
+    counters.record(1)
+    counters.record(2)
+    window_total = trending._window_total
+
+    def remove_while_ranking(*args):
+        counters.remove(1)
+        return window_total(*args)
+
+    monkeypatch.setattr(trending, "_window_total", remove_while_ranking)
+    assert counters.top("24h", 10) == [(1, 1), (2, 1)]
+    assert "24h" not in counters._rankings
+
+    monkeypatch.setattr(trending, "_window_total", window_total)
+    assert counters.top("24h", 10) == [(2, 1)]
+    assert counters._rankings["24h"][1] == [(2, 1)]
+
+
+def test_ratings_recorded_during_a_rebuild_are_kept_once(monkeypatch):
+    from datetime import datetime, timezone
+
+    from app.repositories.rating_repository import RatingRepository
+
+    counters = TrendingCounters()
+    committed = datetime.now(timezone.utc)
+    concurrent = datetime.now(timezone.utc)
+
+    def get_ratings_since(db, since):
+        # one rating is recorded by the app both before and after the query reads it,
+        # the other only after
+        counters.record(1, committed)
+        counters.record(2, concurrent)
+        return [(1, committed)]
+
+    monkeypatch.setattr(RatingRepository, "get_ratings_since", staticmethod(get_ratings_since))
+    counters.rebuild(db=None)
+
+    assert counters.top("1h", 10) == [(1, 1), (2, 1)]
+    assert counters._recorded_during_rebuild is None